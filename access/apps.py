@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class AuthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "access"
+
+    # see `common.scheduler`
+    periodic_tasks = [
+        {
+            "name": "reconcile_inactive_users",
+            "schedule": "*/15 * * * *",
+            "task": "access.maintenance.reconcile_inactive_users",
+            "jitter": 60,
+        },
+    ]
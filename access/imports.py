@@ -0,0 +1,274 @@
+import codecs
+import csv
+from itertools import islice
+
+from django.contrib.auth.base_user import BaseUserManager
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from access.models import User, UserImport
+from access.models.user import UserDetail
+from access.serializers import UserDetailImportRowSerializer, UserImportRowSerializer
+from common.caching import bump_version, get_model_version_key
+from common.config import USER_IMPORT_CONFIG, JobStatusChoices
+from common.jobs import register_job
+
+DUPLICATE_EMAIL_ERROR = "This email is repeated in the file."
+EXISTING_EMAIL_ERROR = "A user with this email already exists."
+IMPORT_FAILED_ERROR = "The import failed, it is retried from the last saved row."
+
+
+class ImportSuperseded(Exception):
+    """The chunk was already processed by an overlapping run of the same import."""
+
+
+def get_csv_reader(lines):
+    reader = csv.DictReader(lines, restval="")
+    reader.fieldnames = [_.strip().lower() for _ in reader.fieldnames or []]
+    return reader
+
+
+def get_csv_header(file) -> list[str]:
+    """Returns the normalized column names of the CSV file."""
+
+    file.open("rb")
+    try:
+        return get_csv_reader(
+            codecs.iterdecode(file, USER_IMPORT_CONFIG["encoding"])
+        ).fieldnames
+    finally:
+        file.close()
+
+
+def iter_csv_rows(file, skip=0):
+    """
+    Yields the (row number, {column: value}) of the CSV file, after the first
+    `skip` rows. Streamed from the storage, the file is never fully in memory.
+    The rows are numbered like in a spreadsheet, the header is the row 1.
+    """
+
+    file.open("rb")
+    try:
+        reader = get_csv_reader(codecs.iterdecode(file, USER_IMPORT_CONFIG["encoding"]))
+
+        for number, row in enumerate(islice(reader, skip, None), start=skip + 2):
+            yield number, {
+                k: (v or "").strip() for k, v in row.items() if k is not None
+            }
+    finally:
+        file.close()
+
+
+class UserImporter:
+    """
+    Imports the users of the `UserImport`'s CSV, in chunks of the `chunk_size`:
+        > each row is validated with the `UserImportRowSerializer`, and with the
+          `UserDetailImportRowSerializer` if it has any user detail column
+        > the emails are checked against the existing users with a single query,
+          re-checked if the insert still hits one taken meanwhile
+        > the users & the details are written with `bulk_create`, along with the
+          progress, in a single transaction
+
+    A retried import resumes after the rows already processed. Each chunk is
+    claimed with a conditional update on the `processed_rows`, so the overlapping
+    runs of the same import (like a job claimed again) never write a chunk twice.
+    """
+
+    def __init__(self, user_import):
+        self.user_import = user_import
+        self.chunk_size = USER_IMPORT_CONFIG["chunk_size"]
+        self.user_fields = UserImportRowSerializer.Meta.fields
+        self.detail_fields = UserDetailImportRowSerializer.Meta.fields
+        # built once, `run_validation` is called per row
+        self.user_serializer = UserImportRowSerializer()
+        self.detail_serializer = UserDetailImportRowSerializer()
+        self.processed_rows = user_import.processed_rows
+
+    def update_import(self, **kwargs):
+        UserImport.objects.filter(pk=self.user_import.pk).update(
+            modified=timezone.now(), **kwargs
+        )
+
+    def validate_header(self):
+        """Returns the missing required columns."""
+
+        header = get_csv_header(self.user_import.file)
+        return [_ for _ in self.user_fields if _ not in header]
+
+    def validate_row(self, row) -> tuple[dict, dict | None]:
+        """Returns the validated (user, detail) data. Raises the `ValidationError`."""
+
+        user = self.user_serializer.run_validation(
+            {_: row.get(_, "") for _ in self.user_fields}
+        )
+        # the blanks are nulled by the serializer | the model defaults apply
+        user = {k: v for k, v in user.items() if v is not None}
+        user["email"] = BaseUserManager.normalize_email(user["email"])
+
+        detail = {_: row[_] for _ in self.detail_fields if row.get(_)}
+        if detail:
+            detail = self.detail_serializer.run_validation(detail)
+
+        return user, detail or None
+
+    def claim_chunk(self, rows):
+        """
+        Advances the `processed_rows` past the chunk, if no other run did. The row
+        stays locked until the commit, the overlapping runs wait on it & then find
+        the `processed_rows` moved. Raises the `ImportSuperseded` if so.
+        """
+
+        if not UserImport.objects.filter(
+            pk=self.user_import.pk,
+            status=JobStatusChoices.running,
+            processed_rows=self.processed_rows,
+        ).update(processed_rows=F("processed_rows") + len(rows)):
+            raise ImportSuperseded()
+
+    def import_chunk(self, rows):
+        """Validates & writes the chunk of (row number, row). Returns the errors."""
+
+        valid_rows, errors = {}, []
+        for number, row in rows:
+            try:
+                user, detail = self.validate_row(row)
+            except ValidationError as exc:
+                errors.append({"row": number, "errors": exc.detail})
+                continue
+
+            if user["email"] in valid_rows:
+                errors.append(
+                    {"row": number, "errors": {"email": [DUPLICATE_EMAIL_ERROR]}}
+                )
+                continue
+
+            valid_rows[user["email"]] = (number, user, detail)
+
+        self.pop_existing_emails(valid_rows, errors)
+
+        while True:
+            try:
+                self.write_chunk(rows, valid_rows, errors)
+                break
+            except IntegrityError:
+                # an email taken after the check, by a signup or an other import
+                if not self.pop_existing_emails(valid_rows, errors):
+                    raise
+
+        self.processed_rows += len(rows)
+        return errors
+
+    @staticmethod
+    def pop_existing_emails(valid_rows, errors) -> int:
+        """Moves the rows of the already existing emails to the errors."""
+
+        existing_emails = list(
+            User.objects.filter(email__in=valid_rows).values_list("email", flat=True)
+        )
+        for email in existing_emails:
+            number, _, _ = valid_rows.pop(email)
+            errors.append({"row": number, "errors": {"email": [EXISTING_EMAIL_ERROR]}})
+
+        return len(existing_emails)
+
+    def write_chunk(self, rows, valid_rows, errors):
+        """Writes the users, the details & the progress of the chunk, atomically."""
+
+        with transaction.atomic():
+            self.claim_chunk(rows)
+            users = User.objects.bulk_create_users(
+                [
+                    {**user, "type": self.user_import.type}
+                    for _, user, _ in valid_rows.values()
+                ],
+                batch_size=self.chunk_size,
+            )
+            self.create_details(users, valid_rows)
+
+            errors.sort(key=lambda _: _["row"])
+            kept_errors = max(
+                0, USER_IMPORT_CONFIG["max_errors"] - len(self.user_import.errors)
+            )
+            import_errors = self.user_import.errors + errors[:kept_errors]
+            self.update_import(
+                created_rows=F("created_rows") + len(users),
+                failed_rows=F("failed_rows") + len(errors),
+                errors=import_errors,
+            )
+
+        self.user_import.errors = import_errors
+
+    def create_details(self, users, valid_rows):
+        if not any(detail for _, _, detail in valid_rows.values()):
+            return
+
+        # the backends not returning the ids from `bulk_create`, like MySQL
+        user_ids = {_.email: _.pk for _ in users}
+        if None in user_ids.values():
+            user_ids = dict(
+                User.objects.filter(email__in=user_ids).values_list("email", "pk")
+            )
+
+        UserDetail.objects.bulk_create(
+            [
+                UserDetail(user_id=user_ids[email], **detail)
+                for email, (_, _, detail) in valid_rows.items()
+                if detail
+            ],
+            batch_size=self.chunk_size,
+        )
+        bump_version(get_model_version_key(UserDetail))
+
+    def run(self):
+        user_import = self.user_import
+
+        if missing_columns := self.validate_header():
+            error = f"Missing columns: {', '.join(missing_columns)}"
+            self.update_import(
+                status=JobStatusChoices.failed,
+                errors=[{"row": 1, "errors": {"file": [error]}}],
+                finished=timezone.now(),
+            )
+            return
+
+        if user_import.total_rows is None:
+            user_import.total_rows = sum(1 for _ in iter_csv_rows(user_import.file))
+
+        self.update_import(
+            status=JobStatusChoices.running, total_rows=user_import.total_rows
+        )
+
+        rows = iter_csv_rows(user_import.file, skip=self.processed_rows)
+        try:
+            while chunk := list(islice(rows, self.chunk_size)):
+                self.import_chunk(chunk)
+        except ImportSuperseded:
+            return  # the other run completes the import
+
+        self.update_import(status=JobStatusChoices.succeeded, finished=timezone.now())
+
+
+@register_job
+def import_users(user_import_id):
+    """Background job of the `UserImport`, see the `UserImporter`."""
+
+    user_import = UserImport.objects.get_or_none(pk=user_import_id)
+    if user_import is None or user_import.status == JobStatusChoices.succeeded:
+        return
+
+    try:
+        UserImporter(user_import).run()
+    except Exception as exc:
+        # retried by the worker, marked running again | the error is kept
+        user_import.refresh_from_db(fields=["errors"])
+        UserImport.objects.filter(pk=user_import_id).update(
+            status=JobStatusChoices.failed,
+            errors=[
+                *user_import.errors,
+                {"row": None, "errors": {"file": [f"{IMPORT_FAILED_ERROR} {exc!r}"]}},
+            ],
+            modified=timezone.now(),
+        )
+        raise
@@ -0,0 +1,34 @@
+from common.caching import bump_version, get_user_version_key
+from common.config import JobStatusChoices
+
+RECONCILE_INACTIVE_USERS_TASK = "reconcile_inactive_users"
+
+
+def reconcile_inactive_users():
+    """
+    Bumps the version of the users deactivated since the last successful run. The
+    `update` of the user queryset sends no signals, only sets the `modified` (see
+    `AppUserManagerQuerySet`), so the cached users & policies would be served
+    until they expire otherwise. The first run goes through all the inactive users.
+    """
+
+    from access.models import User
+    from common.models import ScheduledTaskRun
+
+    users = User.objects.filter(is_active=False)
+
+    last_run = (
+        ScheduledTaskRun.objects.filter(
+            task__name=RECONCILE_INACTIVE_USERS_TASK,
+            status=JobStatusChoices.succeeded,
+        )
+        .order_by("-created")
+        .first()
+    )
+    if last_run is not None:
+        # the start of the run | the rows modified while it ran are seen again
+        users = users.filter(modified__gte=last_run.created)
+
+    for batch in users.only("pk").iter_batches():
+        for user in batch:
+            bump_version(get_user_version_key(user.pk))
@@ -1,22 +1,95 @@
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager
-from django.db.models import QuerySet
 
+from common.caching import bump_version, get_model_version_key, get_user_version_key
+from common.manager import BaseObjectManagerQuerySet
+from common.passwords import password_hasher_pool
+from common.phone_numbers import normalize_phone_numbers
 
-class AppUserManagerQuerySet(QuerySet, UserManager):
+
+class AppUserManagerQuerySet(BaseObjectManagerQuerySet, UserManager):
     """Custom manager for the User model."""
 
+    def update(self, **kwargs):
+        """
+        Overridden to bump the model version, the `update` sends no signals. The
+        `modified` is set by the `BaseObjectManagerQuerySet.update`.
+        """
+
+        updated = super().update(**kwargs)
+        bump_version(get_model_version_key(self.model))
+        return updated
+
+    update.alters_data = True
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        """
+        Overridden to bump the versions of the updated users (see `common.caching`),
+        the objects are at hand. Updated through the `update`, per batch.
+        """
+
+        objs = list(objs)
+        updated = super().bulk_update(objs, fields, batch_size=batch_size)
+
+        for obj in objs:
+            bump_version(get_user_version_key(obj.pk))
+        return updated
+
+    bulk_update.alters_data = True
+
     def _create_user(self, email: str, password: str | None, **extra_fields):
         """
         Create and save a user with the given email and password.
         """
 
+        user = self.build_user(email, make_password(password), **extra_fields)
+        user.save(using=self._db)
+        return user
+
+    def build_user(self, email: str, password_hash: str, **extra_fields):
+        """Returns the unsaved user, with the already hashed password."""
+
         if not email:
             raise ValueError("The given email must be set")
         email = self.normalize_email(email)
         user = self.model(email=email, username=email, **extra_fields)
-        user.password = make_password(password)
-        user.save(using=self._db)
+        user.password = password_hash
+        return user
+
+    def bulk_create_users(self, users: list[dict], batch_size=500):
+        """
+        Creates the users from the given [{"email":, "password":, **extra_fields}].
+        The passwords are hashed in parallel, on the `password_hasher_pool`, and
+        the users are inserted in batches.
+
+        Note:
+            Like any `bulk_create`, no signals are sent, the model version
+            (see `common.caching`) is bumped here.
+        """
+
+        users = [dict(_) for _ in users]
+        password_hashes = password_hasher_pool.make_passwords(
+            [_.pop("password", None) for _ in users]
+        )
+        instances = [
+            self.build_user(password_hash=password_hash, **user)
+            for user, password_hash in zip(users, password_hashes)
+        ]
+
+        instances = self.bulk_create(instances, batch_size=batch_size)
+        bump_version(get_model_version_key(self.model))
+        return instances
+
+    async def acreate_user(self, email, password=None, **extra_fields):
+        """Async version of the `create_user`, hashes on the `password_hasher_pool`."""
+
+        extra_fields.setdefault("is_staff", False)
+        extra_fields.setdefault("is_superuser", False)
+
+        user = self.build_user(
+            email, await password_hasher_pool.amake_password(password), **extra_fields
+        )
+        await user.asave(using=self._db)
         return user
 
     def create_user(self, email, password=None, **extra_fields):
@@ -38,3 +111,13 @@ class AppUserManagerQuerySet(QuerySet, UserManager):
             raise ValueError("Superuser must have is_superuser=True.")
 
         return self._create_user(email, password, **extra_fields)
+
+    def by_phone(self, *phone_numbers):
+        """
+        Returns the users with any of the given phone numbers. The numbers are
+        normalized to E.164, so this is an exact lookup on the indexed column.
+        Invalid numbers match nothing.
+        """
+
+        normalized = [_ for _ in normalize_phone_numbers(phone_numbers) if _]
+        return self.filter(phone_number__in=normalized)
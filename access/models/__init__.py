@@ -1 +1,2 @@
 from .user import User
+from .user_import import UserImport
@@ -0,0 +1,48 @@
+from django.db import models
+
+from access.config import UserTypeChoices
+from access.models.user import User
+from common.config import USER_IMPORT_CONFIG, JobStatusChoices
+from common.model_fields import AppFileField
+from common.models import (
+    COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG,
+    COMMON_CHAR_FIELD_MAX_LENGTH,
+    BaseModel,
+)
+
+
+class UserImport(BaseModel):
+    """
+    A CSV import of the users, see `access.imports`. The file is processed by a
+    worker in chunks, the progress & the row errors are recorded here.
+    """
+
+    # indexed | the protected media is resolved to the row, see `PROTECTED_MEDIA_OWNERS`
+    file = AppFileField(
+        max_size=USER_IMPORT_CONFIG["max_size"], upload_to="imports/", db_index=True
+    )
+    type = models.CharField(
+        choices=UserTypeChoices.choices,
+        max_length=COMMON_CHAR_FIELD_MAX_LENGTH,
+        **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG,
+    )
+    created_by = models.ForeignKey(
+        to=User, on_delete=models.SET_NULL, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG
+    )
+
+    status = models.CharField(
+        choices=JobStatusChoices.choices,
+        default=JobStatusChoices.queued,
+        max_length=32,
+    )
+    # rows | the processed rows are committed, a retry resumes after them
+    total_rows = models.PositiveIntegerField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_rows = models.PositiveIntegerField(default=0)
+    failed_rows = models.PositiveIntegerField(default=0)
+    # [{"row": 2, "errors": {"email": ["..."]}}, ...] | the row numbers as in the file
+    errors = models.JSONField(default=list, blank=True)
+    finished = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+
+    class Meta(BaseModel.Meta):
+        default_related_name = "related_user_imports"
@@ -1,2 +1,9 @@
+from .auth import TokenObtainSerializer, TokenRefreshSerializer
 from .job_seeker import UserCreateModelSerializer, UserListModelSerializer
 from .recruiter import RecruiterUserCreateSerializer
+from .user_import import (
+    UserDetailImportRowSerializer,
+    UserImportCreateSerializer,
+    UserImportRowSerializer,
+    UserImportStatusSerializer,
+)
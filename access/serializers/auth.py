@@ -0,0 +1,51 @@
+from django.contrib.auth import authenticate
+from rest_framework import serializers
+
+from access.models import User
+from common.authentication import (
+    REFRESH_TOKEN,
+    get_password_fingerprint,
+    issue_tokens,
+    read_token,
+)
+from common.serializers import AppSerializer
+
+
+class TokenObtainSerializer(AppSerializer):
+    """Validates the credentials & issues the signed access and refresh tokens."""
+
+    email = serializers.EmailField()
+    password = serializers.CharField(write_only=True)
+
+    def validate(self, attrs):
+        user = authenticate(
+            request=self.context.get("request"),
+            username=attrs["email"],
+            password=attrs["password"],
+        )
+
+        if not user:
+            raise serializers.ValidationError("Invalid email or password.")
+
+        attrs["tokens"] = issue_tokens(user)
+        return attrs
+
+
+class TokenRefreshSerializer(AppSerializer):
+    """Issues new tokens for a valid refresh token. The user is re-validated."""
+
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        payload = read_token(attrs["refresh"], REFRESH_TOKEN)
+        user = User.objects.filter(pk=payload["u"]).first() if payload else None
+
+        if (
+            not user
+            or not user.is_active
+            or payload.get("p") != get_password_fingerprint(user)
+        ):
+            raise serializers.ValidationError("Invalid or expired refresh token.")
+
+        attrs["tokens"] = issue_tokens(user)
+        return attrs
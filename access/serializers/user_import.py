@@ -0,0 +1,53 @@
+from rest_framework import serializers
+
+from access.models import UserImport
+from access.models.user import UserDetail
+from access.serializers.job_seeker import UserCreateModelSerializer
+from common.serializers import AppCreateModelSerializer, AppReadOnlyModelSerializer
+
+
+class UserImportCreateSerializer(AppCreateModelSerializer):
+    class Meta(AppCreateModelSerializer.Meta):
+        model = UserImport
+        fields = ["file", "type"]
+
+    def to_representation(self, instance):
+        """The client polls the status endpoint with the id."""
+
+        return UserImportStatusSerializer(instance).data
+
+
+class UserImportStatusSerializer(AppReadOnlyModelSerializer):
+    class Meta(AppReadOnlyModelSerializer.Meta):
+        model = UserImport
+        fields = [
+            "id",
+            "uuid",
+            "type",
+            "status",
+            "total_rows",
+            "processed_rows",
+            "created_rows",
+            "failed_rows",
+            "errors",
+            "created",
+            "finished",
+        ]
+
+
+class UserImportRowSerializer(UserCreateModelSerializer):
+    """
+    Validates an imported row with the `UserCreateModelSerializer` rules. The
+    email uniqueness is checked for the whole chunk at once, by the importer.
+    """
+
+    class Meta(UserCreateModelSerializer.Meta):
+        extra_kwargs = {"email": {"validators": []}}
+
+
+class UserDetailImportRowSerializer(serializers.ModelSerializer):
+    """Validates the optional `UserDetail` columns of an imported row."""
+
+    class Meta:
+        model = UserDetail
+        fields = ["date_of_birth", "gender"]
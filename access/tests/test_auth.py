@@ -0,0 +1,102 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from access.models import User
+from common.asgi import _authenticate, issue_change_feed_ticket
+from common.authentication import (
+    ACCESS_TOKEN,
+    FEED_TICKET,
+    _user_local_cache,
+    create_token,
+)
+
+
+class SignedTokenAuthenticationTestCase(TestCase):
+    """The access, refresh tokens & the feed tickets, and their revocation."""
+
+    def setUp(self):
+        cache.clear()
+        # the versions restart with the cleared cache
+        _user_local_cache.clear()
+        self.user = User.objects.create_user(
+            "recruiter@example.com", "first-password", type="recruiter"
+        )
+        self.client = APIClient()
+
+    def obtain_tokens(self, password="first-password"):
+        self.client.credentials()
+        response = self.client.post(
+            "/token/", {"email": self.user.email, "password": password}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def get_status_code(self, access_token):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        return self.client.get("/user/list/").status_code
+
+    def test_access_token(self):
+        access_token = self.obtain_tokens()["access"]
+
+        self.assertEqual(self.get_status_code(access_token), 200)
+        self.assertEqual(self.get_status_code(f"{access_token[:-2]}xx"), 401)
+        self.assertEqual(self.get_status_code(self.obtain_tokens()["refresh"]), 401)
+
+        with mock.patch("time.time", return_value=time.time() + 60 * 60):
+            self.assertEqual(self.get_status_code(access_token), 401)
+
+    def test_password_change_revokes_the_tokens(self):
+        tokens = self.obtain_tokens()
+
+        self.user.set_password("second-password")
+        self.user.save()
+
+        self.assertEqual(self.get_status_code(tokens["access"]), 401)
+        self.client.credentials()
+        response = self.client.post(
+            "/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+        # the new tokens work
+        self.assertEqual(
+            self.get_status_code(self.obtain_tokens("second-password")["access"]), 200
+        )
+
+    def test_token_without_the_fingerprint(self):
+        access_token = create_token(self.user, ACCESS_TOKEN, {"p": ""})
+        self.assertEqual(self.get_status_code(access_token), 401)
+
+    def test_deactivation_revokes_the_tokens(self):
+        access_token = self.obtain_tokens()["access"]
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.get_status_code(access_token), 401)
+
+    def test_refresh_token(self):
+        tokens = self.obtain_tokens()
+
+        response = self.client.post(
+            "/token/refresh/", {"refresh": tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_status_code(response.json()["data"]["access"]), 200)
+
+    def test_feed_ticket(self):
+        ticket = issue_change_feed_ticket(
+            self.user, {"e": int(time.time()) + 60, "p": "stale"}
+        )["ticket"]
+        self.assertIsNone(_authenticate(ticket, FEED_TICKET))
+
+        ticket = issue_change_feed_ticket(self.user)["ticket"]
+        self.assertEqual(_authenticate(ticket, FEED_TICKET)["user_id"], self.user.pk)
+
+        self.user.set_password("second-password")
+        self.user.save()
+        self.assertIsNone(_authenticate(ticket, FEED_TICKET))
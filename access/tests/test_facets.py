@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from access.models import User
+
+
+class UserFacetsTestCase(TestCase):
+    """The `facets/` of the user list, cached under the user model version."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_superuser("admin@example.com", None)
+        )
+        User.objects.create_user("first@example.com", None, type="recruiter")
+        User.objects.create_user("second@example.com", None, type="recruiter")
+
+    def get_type_counts(self, query=""):
+        response = self.client.get(f"/user/list/facets/{query}")
+        self.assertEqual(response.status_code, 200)
+        return {
+            _["value"]: _["count"] for _ in response.json()["data"]["facets"]["type"]
+        }
+
+    def test_counts_follow_the_filters(self):
+        self.assertEqual(self.get_type_counts()["recruiter"], 2)
+        self.assertEqual(self.get_type_counts("?type=recruiter"), {"recruiter": 2})
+
+        response = self.client.get("/user/list/?type=recruiter")
+        self.assertEqual(response.json()["data"]["count"], 2)
+
+    def test_saved_user_invalidates_the_counts(self):
+        self.assertEqual(self.get_type_counts()["recruiter"], 2)
+
+        user = User.objects.get(email="first@example.com")
+        user.type = "job_seeker"
+        user.save()
+        self.assertEqual(self.get_type_counts()["recruiter"], 1)
+
+        User.objects.get(email="second@example.com").delete()
+        self.assertNotIn("recruiter", self.get_type_counts())
@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+
+from access.imports import (
+    DUPLICATE_EMAIL_ERROR,
+    EXISTING_EMAIL_ERROR,
+    IMPORT_FAILED_ERROR,
+    ImportSuperseded,
+    UserImporter,
+    import_users,
+)
+from access.models import User, UserImport
+from common.config import JobStatusChoices
+
+
+@mock.patch.dict("access.imports.USER_IMPORT_CONFIG", {"chunk_size": 2})
+class UserImportTestCase(TestCase):
+    """The chunked CSV import, its resume & the email conflicts."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    def create_import(self, *emails):
+        content = "\n".join(
+            [
+                "email,first_name,last_name,phone_number",
+                *[f"{_},Name,," for _ in emails],
+            ]
+        )
+        return UserImport.objects.create(
+            file=ContentFile(content.encode(), name="users.csv"), type="job_seeker"
+        )
+
+    def get_row_errors(self, user_import):
+        user_import.refresh_from_db()
+        return {_["row"]: _["errors"]["email"] for _ in user_import.errors}
+
+    def test_duplicate_and_existing_emails(self):
+        User.objects.create_user("existing@example.com", None)
+        user_import = self.create_import(
+            "first@example.com", "first@example.com", "existing@example.com"
+        )
+
+        import_users(user_import.pk)
+
+        user_import.refresh_from_db()
+        self.assertEqual(user_import.status, JobStatusChoices.succeeded)
+        self.assertEqual((user_import.created_rows, user_import.failed_rows), (1, 2))
+        self.assertEqual(
+            self.get_row_errors(user_import),
+            {3: [DUPLICATE_EMAIL_ERROR], 4: [EXISTING_EMAIL_ERROR]},
+        )
+
+    def test_email_taken_after_the_check(self):
+        User.objects.create_user("taken@example.com", None)
+        user_import = self.create_import("taken@example.com", "free@example.com")
+        pop_existing_emails = UserImporter.pop_existing_emails
+        calls = []
+
+        def miss_the_first_check(valid_rows, errors):
+            calls.append(len(valid_rows))
+            return pop_existing_emails(valid_rows, errors) if len(calls) > 1 else 0
+
+        with mock.patch.object(
+            UserImporter, "pop_existing_emails", side_effect=miss_the_first_check
+        ):
+            import_users(user_import.pk)
+
+        self.assertEqual(len(calls), 2)  # re-checked on the `IntegrityError`
+        self.assertTrue(User.objects.filter(email="free@example.com").exists())
+        self.assertEqual(self.get_row_errors(user_import), {2: [EXISTING_EMAIL_ERROR]})
+
+    def test_resume_after_the_processed_rows(self):
+        user_import = self.create_import(
+            "first@example.com", "second@example.com", "third@example.com"
+        )
+        UserImport.objects.filter(pk=user_import.pk).update(processed_rows=2)
+
+        import_users(user_import.pk)
+
+        self.assertEqual(
+            list(User.objects.values_list("email", flat=True)), ["third@example.com"]
+        )
+        user_import.refresh_from_db()
+        self.assertEqual(user_import.processed_rows, 3)
+        self.assertEqual(user_import.status, JobStatusChoices.succeeded)
+
+    def test_superseded_run_writes_nothing(self):
+        user_import = self.create_import(
+            "first@example.com", "second@example.com", "third@example.com"
+        )
+        stale, current = UserImporter(user_import), UserImporter(user_import)
+        UserImport.objects.filter(pk=user_import.pk).update(
+            status=JobStatusChoices.running
+        )
+        current.import_chunk([(2, {"email": "first@example.com"})])
+
+        with self.assertRaises(ImportSuperseded):
+            stale.import_chunk([(2, {"email": "first@example.com"})])
+
+        # a whole run of the stale importer stops at its first chunk
+        stale.run()
+        self.assertEqual(User.objects.count(), 1)
+        user_import.refresh_from_db()
+        self.assertEqual(user_import.processed_rows, 1)
+        self.assertEqual(user_import.status, JobStatusChoices.running)
+
+    def test_failure_is_recorded(self):
+        user_import = self.create_import("first@example.com")
+
+        with mock.patch.object(UserImporter, "run", side_effect=RuntimeError("down")):
+            with self.assertRaises(RuntimeError):
+                import_users(user_import.pk)
+
+        user_import.refresh_from_db()
+        self.assertEqual(user_import.status, JobStatusChoices.failed)
+        self.assertIn(IMPORT_FAILED_ERROR, user_import.errors[-1]["errors"]["file"][0])
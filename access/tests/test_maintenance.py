@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from access.maintenance import RECONCILE_INACTIVE_USERS_TASK, reconcile_inactive_users
+from access.models import User
+from common.caching import get_user_version_key, get_version
+from common.config import JobStatusChoices
+from common.models import ScheduledTask, ScheduledTaskRun
+
+
+class ReconcileInactiveUsersTestCase(TestCase):
+    def setUp(self):
+        self.old = User.objects.create_user("old@example.com", None)
+        self.new = User.objects.create_user("new@example.com", None)
+
+    def get_versions(self):
+        return [get_version(get_user_version_key(_.pk)) for _ in [self.old, self.new]]
+
+    def test_update_sets_modified(self):
+        before = timezone.now()
+        User.objects.filter(pk=self.old.pk).update(is_active=False)
+
+        self.old.refresh_from_db()
+        self.assertGreaterEqual(self.old.modified, before)
+
+    def test_bulk_update_bumps_the_user_versions(self):
+        versions = self.get_versions()
+        self.old.is_active = self.new.is_active = False
+
+        User.objects.bulk_update([self.old, self.new], ["is_active"], batch_size=1)
+
+        self.assertEqual(self.get_versions(), [_ + 1 for _ in versions])
+
+    def test_only_the_users_deactivated_since_the_last_run(self):
+        User.objects.filter(pk=self.old.pk).update(
+            is_active=False, modified=timezone.now() - timedelta(hours=1)
+        )
+        task = ScheduledTask.objects.create(
+            name=RECONCILE_INACTIVE_USERS_TASK, schedule="* * * * *"
+        )
+        ScheduledTaskRun.objects.create(
+            task=task, node="test", status=JobStatusChoices.succeeded
+        )
+        User.objects.filter(pk=self.new.pk).update(is_active=False)
+        versions = self.get_versions()
+
+        reconcile_inactive_users()
+
+        self.assertEqual(self.get_versions(), [versions[0], versions[1] + 1])
+
+    def test_first_run_goes_through_all_the_inactive_users(self):
+        User.objects.update(is_active=False)
+        versions = self.get_versions()
+
+        reconcile_inactive_users()
+
+        self.assertEqual(self.get_versions(), [_ + 1 for _ in versions])
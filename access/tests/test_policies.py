@@ -0,0 +1,43 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from access.models import User
+from common.config import UNTYPED_USER_ROLE
+from common.policies import policy_engine
+
+
+class UserListPolicyTestCase(TestCase):
+    """The `user_list` policy by the user type, the users without one included."""
+
+    def setUp(self):
+        cache.clear()
+        # the versions restart with the cleared cache
+        policy_engine._local_cache.clear()
+        self.recruiter = User.objects.create_user(
+            "recruiter@example.com", None, type="recruiter"
+        )
+        self.job_seeker = User.objects.create_user(
+            "job_seeker@example.com", None, type="job_seeker"
+        )
+        self.untyped = User.objects.create_user("untyped@example.com", None)
+
+    def get_listed_ids(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get("/user/list/?ordering=id")
+        self.assertEqual(response.status_code, 200)
+        return [_["id"] for _ in response.json()["data"]["results"]]
+
+    def test_untyped_user_has_the_default_role(self):
+        self.assertIn(UNTYPED_USER_ROLE, policy_engine.get_roles(self.untyped))
+        self.assertNotIn(UNTYPED_USER_ROLE, policy_engine.get_roles(self.recruiter))
+
+    def test_list_scopes(self):
+        self.assertEqual(
+            self.get_listed_ids(self.recruiter),
+            [self.recruiter.pk, self.job_seeker.pk, self.untyped.pk],
+        )
+        self.assertEqual(self.get_listed_ids(self.job_seeker), [self.job_seeker.pk])
+        # own scope, not a 403
+        self.assertEqual(self.get_listed_ids(self.untyped), [self.untyped.pk])
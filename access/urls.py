@@ -2,7 +2,11 @@ from django.urls import path
 
 from access.views import (
     RecruiterUserCreateAPIView,
+    TokenObtainAPIView,
+    TokenRefreshAPIView,
     UserCreateAPIView,
+    UserImportCreateAPIView,
+    UserImportStatusAPIViewSet,
     UserListAPIViewSet,
     home,
 )
@@ -13,11 +17,18 @@ router = AppRouter()
 URL_PREFIX = "user"
 
 router.register(f"{URL_PREFIX}/list", UserListAPIViewSet, basename="user-list")
+router.register(
+    f"{URL_PREFIX}/import", UserImportStatusAPIViewSet, basename="user-import"
+)
 
 
 urlpatterns = [
     path("home/", home),
+    # auth
+    path("token/", TokenObtainAPIView.as_view()),
+    path("token/refresh/", TokenRefreshAPIView.as_view()),
     # user
     path("user/create/", UserCreateAPIView.as_view()),
+    path("user/import/", UserImportCreateAPIView.as_view()),
     path("recruiter/create/", RecruiterUserCreateAPIView.as_view()),
 ] + router.urls
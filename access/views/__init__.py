@@ -1,3 +1,5 @@
+from .auth import TokenObtainAPIView, TokenRefreshAPIView
 from .home import home
 from .job_seeker import UserCreateAPIView, UserListAPIViewSet
 from .recruiter import RecruiterUserCreateAPIView
+from .user_import import UserImportCreateAPIView, UserImportStatusAPIViewSet
@@ -0,0 +1,22 @@
+from access.serializers import TokenObtainSerializer, TokenRefreshSerializer
+from common.views import AppAPIView, NonAuthenticatedAPIMixin
+
+
+class TokenObtainAPIView(NonAuthenticatedAPIMixin, AppAPIView):
+    """Login, returns the signed access & refresh tokens."""
+
+    serializer_class = TokenObtainSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_valid_serializer()
+        return self.send_response(data=serializer.validated_data["tokens"])
+
+
+class TokenRefreshAPIView(NonAuthenticatedAPIMixin, AppAPIView):
+    """Returns new tokens for the given refresh token."""
+
+    serializer_class = TokenRefreshSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_valid_serializer()
+        return self.send_response(data=serializer.validated_data["tokens"])
@@ -16,3 +16,6 @@ class UserCreateAPIView(AppAPIView):
 class UserListAPIViewSet(AppModelListAPIViewSet):
     queryset = User.objects.all()
     serializer_class = UserListModelSerializer
+    policy_slug = "user_list"
+    policy_owner_field = "pk"
+    filterset_fields = ["type", "is_active"]
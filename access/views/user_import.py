@@ -0,0 +1,27 @@
+from rest_framework import parsers
+
+from access.imports import import_users
+from access.models import UserImport
+from access.serializers import UserImportCreateSerializer, UserImportStatusSerializer
+from common.permissions import PolicyPermission
+from common.views import AppCreateAPIView, AppModelRetrieveAPIViewSet
+
+
+class UserImportCreateAPIView(AppCreateAPIView):
+    """
+    Uploads the users CSV, the import is run by a worker. The progress & the row
+    errors are served by the `UserImportStatusAPIViewSet`.
+    """
+
+    parser_classes = [parsers.MultiPartParser]
+    serializer_class = UserImportCreateSerializer
+    permission_classes = [PolicyPermission]
+    policy_slug = "user_import"
+    post_create_job = import_users
+
+
+class UserImportStatusAPIViewSet(AppModelRetrieveAPIViewSet):
+    queryset = UserImport.objects.all()
+    serializer_class = UserImportStatusSerializer
+    policy_slug = "user_import"
+    policy_owner_field = "created_by"
@@ -1,12 +1,107 @@
 from django.apps import apps
 from django.contrib import admin
+from django.db import models
+
+from common.pagination import EstimatedCountPaginator
+
+# max number of columns shown on the generated changelist
+ADMIN_LIST_DISPLAY_MAX_FIELDS = 8
+
+
+class AppModelAdmin(admin.ModelAdmin):
+    """
+    Base `ModelAdmin` for the auto registered models. Safe for large tables:
+        > no full result count (`SELECT COUNT(*)` on the whole table).
+        > estimated count pagination.
+        > ordered by the primary key.
+    """
+
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    ordering = ["-pk"]
+
+
+def is_indexed_field(field):
+    """Returns a bool, that if the field has a db index (which can be searched)."""
+
+    return bool(field.primary_key or field.unique or field.db_index)
+
+
+def get_search_fields(model):
+    """Returns the prefix search fields, only the indexed char fields."""
+
+    return [
+        f"^{field.name}"
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.CharField)
+        and not field.choices
+        and is_indexed_field(field)
+    ]
+
+
+def get_list_display(model):
+    """Returns the changelist columns. Only the cheap to render fields."""
+
+    list_display = ["__str__"]
+    for field in model._meta.concrete_fields:
+        if len(list_display) > ADMIN_LIST_DISPLAY_MAX_FIELDS:
+            break
+
+        if (
+            field.is_relation
+            or is_indexed_field(field)
+            or field.choices
+            or isinstance(field, models.BooleanField)
+        ):
+            list_display.append(field.name)
+
+    return list_display
+
+
+def get_model_admin(model):
+    """
+    Generates the `ModelAdmin` for the given model:
+        > `search_fields` restricted to the indexed fields.
+        > relations as `autocomplete_fields` if the related model is searchable,
+          else as `raw_id_fields`, never the dropdowns that load whole tables.
+        > `list_select_related` for the relations displayed on the changelist.
+    """
+
+    list_display = get_list_display(model)
+    autocomplete_fields, raw_id_fields = [], []
+
+    for field in model._meta.get_fields():
+        if not (field.many_to_many or field.many_to_one) or not field.concrete:
+            continue
+
+        if get_search_fields(field.related_model):
+            autocomplete_fields.append(field.name)
+        else:
+            raw_id_fields.append(field.name)
+
+    list_select_related = [
+        field.name
+        for field in model._meta.concrete_fields
+        if field.many_to_one and field.name in list_display
+    ]
+
+    return type(
+        f"{model.__name__}Admin",
+        (AppModelAdmin,),
+        {
+            "list_display": list_display,
+            "search_fields": get_search_fields(model),
+            "autocomplete_fields": autocomplete_fields,
+            "raw_id_fields": raw_id_fields,
+            "list_select_related": list_select_related or False,
+        },
+    )
 
 
 def register_models():
-    models = apps.get_models()
-    for model in models:
+    for model in apps.get_models():
         try:  # noqa
-            admin.site.register(model)
+            admin.site.register(model, get_model_admin(model))
         except admin.sites.AlreadyRegistered:
             pass
 
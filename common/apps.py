@@ -4,3 +4,55 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "common"
+
+    # see `common.scheduler` | the cached metadata (users, policies, facets) needs no
+    # periodic refresh, it is versioned & invalidated on write, see `common.caching`
+    periodic_tasks = [
+        {
+            "name": "clear_expired_sessions",
+            "schedule": "0 3 * * *",
+            "task": "common.maintenance.clear_expired_sessions",
+            "jitter": 600,
+        },
+        {
+            "name": "prune_history",
+            "schedule": "30 3 * * *",
+            "task": "common.maintenance.prune_history",
+            "jitter": 600,
+        },
+    ]
+
+    def ready(self):
+        from django.apps import apps
+        from django.contrib.auth import get_user_model
+        from django.core import checks
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+
+        from common.caching import (
+            bump_model_version,
+            bump_user_version,
+            check_shared_cache,
+        )
+        from common.change_feed import connect_change_feed
+        from common.choices import choice_registry
+        from common.config import FACETS_MODELS
+
+        choice_registry.autodiscover()
+
+        # versioned caches need a cache shared by the processes
+        checks.register(check_shared_cache, checks.Tags.caches)
+
+        # user or roles changed | cached policies & users are versioned
+        user_model = get_user_model()
+        post_save.connect(bump_user_version, sender=user_model)
+        post_delete.connect(bump_user_version, sender=user_model)
+        m2m_changed.connect(bump_user_version, sender=user_model.groups.through)
+
+        # object changed | the cached facets are versioned, see `common.facets`
+        for label in FACETS_MODELS:
+            model = apps.get_model(label)
+            post_save.connect(bump_model_version, sender=model)
+            post_delete.connect(bump_model_version, sender=model)
+
+        # live change feed | see `config.asgi`
+        connect_change_feed()
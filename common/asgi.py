@@ -0,0 +1,326 @@
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+
+from common.authentication import (
+    ACCESS_TOKEN,
+    FEED_TICKET,
+    create_token,
+    get_cached_user,
+    is_token_current,
+    read_token,
+)
+from common.caching import get_user_version_key, get_version
+from common.change_feed import change_feed_hub
+from common.config import (
+    API_RESPONSE_ACTION_CODES,
+    AUTH_TOKEN_CONFIG,
+    CHANGE_FEED_CONFIG,
+)
+from common.policies import POLICY_SCOPE_OWN, policy_engine
+
+CHANGE_FEED_POLICY = "change_feed"
+# query params that are not the event filters
+CHANGE_FEED_RESERVED_PARAMS = ["models", "ticket"]
+
+
+def issue_change_feed_ticket(user, access_payload=None) -> dict:
+    """
+    Returns a short lived ticket to open the change feed with, `?ticket=<ticket>`.
+    The browser's EventSource & WebSocket cannot set headers, so the ticket is in
+    the url & the access logs. It is only valid for opening the feed, for the
+    `feed_ticket_lifetime`. The stream is still closed when the access token
+    it was issued with expires.
+    """
+
+    claims = {"x": int(time.time()) + AUTH_TOKEN_CONFIG["access_lifetime"]}
+    if access_payload:
+        claims["x"] = access_payload.get("e", claims["x"])
+        # the fingerprint of the access token, no query for the password
+        if "p" in access_payload:
+            claims["p"] = access_payload["p"]
+
+    return {
+        "ticket": create_token(user, FEED_TICKET, claims),
+        "expires_in": AUTH_TOKEN_CONFIG["feed_ticket_lifetime"],
+    }
+
+
+def _authenticate(token, token_type):
+    """
+    Returns the session {user_id, scope, version, expires} of the token, if the
+    user is allowed on the change feed. Re-checked with the `_is_session_valid`.
+    """
+
+    payload = read_token(token, token_type) if token else None
+    if not payload or not is_token_current(payload):
+        return None
+
+    user = get_cached_user(payload["u"])
+    if user.is_anonymous:
+        return None
+
+    if (scope := policy_engine.get_scope(user, CHANGE_FEED_POLICY)) is None:
+        return None
+
+    return {
+        "user_id": user.pk,
+        "scope": scope,
+        "version": get_version(get_user_version_key(user.pk)),
+        "expires": payload.get("x", payload["e"]),
+    }
+
+
+def _is_session_valid(session) -> bool:
+    """
+    Returns a bool, that if the token has not expired & the user is unchanged.
+    Any change of the user or the user's roles bumps the version, the client has
+    to open the feed again, re-checking the policy.
+    """
+
+    return session["expires"] >= time.time() and session["version"] == get_version(
+        get_user_version_key(session["user_id"])
+    )
+
+
+class ChangeFeedApplication:
+    """
+    ASGI application of the live change feed. Pushes the create, update & delete
+    events of the models in the `CHANGE_FEED_CONFIG` (see `common.change_feed`):
+        > http: server sent events, `GET /changes/?models=access.user&type=recruiter`
+        > websocket: json messages, can re-subscribe by sending
+          {"models": ["access.user"], "filters": {"type": "recruiter"}}
+
+    Authenticated with the access token, `Authorization: Bearer <token>` or the
+    `?ticket=` from the `issue_change_feed_ticket`. The session is re-checked on
+    every heartbeat, the stream is closed when the token expires or the user
+    changes. With the "own" policy scope, only the events of the user's own
+    objects are sent.
+    """
+
+    def __init__(self, hub=change_feed_hub):
+        self.hub = hub
+        self.heartbeat_seconds = CHANGE_FEED_CONFIG["heartbeat_seconds"]
+
+    async def __call__(self, scope, receive, send):
+        params = {k: v[-1] for k, v in parse_qs(scope["query_string"].decode()).items()}
+        session = await sync_to_async(_authenticate)(*self.get_token(scope, params))
+        models, filters = self.get_subscription_args(
+            params.get("models"),
+            {k: v for k, v in params.items() if k not in CHANGE_FEED_RESERVED_PARAMS},
+        )
+
+        if scope["type"] == "websocket":
+            handler = self.handle_websocket
+        else:
+            handler = self.handle_event_stream
+
+        await handler(receive, send, session, models, filters)
+
+    @staticmethod
+    def get_token(scope, params) -> tuple:
+        """Returns the (token, token type), the header takes precedence."""
+
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                keyword, _, token = value.decode(errors="ignore").partition(" ")
+                if keyword.lower() == AUTH_TOKEN_CONFIG["keyword"].lower():
+                    return token.strip(), ACCESS_TOKEN
+
+        return params.get("ticket"), FEED_TICKET
+
+    def subscribe(self, session, models, filters):
+        owner_id = session["user_id"] if session["scope"] == POLICY_SCOPE_OWN else None
+        return self.hub.subscribe(models, filters, owner_id=owner_id)
+
+    @staticmethod
+    def get_subscription_args(models, filters):
+        """Returns the (models, filters), restricted to the configured models."""
+
+        configured = CHANGE_FEED_CONFIG["models"]
+        if isinstance(models, str):
+            models = [_.strip() for _ in models.split(",") if _.strip()]
+
+        return [_ for _ in models or configured if _ in configured], filters
+
+    def parse_subscribe_message(self, message) -> tuple:
+        """
+        Returns the (models, filters) of the websocket subscribe message. Raises a
+        ValueError with the detail, if it is not a valid subscribe message.
+        """
+
+        try:
+            data = json.loads(message.get("text") or message.get("bytes") or "")
+        except ValueError:
+            raise ValueError("The message must be a JSON object.") from None
+
+        if not isinstance(data, dict):
+            raise ValueError("The message must be a JSON object.")
+
+        models, filters = data.get("models"), data.get("filters") or {}
+        if models is not None and (
+            not isinstance(models, list) or not all(isinstance(_, str) for _ in models)
+        ):
+            raise ValueError("`models` must be a list of strings.")
+
+        if not isinstance(filters, dict) or not all(
+            isinstance(value, (str, int, float, bool)) for value in filters.values()
+        ):
+            raise ValueError("`filters` must be an object of the field values.")
+
+        return self.get_subscription_args(models, filters)
+
+    async def stream(
+        self, session, subscription, receive, send_event, on_message=None
+    ) -> bool:
+        """
+        Sends the events of the subscription, and heartbeats (None) when idle,
+        until the client disconnects. The client messages go to the `on_message`.
+        Returns False if stopped because the session is no longer valid.
+        """
+
+        loop = asyncio.get_running_loop()
+        check_at = loop.time() + self.heartbeat_seconds
+        receive_task = asyncio.ensure_future(receive())
+        try:
+            while True:
+                event_task = asyncio.ensure_future(subscription.get())
+                done, _ = await asyncio.wait(
+                    {receive_task, event_task},
+                    timeout=max(0, check_at - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if event_task in done:
+                    await send_event(event_task.result())
+                else:
+                    event_task.cancel()
+
+                if receive_task in done:
+                    message = receive_task.result()
+                    if message["type"] in ["http.disconnect", "websocket.disconnect"]:
+                        return True
+
+                    if on_message is not None:
+                        subscription = await on_message(subscription, message)
+                    receive_task = asyncio.ensure_future(receive())
+                elif not done:
+                    await send_event(None)
+
+                # also while busy | the heartbeats are only sent when idle
+                if loop.time() >= check_at:
+                    if not await sync_to_async(_is_session_valid)(session):
+                        return False
+                    check_at = loop.time() + self.heartbeat_seconds
+        finally:
+            receive_task.cancel()
+            self.hub.unsubscribe(subscription)
+
+    async def handle_event_stream(self, receive, send, session, models, filters):
+        if session is None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 401,
+                    "headers": [(b"content-type", b"application/json")],
+                }
+            )
+            body = {
+                "data": {"detail": "Invalid or expired token."},
+                "status": "error",
+                "action_code": "AUTH_TOKEN_NOT_PROVIDED_OR_INVALID",
+            }
+            await send(
+                {"type": "http.response.body", "body": json.dumps(body).encode()}
+            )
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),  # nginx
+                ],
+            }
+        )
+
+        async def send_event(event):
+            if event is None:
+                body = b": heartbeat\n\n"
+            else:
+                body = f"event: {event['action']}\ndata: {json.dumps(event)}\n\n"
+                body = body.encode()
+
+            await send({"type": "http.response.body", "body": body, "more_body": True})
+
+        subscription = self.subscribe(session, models, filters)
+        if not await self.stream(session, subscription, receive, send_event):
+            # the client has to open the feed again, with a new token
+            body = b"event: expired\ndata: {}\n\n"
+            await send({"type": "http.response.body", "body": body})
+
+    async def handle_websocket(self, receive, send, session, models, filters):
+        message = await receive()
+        if message["type"] != "websocket.connect":
+            return
+
+        if session is None:
+            await send({"type": "websocket.close", "code": 4401})
+            return
+
+        await send({"type": "websocket.accept"})
+
+        async def send_event(event):
+            if event is not None:
+                await send({"type": "websocket.send", "text": json.dumps(event)})
+
+        async def on_message(subscription, message):
+            try:
+                models, filters = self.parse_subscribe_message(message)
+            except ValueError as exc:
+                # the current subscription is kept
+                body = {
+                    "data": {"detail": str(exc)},
+                    "status": "error",
+                    "action_code": API_RESPONSE_ACTION_CODES["display_error_1"],
+                }
+                await send({"type": "websocket.send", "text": json.dumps(body)})
+                return subscription
+
+            self.hub.unsubscribe(subscription)
+            return self.subscribe(session, models, filters)
+
+        subscription = self.subscribe(session, models, filters)
+        if not await self.stream(
+            session, subscription, receive, send_event, on_message
+        ):
+            await send({"type": "websocket.close", "code": 4401})
+
+
+def get_asgi_application(django_application):
+    """
+    Returns the ASGI application, serving the change feed on the
+    `CHANGE_FEED_CONFIG["path"]` and everything else with django.
+    """
+
+    change_feed_application = ChangeFeedApplication()
+
+    async def application(scope, receive, send):
+        if scope["type"] in ["http", "websocket"] and (
+            scope["path"] == CHANGE_FEED_CONFIG["path"]
+        ):
+            return await change_feed_application(scope, receive, send)
+
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 4404})
+            return
+
+        return await django_application(scope, receive, send)
+
+    return application
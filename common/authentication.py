@@ -0,0 +1,201 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import router
+from django.utils.encoding import force_bytes
+from django.utils.functional import SimpleLazyObject
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from common.caching import LocalCache, get_user_version_key, get_version
+from common.config import AUTH_TOKEN_CONFIG
+
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+# short lived, only to open the change feed, see `common.asgi`
+FEED_TICKET = "feed_ticket"
+
+_user_local_cache = LocalCache(
+    max_size=AUTH_TOKEN_CONFIG["user_local_cache_size"],
+    ttl=AUTH_TOKEN_CONFIG["user_cache_ttl"],
+)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(value: str) -> str:
+    key = hashlib.sha256(force_bytes(f"common.authentication{settings.SECRET_KEY}"))
+    return _b64encode(hmac.new(key.digest(), value.encode(), hashlib.sha256).digest())
+
+
+def get_password_fingerprint(user) -> str:
+    """Short hash of the password, changing the password revokes all the tokens."""
+
+    return user.get_session_auth_hash()[:16]
+
+
+def create_token(user, token_type, claims=None) -> str:
+    """
+    Returns a compact HMAC signed token `<payload>.<signature>` for the given user.
+    The payload is the base64 json of the user id, type, expiry, the password
+    fingerprint & the given claims.
+    """
+
+    lifetime = AUTH_TOKEN_CONFIG[f"{token_type}_lifetime"]
+    payload = {
+        **(claims or {}),
+        "u": user.pk,
+        "t": token_type,
+        "e": int(time.time()) + lifetime,
+    }
+    if "p" not in payload:
+        payload["p"] = get_password_fingerprint(user)
+
+    value = _b64encode(json.dumps(payload, separators=(",", ":")).encode())
+    return f"{value}.{_sign(value)}"
+
+
+def read_token(token, token_type) -> dict | None:
+    """Returns the payload if the token is valid, not expired and of the given type."""
+
+    value, _, signature = token.partition(".")
+    if not value or not hmac.compare_digest(signature, _sign(value)):
+        return None
+
+    try:
+        payload = json.loads(_b64decode(value))
+    except ValueError:
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+
+    if payload.get("t") != token_type or payload.get("e", 0) < time.time():
+        return None
+
+    return payload
+
+
+def issue_tokens(user) -> dict:
+    """Returns the access & refresh tokens for the given user. Used on login."""
+
+    return {
+        "access": create_token(user, ACCESS_TOKEN),
+        "refresh": create_token(user, REFRESH_TOKEN),
+        "expires_in": AUTH_TOKEN_CONFIG["access_lifetime"],
+    }
+
+
+def get_user_projection(user_id) -> dict | None:
+    """
+    Returns the `user_cache_fields` of the active user for the given id, from the
+    process memory or the shared cache, keyed on the user version (see
+    `common.caching`). Queries on a miss. None if the user does not exist or is
+    inactive. The password hash & the other fields are never cached, only the
+    `password_fingerprint` of it.
+    """
+
+    key = f"auth:user:{user_id}:{get_version(get_user_version_key(user_id))}"
+
+    if (projection := _user_local_cache.get(key)) is None:
+        if (projection := cache.get(key)) is None:
+            user_model = get_user_model()
+            projection = (
+                user_model.objects.filter(pk=user_id, is_active=True)
+                .values(*AUTH_TOKEN_CONFIG["user_cache_fields"], "password")
+                .first()
+            )
+            if projection:
+                projection["password_fingerprint"] = get_password_fingerprint(
+                    user_model(password=projection.pop("password"))
+                )
+            # cached as well | the unknown ids are not queried again
+            projection = projection or {}
+            cache.set(key, projection, AUTH_TOKEN_CONFIG["user_cache_ttl"])
+
+        _user_local_cache.set(key, projection)
+
+    return projection or None
+
+
+def is_token_current(payload) -> bool:
+    """
+    Returns a bool, that if the token's user is active & the password has not
+    changed since the token was issued. From the `get_user_projection`, so no
+    queries on a cache hit.
+    """
+
+    projection = get_user_projection(payload["u"])
+    return bool(projection) and hmac.compare_digest(
+        str(payload.get("p", "")), projection["password_fingerprint"]
+    )
+
+
+def get_cached_user(user_id):
+    """
+    Returns the active user for the given id, built from the `get_user_projection`.
+    The other fields are deferred, loaded with a query on access. Returns an
+    `AnonymousUser` if the user does not exist or is inactive.
+    """
+
+    if not (projection := get_user_projection(user_id)):
+        return AnonymousUser()
+
+    user_model = get_user_model()
+    # `from_db` expects the values in the order of the fields
+    field_names = [
+        field.attname
+        for field in user_model._meta.concrete_fields
+        if field.attname in projection
+    ]
+    return user_model.from_db(
+        router.db_for_read(user_model),
+        field_names,
+        [projection[_] for _ in field_names],
+    )
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Stateless authentication with the access tokens from `issue_tokens`:
+        Authorization: Bearer <access token>
+
+    The token is verified without the database, and checked against the cached
+    projection of the user (see `is_token_current`), changing the password or
+    deactivating the user revokes it. The `request.user` is hydrated lazily, from
+    the `get_cached_user`. So the authenticated reads need no session or user
+    queries at all.
+    """
+
+    keyword = AUTH_TOKEN_CONFIG["keyword"]
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise AuthenticationFailed("Invalid token header.")
+
+        payload = read_token(auth[1].decode(errors="ignore"), ACCESS_TOKEN)
+        if not payload or not is_token_current(payload):
+            raise AuthenticationFailed("Invalid or expired token.")
+
+        return SimpleLazyObject(lambda: get_cached_user(payload["u"])), payload
+
+    def authenticate_header(self, request):
+        return f'{self.keyword} realm="api"'
@@ -0,0 +1,181 @@
+import contextvars
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import Http404, HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.status import is_success
+
+from common.config import API_RESPONSE_ACTION_CODES, BATCH_REQUESTS_CONFIG
+from common.db_router import pin_to_primary
+
+logger = logging.getLogger(__name__)
+
+# shared by the batches of the process | bounds the threads
+_executor = ThreadPoolExecutor(
+    max_workers=BATCH_REQUESTS_CONFIG["concurrency"], thread_name_prefix="batch"
+)
+
+
+def get_error_result(status_code, detail) -> dict:
+    from common.views.base import AppViewMixin
+
+    response = AppViewMixin.send_response(
+        data={"detail": detail},
+        status_code=status_code,
+        action_code=API_RESPONSE_ACTION_CODES["display_error_1"],
+    )
+    return {"status_code": response.status_code, "body": response.data}
+
+
+def build_sub_request(request, method, path, body=None, pinned=False) -> HttpRequest:
+    """
+    Returns the django request of a sub request, with the headers & cookies of
+    the batch `request`. The user of the batch is forced (see the DRF's
+    `ForcedAuthentication`), the sub requests are not authenticated again.
+
+    The `pinned` sub requests read from the primary, like after a write of the
+    same batch (see `common.db_router.pin_to_primary`).
+    """
+
+    path, _, query_string = path.partition("?")
+    content = b"" if body is None else json.dumps(body, cls=DjangoJSONEncoder).encode()
+
+    sub_request = HttpRequest()
+    sub_request.method = method
+    sub_request.path = sub_request.path_info = path
+    sub_request.META = {
+        **request.META,
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": query_string,
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(content)),
+    }
+    sub_request.GET = QueryDict(query_string)
+    sub_request.COOKIES = request.COOKIES
+    if pinned:
+        sub_request.COOKIES = {**request.COOKIES, settings.REPLICA_PIN_COOKIE_NAME: "1"}
+    sub_request._stream = BytesIO(content)
+    sub_request._read_started = False
+
+    sub_request.user = request.user
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    if hasattr(request._request, "session"):
+        sub_request.session = request._request.session
+
+    return sub_request
+
+
+def dispatch_sub_request(sub_request) -> dict:
+    """
+    Runs the view resolved for the sub request. Returns the {status_code, body},
+    the body is the response envelope (see `AppViewMixin.send_response`). A
+    failing sub request does not fail the batch, an error result is returned.
+    """
+
+    try:
+        match = resolve(sub_request.path_info)
+    except Resolver404:
+        return get_error_result(status.HTTP_404_NOT_FOUND, "Not found.")
+
+    view_class = getattr(match.func, "cls", getattr(match.func, "view_class", None))
+    if not getattr(view_class, "batchable", True):
+        return get_error_result(status.HTTP_400_BAD_REQUEST, "Cannot be batched.")
+
+    sub_request.resolver_match = match
+    try:
+        response = match.func(sub_request, *match.args, **match.kwargs)
+    except Http404:
+        return get_error_result(status.HTTP_404_NOT_FOUND, "Not found.")
+    except PermissionDenied:
+        return get_error_result(status.HTTP_403_FORBIDDEN, "Permission denied.")
+    except Exception:  # noqa
+        logger.exception(f"dispatch_sub_request: {sub_request.path_info} failed.")
+        return get_error_result(status.HTTP_500_INTERNAL_SERVER_ERROR, "Server error.")
+
+    if isinstance(response, Response):
+        # rendered once, along with the batch
+        body = response.data
+    elif response.streaming:
+        body = None
+    else:
+        try:
+            body = json.loads(response.content)
+        except ValueError:
+            body = response.content.decode(errors="replace")
+
+    return {"status_code": response.status_code, "body": body}
+
+
+def run_in_thread(sub_request) -> dict:
+    try:
+        return dispatch_sub_request(sub_request)
+    finally:
+        close_old_connections()
+
+
+def run_batch(request, sub_requests) -> list:
+    """
+    Runs the sub requests [{method, path, body}] of the batch `request`, returns
+    their results in the same order. The writes run one by one, in order, on the
+    request's thread & db connection. The consecutive GETs in between run at the
+    same time on the shared pool, each on the thread's own db connection.
+
+    Each sub request runs in a copy of the context, so the per request state (like
+    the replica routing) does not leak from one to the other. After a successful
+    write, the rest of the batch & the requester are pinned to the primary.
+    """
+
+    results = [None] * len(sub_requests)
+    pending_reads = []
+    pinned = False
+
+    def run_reads():
+        if len(pending_reads) == 1:
+            index, sub_request = pending_reads[0]
+            results[index] = contextvars.copy_context().run(
+                dispatch_sub_request, sub_request
+            )
+        elif pending_reads:
+            futures = [
+                (
+                    index,
+                    _executor.submit(
+                        contextvars.copy_context().run, run_in_thread, sub_request
+                    ),
+                )
+                for index, sub_request in pending_reads
+            ]
+            for index, future in futures:
+                results[index] = future.result()
+
+        pending_reads.clear()
+
+    for index, item in enumerate(sub_requests):
+        sub_request = build_sub_request(
+            request, item["method"], item["path"], item.get("body"), pinned=pinned
+        )
+        if item["method"] == "GET":
+            pending_reads.append((index, sub_request))
+            continue
+
+        run_reads()
+        results[index] = contextvars.copy_context().run(
+            dispatch_sub_request, sub_request
+        )
+        if not pinned and is_success(results[index]["status_code"]):
+            pin_to_primary(request)
+            pinned = True
+
+    run_reads()
+    return results
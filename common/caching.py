@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Thread safe, bounded LRU cache in the process memory, with an optional TTL.
+    Used in front of the shared (django) cache for the per request hot paths.
+    """
+
+    def __init__(self, max_size, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value, expires_at = self._data.get(key, (_MISSING, None))
+
+            if value is _MISSING:
+                return default
+
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            if len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def get_version(key) -> int:
+    """
+    Returns the version of the given key from the shared cache. The versions are
+    part of the cache keys, bumping the version invalidates all of them at once.
+    """
+
+    return cache.get(f"version:{key}", 0)
+
+
+def bump_version(key):
+    """Increments the version of the given key. See `get_version`."""
+
+    try:
+        cache.incr(f"version:{key}")
+    except ValueError:
+        cache.set(f"version:{key}", 1, None)
+
+
+def get_user_version_key(user_id):
+    """Version key of the user, bumped when the user or the user's roles change."""
+
+    return f"user:{user_id}"
+
+
+def bump_user_version(sender, instance, **kwargs):
+    """Signal receiver, bumps the user version when the user or groups change."""
+
+    if kwargs.get("reverse"):
+        # group.user_set changes, the instance is the group
+        for user_id in kwargs.get("pk_set") or []:
+            bump_version(get_user_version_key(user_id))
+    else:
+        bump_version(get_user_version_key(instance.pk))
+
+
+def get_model_version_key(model):
+    """
+    Version key of the model, bumped when any of its objects is saved or deleted.
+    Connected for the `FACETS_MODELS`, see `CommonConfig.ready`.
+    """
+
+    return f"model:{model._meta.label_lower}"
+
+
+def bump_model_version(sender, **kwargs):
+    """
+    Signal receiver, bumps the model version on save & delete. The queryset
+    `update` & `bulk_*` do not send the signals, bump explicitly after them.
+    """
+
+    bump_version(get_model_version_key(sender))
+
+
+def check_shared_cache(app_configs=None, **kwargs) -> list:
+    """
+    System check, the versions are only seen by the processes sharing the cache.
+    With the process local `LocMemCache` & more than one process, the bumps of one
+    process are never seen by the others & the cached users, policies are stale.
+    """
+
+    multi_process = (
+        settings.WEB_CONCURRENCY > 1 or settings.CHANGE_FEED_BACKEND == "socket"
+    )
+    if multi_process and isinstance(caches["default"], LocMemCache):
+        return [
+            checks.Error(
+                "The default cache is process local, but more than one process "
+                "is configured.",
+                hint="Set the `CACHE_URL` to a shared cache, like redis or memcached.",
+                id="common.E001",
+            )
+        ]
+
+    return []
@@ -0,0 +1,272 @@
+import asyncio
+import atexit
+import json
+import logging
+import os
+import socket
+import threading
+from contextlib import suppress
+from functools import partial
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from common.config import CHANGE_FEED_CONFIG
+
+logger = logging.getLogger(__name__)
+
+EVENT_CREATED = "created"
+EVENT_UPDATED = "updated"
+EVENT_DELETED = "deleted"
+# sent when a subscriber could not keep up, the client should re-sync
+EVENT_OVERFLOW = "overflow"
+
+
+class ChangeEventEncoder(DjangoJSONEncoder):
+    """Falls back to the `str` for the values like the phone numbers."""
+
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+def get_change_event(instance, action) -> dict:
+    """Returns the event for the given instance, only with the configured fields."""
+
+    label = instance._meta.label_lower
+    data = {
+        field_name: instance._meta.get_field(field_name).value_from_object(instance)
+        for field_name in CHANGE_FEED_CONFIG["models"][label]
+    }
+
+    # json native values, the events are sent across the processes
+    return json.loads(
+        json.dumps(
+            {"model": label, "action": action, "pk": instance.pk, "data": data},
+            cls=ChangeEventEncoder,
+        )
+    )
+
+
+class Subscription:
+    """
+    Subscription of a client to the events of the given models. The filters are
+    {field: value}, compared as the json text and applied on the events having the
+    field. With the `owner_id`, only the events of the objects owned by it are
+    sent (see the `owner_fields`). Bound to the event loop it is created in.
+    """
+
+    def __init__(self, models, filters, queue_size, owner_id=None):
+        self.models = set(models)
+        self.filters = {k: str(v) for k, v in filters.items()}
+        self.owner_id = owner_id
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.loop = asyncio.get_running_loop()
+
+    def matches(self, event) -> bool:
+        if event["model"] not in self.models:
+            return False
+
+        if self.owner_id is not None:
+            owner_field = CHANGE_FEED_CONFIG["owner_fields"].get(event["model"])
+            if owner_field is None or event["data"].get(owner_field) != self.owner_id:
+                return False
+
+        for field_name, value in self.filters.items():
+            if field_name in event["data"]:
+                event_value = event["data"][field_name]
+                if not isinstance(event_value, str):
+                    event_value = json.dumps(event_value)
+                if event_value != value:
+                    return False
+
+        return True
+
+    def put(self, event):
+        """Thread safe, called by the hub."""
+
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # slow consumer | drop the backlog, the client re-syncs
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"action": EVENT_OVERFLOW})
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class ChangeFeedHub:
+    """
+    In process broadcast hub. The events published through the backend are
+    dispatched to the matching subscriptions of this process.
+    """
+
+    def __init__(self, queue_size):
+        self.queue_size = queue_size
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, models, filters=None, owner_id=None) -> Subscription:
+        """Called from the event loop of the ASGI application."""
+
+        subscription = Subscription(models, filters or {}, self.queue_size, owner_id)
+        get_change_feed_backend().start()
+
+        with self._lock:
+            self._subscriptions.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def dispatch(self, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+
+        for subscription in subscriptions:
+            if subscription.matches(event):
+                subscription.put(event)
+
+
+change_feed_hub = ChangeFeedHub(queue_size=CHANGE_FEED_CONFIG["queue_size"])
+
+
+class LocalBackend:
+    """Single process backend, the events are dispatched to the hub directly."""
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def start(self):
+        pass
+
+    def publish(self, event):
+        self.hub.dispatch(event)
+
+
+class SocketBackend(LocalBackend):
+    """
+    Multi process backend for a single host. Every subscribing process binds an
+    unix datagram socket in the `CHANGE_FEED_SOCKET_DIR`, the events are sent to
+    all the sockets in there (including its own). The processes that only publish,
+    like the workers, do not bind.
+    """
+
+    def __init__(self, hub, directory):
+        super().__init__(hub)
+        self.directory = directory
+        self.path = None
+        self._socket = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Binds the socket & reads it on the running event loop. Once per process."""
+
+        with self._lock:
+            if self._socket is not None:
+                return
+
+            os.makedirs(self.directory, exist_ok=True)
+            self.path = os.path.join(self.directory, f"{os.getpid()}.sock")
+            if os.path.exists(self.path):
+                os.unlink(self.path)  # stale, from a previous process of the pid
+
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._socket.bind(self.path)
+            self._socket.setblocking(False)
+            atexit.register(self.stop)
+
+        asyncio.get_running_loop().add_reader(self._socket.fileno(), self._receive)
+
+    def stop(self):
+        with self._lock:
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+
+            if self.path and os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def _receive(self):
+        try:
+            while True:
+                self.hub.dispatch(json.loads(self._socket.recv(65536)))
+        except BlockingIOError:
+            pass
+
+    def publish(self, event):
+        if not os.path.isdir(self.directory):
+            return  # no subscribing process yet
+
+        payload = json.dumps(event).encode()
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+            sender.setblocking(False)
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                try:
+                    sender.sendto(payload, path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # the process is gone
+                    with suppress(OSError):
+                        os.unlink(path)
+                except (BlockingIOError, OSError) as exc:
+                    logger.warning(
+                        f"SocketBackend: dropped an event for {path}. {exc!r}"
+                    )
+
+
+_backend = None
+
+
+def get_change_feed_backend():
+    """Returns the backend configured with the `CHANGE_FEED_BACKEND`."""
+
+    global _backend
+
+    if _backend is None:
+        if settings.CHANGE_FEED_BACKEND == "socket":
+            _backend = SocketBackend(change_feed_hub, settings.CHANGE_FEED_SOCKET_DIR)
+        else:
+            _backend = LocalBackend(change_feed_hub)
+
+    return _backend
+
+
+def publish_change(sender, instance, **kwargs):
+    """
+    Signal receiver for the `post_save` & `post_delete` of the configured models.
+    The event is built now and published once the transaction is committed.
+    """
+
+    if "created" in kwargs:
+        action = EVENT_CREATED if kwargs["created"] else EVENT_UPDATED
+    else:
+        action = EVENT_DELETED
+
+    event = get_change_event(instance, action)
+    transaction.on_commit(
+        partial(get_change_feed_backend().publish, event), using=kwargs.get("using")
+    )
+
+
+def connect_change_feed():
+    """Connects the `publish_change` for the models in the `CHANGE_FEED_CONFIG`."""
+
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_save
+
+    for label in CHANGE_FEED_CONFIG["models"]:
+        model = apps.get_model(label)
+        post_save.connect(publish_change, sender=model)
+        post_delete.connect(publish_change, sender=model)
@@ -0,0 +1,83 @@
+import hashlib
+import json
+
+from django.apps import apps
+from djchoices import DjangoChoices
+
+from common.helpers import unpack_dj_choices
+
+
+class ChoiceRegistry:
+    """
+    Collects all the `AppSingleChoiceField`s and `DjangoChoices` classes of the
+    application & pre-computes their options and label lookups. Populated once
+    from `CommonConfig.ready`, served by the `choices/` endpoint.
+
+    Keys:
+        > DjangoChoices: class name, like `UserTypeChoices`.
+        > AppSingleChoiceField: `app_label.model_name.field_name`.
+
+    The `version` is the hash of all the choices, so it changes with the deploy
+    that changes any choice. The front-end can cache the choices against it.
+    """
+
+    def __init__(self):
+        self._options = {}
+        self._labels = {}
+        self.version = None
+
+    def register(self, key, choices):
+        """Registers the given (value, label) pairs against the key."""
+
+        choices = [(value, str(label)) for value, label in choices]
+        self._options[key] = unpack_dj_choices(choices)
+        self._labels[key] = dict(choices)
+
+    def autodiscover(self):
+        """Registers all the choices of the installed apps. Called on app ready."""
+
+        from common.model_fields import AppSingleChoiceField
+
+        for model in apps.get_models():
+            for field in model._meta.get_fields():
+                if isinstance(field, AppSingleChoiceField):
+                    self.register(
+                        f"{model._meta.label_lower}.{field.name}", field.choices
+                    )
+
+        for choices_class in self.get_dj_choices_classes():
+            self.register(choices_class.__name__, choices_class.choices)
+
+        self.version = hashlib.sha1(
+            json.dumps(self._options, sort_keys=True, default=str).encode(),
+            usedforsecurity=False,
+        ).hexdigest()[:12]
+
+    @staticmethod
+    def get_dj_choices_classes(base=DjangoChoices):
+        """Returns all the loaded subclasses of the `DjangoChoices`."""
+
+        classes = []
+        for choices_class in base.__subclasses__():
+            classes.append(choices_class)
+            classes.extend(ChoiceRegistry.get_dj_choices_classes(choices_class))
+
+        return classes
+
+    def get_options(self, key):
+        """Returns [{'id': ..., 'name': ...}, ...] for the given key."""
+
+        return self._options[key]
+
+    def get_label(self, key, value, fallback=None):
+        """Returns the label for the given value of the given key."""
+
+        return self._labels.get(key, {}).get(value, fallback)
+
+    def get_all_options(self):
+        """Returns the options of all the registered choices."""
+
+        return self._options
+
+
+choice_registry = ChoiceRegistry()
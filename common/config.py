@@ -1,3 +1,5 @@
+from djchoices import ChoiceItem, DjangoChoices
+
 PAGINATION_CONFIG = {
     "allowed_sizes": [15, 50, 75, 100],
     "change_query_param": "page-size",
@@ -39,3 +41,175 @@ DEFAULT_SCORM_OTHER_VERSION_NS = {
 }
 
 DEFAULT_PASSWORD_LENGTH = 16
+
+# Header only image validation | limits are checked before any decode
+IMAGE_VALIDATION_CONFIG = {
+    "allowed_formats": ["JPEG", "PNG", "GIF", "WEBP"],
+    "max_pixels": 40_000_000,
+    "max_width": 10_000,
+    "max_height": 10_000,
+    # job queue of the full verifications, see `common.jobs`
+    "verification_queue": "default",
+}
+
+# Max distinct numbers kept by the memoized phone number parsing
+PHONE_NUMBER_CACHE_SIZE = 4096
+
+# Cache-Control max-age for the `choices/` endpoint, when requested with the version
+CHOICES_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Tables larger than this are paginated on the estimated count | admin
+ESTIMATED_COUNT_THRESHOLD = 10_000
+
+# Role based policies | role -> {policy_slug: scope}
+# Roles are "authenticated", the user `type` (the `untyped` role for the users without
+# one), "staff", "superuser" & the group names.
+# Scope: "all" -> every object, "own" -> only the objects owned by the user.
+UNTYPED_USER_ROLE = "untyped"
+ROLE_POLICIES = {
+    "authenticated": {"media": "all"},
+    "superuser": {"*": "all"},
+    "staff": {"*": "all"},
+    "recruiter": {"user_list": "all", "change_feed": "all", "user_import": "own"},
+    "job_seeker": {"user_list": "own"},
+    UNTYPED_USER_ROLE: {"user_list": "own"},
+}
+
+# Max users whose compiled policies are kept in the process memory
+POLICY_LOCAL_CACHE_SIZE = 2048
+
+# Signed token authentication | lifetimes in seconds
+AUTH_TOKEN_CONFIG = {
+    "keyword": "Bearer",
+    "access_lifetime": 60 * 5,
+    "refresh_lifetime": 60 * 60 * 24,
+    "feed_ticket_lifetime": 30,
+    "user_cache_ttl": 60,
+    "user_local_cache_size": 2048,
+    # the cached projection of the `request.user` | no password (only its fingerprint)
+    # or personal details
+    "user_cache_fields": [
+        "id",
+        "uuid",
+        "username",
+        "email",
+        "type",
+        "is_active",
+        "is_staff",
+        "is_superuser",
+    ],
+}
+
+# Timeout of the cached facet counts, also invalidated by the model version
+FACETS_CACHE_TIMEOUT = 60 * 60
+# Models serving the `facets/` | only these are versioned on save & delete, the
+# facets of the other models are not cached
+FACETS_MODELS = ["access.user"]
+
+# Delta sync | the rows modified in the last `settle_seconds` are held back, so
+# that the transactions in flight are committed before the cursor passes them
+SYNC_CONFIG = {
+    "page_size": 500,
+    "max_page_size": 2000,
+    "settle_seconds": 2,
+}
+
+# Live change feed (ASGI) | only the models listed publish, with only these fields
+CHANGE_FEED_CONFIG = {
+    "path": "/changes/",
+    "models": {
+        "access.user": ["id", "type", "is_active"],
+    },
+    # field of the event data holding the owner's id, for the "own" policy scope |
+    # the models without one are not sent with the "own" scope
+    "owner_fields": {
+        "access.user": "id",
+    },
+    "queue_size": 1000,
+    "heartbeat_seconds": 15,
+}
+
+
+class JobStatusChoices(DjangoChoices):
+    """Choices for the background Job status"""
+
+    queued = ChoiceItem("queued", "Queued")
+    running = ChoiceItem("running", "Running")
+    succeeded = ChoiceItem("succeeded", "Succeeded")
+    failed = ChoiceItem("failed", "Failed")
+
+
+# Database job queue | see `common.jobs`, timeouts & backoff in seconds
+# A running job is claimed again if its worker has not extended the claim (every
+# `heartbeat_interval`) for the `visibility_timeout`, like a crashed worker. So the
+# jobs should be idempotent.
+JOB_QUEUE_CONFIG = {
+    "default_queue": "default",
+    "max_attempts": 3,
+    "retry_backoff": 10,
+    "visibility_timeout": 60 * 5,
+    # the claims of the running jobs are extended this often, < the visibility timeout
+    "heartbeat_interval": 60,
+    "poll_interval": 1,
+    "concurrency": 4,
+}
+
+# Periodic task scheduler | see `common.scheduler`, timeouts in seconds
+# A run not finished within the `lock_timeout` is considered crashed.
+SCHEDULER_CONFIG = {
+    "concurrency": 2,
+    "poll_interval": 5,
+    "lock_timeout": 60 * 30,
+    "history_days": 30,
+}
+
+# Password hashing pool | see `common.passwords`, processes per web/worker process,
+# the cpu count up to the `max_workers` (or the `PASSWORD_HASHING_WORKERS` setting)
+# Batches smaller than the `min_batch_size` are hashed in the calling thread.
+PASSWORD_HASHING_CONFIG = {
+    "max_workers": 4,
+    "min_batch_size": 4,
+}
+
+# CSV user import | the rows are validated & written in chunks, only the first
+# `max_errors` row errors are kept on the `UserImport`
+USER_IMPORT_CONFIG = {
+    "chunk_size": 1000,
+    "max_errors": 1000,
+    "max_size": 50,  # MB
+    "encoding": "utf-8-sig",  # also reads the excel exports, with a BOM
+}
+
+# Queryset batches | see `BaseObjectManagerQuerySet`, the lookups are split into
+# the `IN` queries of the `lookup_batch_size` values
+QUERYSET_BATCH_CONFIG = {
+    "batch_size": 1000,
+    "lookup_batch_size": 1000,
+}
+
+# `migrate_binary_uuids` | rows per backfill UPDATE & the pause between them
+BINARY_UUID_MIGRATION_CONFIG = {
+    "chunk_size": 5000,
+    "sleep_seconds": 0.05,
+}
+
+# Protected media | the models owning the served files, by the label, with the policy
+# & the owner field checked on the rows. The file fields of these must be indexed.
+# A file (shared by the same content, see `ContentAddressedStorage`) is served if any
+# of its rows is allowed, the files of no row are not served.
+PROTECTED_MEDIA_OWNERS = {
+    "access.userimport": {"policy_slug": "user_import", "owner_field": "created_by"},
+}
+
+# Multi get | `batch/` of the retrieve viewsets, max ids per request
+MULTI_GET_CONFIG = {
+    "max_size": 100,
+}
+
+# Request batching | `batch/`, the consecutive GETs run at the same time on a
+# shared pool of `concurrency` threads
+BATCH_REQUESTS_CONFIG = {
+    "max_requests": 20,
+    "concurrency": 4,
+    "methods": ["GET", "POST", "PUT", "PATCH", "DELETE"],
+}
@@ -0,0 +1,177 @@
+import contextvars
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+logger = logging.getLogger(__name__)
+
+# per request routing state | set by the `ReplicaRoutingMiddleware`
+_replica_alias = contextvars.ContextVar("replica_alias", default=None)
+
+
+def get_pin_cache_key(user_id):
+    return f"db:pin:{user_id}"
+
+
+def pin_to_primary(request, response=None):
+    """
+    Pins the requester to the primary for `REPLICA_PIN_SECONDS`, so that the
+    reads after a write see the write (read-your-writes). Authenticated users
+    are pinned in the shared cache, others with a cookie.
+    """
+
+    window = settings.REPLICA_PIN_SECONDS
+
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        cache.set(get_pin_cache_key(user.pk), True, window)
+
+    if response is not None:
+        response.set_cookie(
+            settings.REPLICA_PIN_COOKIE_NAME, "1", max_age=window, httponly=True
+        )
+
+
+def is_pinned_to_primary(request):
+    """Returns a bool, that if the requester has written recently. See `pin_to_primary`."""
+
+    if request.COOKIES.get(settings.REPLICA_PIN_COOKIE_NAME):
+        return True
+
+    user = getattr(request, "user", None)
+    return bool(
+        user is not None
+        and user.is_authenticated
+        and cache.get(get_pin_cache_key(user.pk))
+    )
+
+
+class ReplicaHealthChecker:
+    """
+    Keeps the health of the replicas, re-checked every `REPLICA_HEALTH_CHECK_INTERVAL`
+    seconds per process. A replica is healthy if it is reachable and the replication
+    lag is within `REPLICA_MAX_LAG_SECONDS`.
+    """
+
+    def __init__(self):
+        self._checked_at = {}
+        self._healthy = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_replication_lag(alias) -> float:
+        """Returns the replication lag in seconds. 0 if the backend does not replicate."""
+
+        connection = connections[alias]
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                cursor.execute("SHOW REPLICA STATUS")
+                row = cursor.fetchone()
+                if not row:
+                    return 0
+
+                columns = [column[0] for column in cursor.description]
+                lag = dict(zip(columns, row)).get("Seconds_Behind_Source")
+                return float("inf") if lag is None else float(lag)
+
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT COALESCE(EXTRACT(EPOCH FROM "
+                    "now() - pg_last_xact_replay_timestamp()), 0)"
+                )
+                return float(cursor.fetchone()[0])
+
+            cursor.execute("SELECT 1")
+            return 0
+
+    def is_healthy(self, alias) -> bool:
+        now = time.monotonic()
+
+        with self._lock:
+            checked_at = self._checked_at.get(alias)
+            if (
+                checked_at is not None
+                and now - checked_at < settings.REPLICA_HEALTH_CHECK_INTERVAL
+            ):
+                return self._healthy[alias]
+
+            # other threads use the last known state while this one checks
+            self._checked_at[alias] = now
+            self._healthy.setdefault(alias, True)
+
+        try:
+            healthy = (
+                self.get_replication_lag(alias) <= settings.REPLICA_MAX_LAG_SECONDS
+            )
+        except Exception as exc:  # noqa
+            logger.warning(f"ReplicaHealthChecker: {alias} is not reachable. {exc!r}")
+            healthy = False
+
+        with self._lock:
+            self._healthy[alias] = healthy
+
+        return healthy
+
+    def get_healthy_replicas(self):
+        return [_ for _ in settings.REPLICA_DATABASES if self.is_healthy(_)]
+
+
+replica_health_checker = ReplicaHealthChecker()
+
+
+def use_replica_for_request(request):
+    """
+    Routes the reads of the current request to a healthy replica, unless the
+    requester is pinned to the primary. Called by the views that opt in with
+    `use_read_replica`, for the safe methods only. Returns the alias used.
+    """
+
+    if request.method not in SAFE_METHODS or is_pinned_to_primary(request):
+        return None
+
+    if replicas := replica_health_checker.get_healthy_replicas():
+        alias = random.choice(replicas)  # nosec
+        _replica_alias.set(alias)
+        return alias
+
+    return None
+
+
+def reset_replica_routing():
+    """Resets the routing state, all the reads go to the primary."""
+
+    _replica_alias.set(None)
+
+
+class ReplicaRouter:
+    """
+    Database router for the read replicas (`REPLICA_DATABASES`). The reads go to
+    the replica chosen for the request (see `use_replica_for_request`), everything
+    else including the reads inside a transaction go to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _replica_alias.get()
+
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # the replicas get the schema through the replication
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,96 @@
+import hashlib
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import CharField, Count, F, Value
+from django.db.models.functions import Cast
+
+from common.caching import get_model_version_key, get_version
+from common.config import FACETS_CACHE_TIMEOUT, FACETS_MODELS
+
+
+def get_model_field_for_path(model, path):
+    """Returns the model field for the given lookup path like `user__type`."""
+
+    *relations, field_name = path.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+
+    return model._meta.get_field(field_name)
+
+
+def get_facet_counts(queryset, field_names) -> dict:
+    """
+    Returns the grouped counts of the given fields for the queryset:
+        {"type": [{"value": "recruiter", "count": 10}, ...], ...}
+
+    The GROUP BYs of all the fields are combined with a UNION ALL, so this is a
+    single query. The values are cast to text for the union, and converted back
+    with the model field.
+    """
+
+    queryset = queryset.order_by().prefetch_related(None)
+    model_fields, groups = {}, []
+
+    for field_name in field_names:
+        try:
+            model_fields[field_name] = get_model_field_for_path(
+                queryset.model, field_name
+            )
+        except (FieldDoesNotExist, AttributeError):
+            continue  # not a model field path
+
+        groups.append(
+            queryset.values(value=Cast(F(field_name), output_field=CharField()))
+            .annotate(
+                facet=Value(field_name, output_field=CharField()), count=Count("*")
+            )
+            .values_list("facet", "value", "count")
+        )
+
+    facets = {field_name: [] for field_name in model_fields}
+    if not groups:
+        return facets
+
+    for field_name, value, count in groups[0].union(*groups[1:], all=True):
+        if value is not None:
+            try:
+                value = model_fields[field_name].to_python(value)
+            except ValidationError:
+                pass  # backend specific text, like "true" for the booleans
+
+        facets[field_name].append({"value": value, "count": count})
+
+    for counts in facets.values():
+        counts.sort(key=lambda _: _["count"], reverse=True)
+
+    return facets
+
+
+def get_cached_facet_counts(queryset, field_names) -> dict:
+    """
+    Cached version of the `get_facet_counts`. Keyed on the model version (see
+    `common.caching`) and the query itself, so the filters, search & the user's
+    policy scope are all part of the key.
+
+    Only the models in the `FACETS_MODELS` are versioned, the others are not cached.
+    """
+
+    queryset = queryset.order_by()
+    if queryset.query.is_empty():
+        return {field_name: [] for field_name in field_names}
+
+    if queryset.model._meta.label not in FACETS_MODELS:
+        return get_facet_counts(queryset, field_names)
+
+    query_hash = hashlib.sha1(
+        f"{queryset.query}|{','.join(field_names)}".encode(), usedforsecurity=False
+    ).hexdigest()
+    version = get_version(get_model_version_key(queryset.model))
+    key = f"facets:{queryset.model._meta.label_lower}:{version}:{query_hash}"
+
+    if (facets := cache.get(key)) is None:
+        facets = get_facet_counts(queryset, field_names)
+        cache.set(key, facets, FACETS_CACHE_TIMEOUT)
+
+    return facets
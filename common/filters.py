@@ -0,0 +1,24 @@
+from rest_framework.filters import BaseFilterBackend
+
+from common.policies import policy_engine
+
+
+class PolicyFilterBackend(BaseFilterBackend):
+    """
+    Restricts the list queryset to the objects the user has the view's
+    `policy_slug` on. The batch version of the `PolicyPermission`'s object check,
+    applied as a single filter on the queryset.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        policy_slug = getattr(view, "policy_slug", None)
+
+        if not policy_slug or request.user.is_anonymous:
+            return queryset
+
+        return policy_engine.filter_queryset(
+            request.user,
+            policy_slug,
+            queryset,
+            owner_field=getattr(view, "policy_owner_field", "user"),
+        )
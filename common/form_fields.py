@@ -0,0 +1,32 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from PIL import Image
+
+from common.validators import ImageHeaderValidator
+
+
+class HeaderOnlyImageFormField(forms.ImageField):
+    """
+    Version of the django's `ImageField` that validates only the image header.
+    Django's version verifies the image in the request thread, this defers the
+    full verification to the background. See `AppImageField`.
+
+    Also used by the serializers through DRF's `_DjangoImageField`.
+    """
+
+    def to_python(self, data):
+        """Overridden to skip the `Image.verify` of the parent."""
+
+        f = forms.FileField.to_python(self, data)
+        if f is None:
+            return None
+
+        try:
+            image_format = ImageHeaderValidator()(f)
+        except ValidationError as exc:
+            raise ValidationError(
+                self.error_messages["invalid_image"], code="invalid_image"
+            ) from exc
+
+        f.content_type = Image.MIME.get(image_format)
+        return f
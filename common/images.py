@@ -0,0 +1,114 @@
+import logging
+import warnings
+
+from django.apps import apps
+from django.db import router, transaction
+from PIL import Image
+
+from common.config import IMAGE_VALIDATION_CONFIG
+from common.jobs import enqueue, register_job
+
+logger = logging.getLogger(__name__)
+
+
+def read_image_header(file) -> tuple[str, int, int]:
+    """
+    Given a file like object, returns the (format, width, height) of the image.
+    Only the image header is parsed, the pixel data is never decoded.
+
+    Raises the Pillow exceptions if the file is not a recognized image.
+    """
+
+    if hasattr(file, "seek"):
+        file.seek(0)
+
+    try:
+        with warnings.catch_warnings():
+            # the limits are enforced by the callers, before any decode
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            with Image.open(file) as image:
+                width, height = image.size
+                return image.format, width, height
+    finally:
+        if hasattr(file, "seek"):
+            file.seek(0)
+
+
+def verify_image(storage, name, max_pixels=None) -> bool:
+    """
+    Fully verifies and decodes the stored image. Called in the background after
+    the header only validation. Returns a bool, invalid images are logged.
+    """
+
+    try:
+        with storage.open(name) as file:
+            with Image.open(file) as image:
+                image.verify()
+
+            # `verify` leaves the image unusable, re-open to decode
+            file.seek(0)
+            with Image.open(file) as image:
+                width, height = image.size
+                if max_pixels and width * height > max_pixels:
+                    raise Image.DecompressionBombError(f"{width}x{height} pixels")
+                image.load()
+
+    except Exception as exc:  # noqa
+        logger.error(f"verify_image: {name} is not a valid image. {exc!r}")
+        return False
+
+    return True
+
+
+def reject_image(model, pk, field_name, name):
+    """
+    Clears the image field of the row, if it still holds the given image. For the
+    images failing the `verify_image`, those are never served.
+
+    Saved with the `modified` & the signals, like any change of the row, so the
+    delta sync, the change feed & the cache versions see it. The file reference is
+    released by the field (see `ContentAddressedFileFieldMixin`).
+    """
+
+    with transaction.atomic(using=router.db_for_write(model)):
+        instance = model._default_manager.select_for_update().filter(pk=pk).first()
+        if instance is None or getattr(instance, field_name).name != name:
+            return  # replaced or deleted in the meantime
+
+        setattr(instance, field_name, "")
+        instance.save(update_fields=[field_name, "modified"])
+
+    logger.warning(f"reject_image: cleared {model._meta.label}({pk}).{field_name}.")
+
+
+@register_job
+def verify_stored_image(model_label, pk, field_name, name, max_pixels=None):
+    """
+    Background job of the full verification, see `AppImageField`. Runs the
+    `verify_image`, the `reject_image` if invalid.
+    """
+
+    model = apps.get_model(model_label)
+    storage = model._meta.get_field(field_name).storage
+
+    if not verify_image(storage, name, max_pixels=max_pixels):
+        reject_image(model, pk, field_name, name)
+
+
+def schedule_image_verification(instance, field_name, max_pixels=None):
+    """
+    Enqueues the `verify_stored_image` of the instance's image on the job queue
+    (see `common.jobs`), a pending verification survives the process.
+    """
+
+    enqueue(
+        verify_stored_image,
+        args=[
+            instance._meta.label,
+            instance.pk,
+            field_name,
+            getattr(instance, field_name).name,
+            max_pixels,
+        ],
+        queue=IMAGE_VALIDATION_CONFIG["verification_queue"],
+    )
@@ -0,0 +1,299 @@
+import json
+import logging
+import os
+import signal
+import socket
+import time
+import traceback
+import uuid
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import suppress
+from datetime import timedelta
+from importlib import import_module
+from multiprocessing import get_context
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from common.config import JOB_QUEUE_CONFIG, JobStatusChoices
+
+logger = logging.getLogger(__name__)
+
+# registered jobs | {name: function}
+_job_registry = {}
+
+
+def register_job(func=None, *, name=None):
+    """
+    Registers the function as a background job, only the registered functions
+    can be run by the workers. The name defaults to the dotted path.
+
+    Usage:
+        @register_job
+        def send_welcome_email(user_id):
+            ...
+
+        enqueue(send_welcome_email, args=[user.pk])
+    """
+
+    def decorator(func):
+        func.job_name = name or f"{func.__module__}.{func.__qualname__}"
+        _job_registry[func.job_name] = func
+        return func
+
+    return decorator(func) if func else decorator
+
+
+def get_job_function(name):
+    """Returns the registered function for the job name. None if not registered."""
+
+    if name not in _job_registry:
+        # registered on the import of the module, like in the spawned processes
+        with suppress(ImportError):
+            import_module(name.rpartition(".")[0])
+
+    return _job_registry.get(name)
+
+
+def enqueue(job, args=(), kwargs=None, queue=None, delay=None, max_attempts=None):
+    """
+    Enqueues the given job (registered function or name) to be run by a worker.
+
+    The job row is inserted once the current transaction is committed, so the
+    worker sees the data written along with it, and nothing is run for the rolled
+    back transactions. Outside a transaction it is inserted right away. The args
+    must be json serializable, pass the ids rather than the instances.
+    """
+
+    from common.models import Job
+
+    name = getattr(job, "job_name", job)
+    args, kwargs = json.loads(
+        json.dumps([list(args), kwargs or {}], cls=DjangoJSONEncoder)
+    )
+    fields = {
+        "name": name,
+        "args": args,
+        "kwargs": kwargs,
+        "queue": queue or JOB_QUEUE_CONFIG["default_queue"],
+        "max_attempts": max_attempts or JOB_QUEUE_CONFIG["max_attempts"],
+    }
+
+    using = router.db_for_write(Job)
+
+    def create():
+        Job.objects.using(using).create(
+            run_after=timezone.now() + timedelta(seconds=delay or 0), **fields
+        )
+
+    transaction.on_commit(create, using=using)
+
+
+def claim_jobs(queues, worker_id, limit) -> list:
+    """
+    Claims up to the `limit` due jobs of the given queues for the worker, and
+    returns their ids. The jobs stay claimed for the `visibility_timeout`.
+
+    Claimed with `SELECT ... FOR UPDATE SKIP LOCKED`, so the concurrent workers
+    never wait on or claim the same rows. Where not supported (SQLite), each row is
+    claimed with a conditional UPDATE, as the writes are serialized anyway.
+    """
+
+    from common.models import Job
+
+    # the claims are writes | never on a replica
+    using = router.db_for_write(Job)
+    now = timezone.now()
+    claimable = (
+        Job.objects.using(using)
+        .filter(queue__in=queues, run_after__lte=now)
+        .filter(
+            Q(status=JobStatusChoices.queued)
+            | Q(status=JobStatusChoices.running, locked_until__lt=now)
+        )
+        .order_by("run_after", "pk")
+    )
+    claim = {
+        "status": JobStatusChoices.running,
+        "locked_by": worker_id,
+        "locked_until": now + timedelta(seconds=JOB_QUEUE_CONFIG["visibility_timeout"]),
+        "attempts": F("attempts") + 1,
+        "modified": now,
+    }
+
+    if connections[using].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=using):
+            ids = list(
+                claimable.select_for_update(skip_locked=True).values_list(
+                    "pk", flat=True
+                )[:limit]
+            )
+            Job.objects.using(using).filter(pk__in=ids).update(**claim)
+
+        return ids
+
+    return [
+        pk
+        for pk in list(claimable.values_list("pk", flat=True)[:limit])
+        if claimable.filter(pk=pk).update(**claim)
+    ]
+
+
+def execute_job(job_id, worker_id):
+    """
+    Runs the claimed job and records the result. The failed jobs are retried with
+    an exponential backoff, until the `max_attempts`. Called in the worker pool.
+    """
+
+    from common.models import Job
+
+    close_old_connections()
+    try:
+        # just claimed | a replica may not have it yet
+        jobs = Job.objects.using(router.db_for_write(Job))
+        job = jobs.filter(pk=job_id, locked_by=worker_id).first()
+        if job is None:
+            return  # claimed again by another worker
+
+        # the result is recorded only if still claimed by this worker
+        claimed = jobs.filter(pk=job.pk, locked_by=worker_id)
+        released = {"locked_by": None, "locked_until": None, "modified": timezone.now()}
+
+        try:
+            if (function := get_job_function(job.name)) is None:
+                raise LookupError(f"Job {job.name} is not registered.")
+
+            function(*job.args, **job.kwargs)
+        except Exception:  # noqa
+            error = traceback.format_exc()
+            logger.warning(f"execute_job: {job.name} ({job.pk}) failed. {error}")
+
+            if job.attempts < job.max_attempts:
+                backoff = JOB_QUEUE_CONFIG["retry_backoff"] * 2 ** (job.attempts - 1)
+                claimed.update(
+                    status=JobStatusChoices.queued,
+                    run_after=timezone.now() + timedelta(seconds=backoff),
+                    last_error=error,
+                    **released,
+                )
+            else:
+                claimed.update(
+                    status=JobStatusChoices.failed, last_error=error, **released
+                )
+        else:
+            claimed.update(status=JobStatusChoices.succeeded, **released)
+    finally:
+        close_old_connections()
+
+
+def extend_claims(job_ids, worker_id) -> int:
+    """
+    Extends the `locked_until` of the given jobs still claimed by the worker, by
+    the `visibility_timeout`. Called periodically by the worker while the jobs
+    run, so that the long jobs are not claimed again by another worker.
+    """
+
+    from common.models import Job
+
+    if not job_ids:
+        return 0
+
+    now = timezone.now()
+    return (
+        Job.objects.using(router.db_for_write(Job))
+        .filter(pk__in=job_ids, locked_by=worker_id, status=JobStatusChoices.running)
+        .update(
+            locked_until=now
+            + timedelta(seconds=JOB_QUEUE_CONFIG["visibility_timeout"]),
+            modified=now,
+        )
+    )
+
+
+def _setup_worker_process():
+    import django
+
+    django.setup()
+
+
+class Worker:
+    """
+    Runs the jobs of the given queues, with a pool of threads (the I/O bound jobs)
+    or processes (the CPU bound jobs). Claims only as many jobs as there are free
+    slots in the pool. The claims of the running jobs are extended every
+    `heartbeat_interval`, however long they run. Stops gracefully on
+    SIGTERM/SIGINT, after the running jobs.
+    """
+
+    def __init__(self, queues=None, concurrency=None, pool="thread"):
+        self.queues = queues or [JOB_QUEUE_CONFIG["default_queue"]]
+        self.concurrency = concurrency or JOB_QUEUE_CONFIG["concurrency"]
+        self.pool = pool
+        self.id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.stopping = False
+
+    def get_executor(self):
+        if self.pool == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.concurrency,
+                mp_context=get_context("spawn"),
+                initializer=_setup_worker_process,
+            )
+
+        return ThreadPoolExecutor(max_workers=self.concurrency)
+
+    def stop(self, *args):
+        logger.info(f"Worker {self.id}: stopping after the running jobs.")
+        self.stopping = True
+
+    def run(self, once=False):
+        """Runs until stopped. With `once`, until there are no due jobs."""
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        logger.info(f"Worker {self.id}: started on {', '.join(self.queues)}.")
+
+        running = {}  # {future: job id}
+        heartbeat_at = time.monotonic() + JOB_QUEUE_CONFIG["heartbeat_interval"]
+        with self.get_executor() as executor:
+            while not self.stopping:
+                free_slots = self.concurrency - len(running)
+                job_ids = (
+                    claim_jobs(self.queues, self.id, free_slots) if free_slots else []
+                )
+                close_old_connections()
+
+                for job_id in job_ids:
+                    running[executor.submit(execute_job, job_id, self.id)] = job_id
+
+                if once and not job_ids and not running:
+                    break
+
+                if not job_ids:
+                    if running:
+                        wait(
+                            running,
+                            timeout=JOB_QUEUE_CONFIG["poll_interval"],
+                            return_when=FIRST_COMPLETED,
+                        )
+                    else:
+                        time.sleep(JOB_QUEUE_CONFIG["poll_interval"])
+
+                for future in [_ for _ in running if _.done()]:
+                    running.pop(future)
+                    if exc := future.exception():
+                        logger.error(f"Worker {self.id}: job crashed. {exc!r}")
+
+                if time.monotonic() >= heartbeat_at:
+                    extend_claims(list(running.values()), self.id)
+                    close_old_connections()
+                    heartbeat_at = (
+                        time.monotonic() + JOB_QUEUE_CONFIG["heartbeat_interval"]
+                    )
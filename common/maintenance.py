@@ -0,0 +1,31 @@
+import logging
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.utils import timezone
+
+from common.config import SCHEDULER_CONFIG, JobStatusChoices
+
+logger = logging.getLogger(__name__)
+
+
+def clear_expired_sessions():
+    """Deletes the expired sessions, same as the `clearsessions` command."""
+
+    engine = import_module(settings.SESSION_ENGINE)
+    engine.SessionStore.clear_expired()
+
+
+def prune_history():
+    """Deletes the finished jobs & the task runs older than the `history_days`."""
+
+    from common.models import Job, ScheduledTaskRun
+
+    before = timezone.now() - timedelta(days=SCHEDULER_CONFIG["history_days"])
+
+    Job.objects.filter(
+        status__in=[JobStatusChoices.succeeded, JobStatusChoices.failed],
+        modified__lt=before,
+    ).delete()
+    ScheduledTaskRun.objects.filter(created__lt=before).delete()
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from common.config import BINARY_UUID_MIGRATION_CONFIG
+from common.uuid_migration import STEPS, BinaryUUIDMigration, get_binary_uuid_fields
+
+
+class Command(BaseCommand):
+    help = (
+        "Converts the existing char(32) uuid columns of the AppBinaryUUIDFields "
+        "to binary(16), in chunks. Run the steps in order. The prepare & backfill "
+        "are online, the swap only renames but needs the writes stopped (a "
+        "read-only window, no processes of the previous release left), see "
+        "BinaryUUIDMigration."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("step", choices=STEPS)
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            help="Model label, like access.User. Can be repeated. Defaults to all.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=BINARY_UUID_MIGRATION_CONFIG["chunk_size"],
+            help="Rows per backfill update.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=BINARY_UUID_MIGRATION_CONFIG["sleep_seconds"],
+            help="Seconds to pause between the backfill updates.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if connections[options["database"]].vendor != "mysql":
+            self.stdout.write(
+                "Nothing to migrate, only the MySQL uuid columns are char(32)."
+            )
+            return
+
+        for model, field in get_binary_uuid_fields(options["models"]):
+            migration = BinaryUUIDMigration(
+                model,
+                field,
+                using=options["database"],
+                chunk_size=options["chunk_size"],
+                sleep=options["sleep"],
+            )
+            try:
+                migration.run(options["step"])
+            except ValueError as exc:
+                raise CommandError(str(exc))
+
+            self.stdout.write(f"{migration}: {options['step']} done.")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from common.config import SCHEDULER_CONFIG
+from common.scheduler import Scheduler
+
+
+class Command(BaseCommand):
+    help = "Runs the periodic tasks declared in the app configs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=SCHEDULER_CONFIG["concurrency"],
+            help="Number of tasks run at the same time.",
+        )
+
+    def handle(self, *args, **options):
+        Scheduler(concurrency=options["concurrency"]).run()
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from common.config import JOB_QUEUE_CONFIG
+from common.jobs import Worker
+
+
+class Command(BaseCommand):
+    help = "Runs the background jobs of the database job queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Queue to run, can be repeated. Defaults to the default queue.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=JOB_QUEUE_CONFIG["concurrency"],
+            help="Number of jobs run at the same time.",
+        )
+        parser.add_argument(
+            "--pool",
+            choices=["thread", "process"],
+            default="thread",
+            help="Threads for the I/O bound jobs, processes for the CPU bound.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when there are no more due jobs.",
+        )
+
+    def handle(self, *args, **options):
+        Worker(
+            queues=options["queues"],
+            concurrency=options["concurrency"],
+            pool=options["pool"],
+        ).run(once=options["once"])
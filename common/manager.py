@@ -3,7 +3,15 @@ from django.core.exceptions import (
     ObjectDoesNotExist,
     ValidationError,
 )
-from django.db.models import QuerySet
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from common.caching import bump_version, get_model_version_key
+from common.config import QUERYSET_BATCH_CONFIG
+
+# not updated by the `bulk_upsert`, unless asked | the identity of the rows
+UPSERT_EXCLUDED_FIELDS = ["uuid", "created"]
 
 
 class BaseObjectManagerQuerySet(QuerySet):
@@ -21,8 +29,34 @@ class BaseObjectManagerQuerySet(QuerySet):
 
     Available methods -
         get_or_none
+        bulk_get_or_none
+        iter_batches
+        bulk_upsert
+
+    The `update` (and so the `bulk_update`) & the `bulk_upsert` set the `modified`,
+    like the `save` does. The delta sync (see `common.sync`) relies on it.
     """
 
+    def get_auto_now_fields(self) -> list[str]:
+        """Returns the names of the `auto_now` fields, like the `modified`."""
+
+        return [
+            field.name
+            for field in self.model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+
+    def update(self, **kwargs):
+        """Overridden to set the `auto_now` fields, the `update` sends no signals."""
+
+        now = timezone.now()
+        for field_name in self.get_auto_now_fields():
+            kwargs.setdefault(field_name, now)
+
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
     def get_or_none(self, *args, **kwargs):
         """
         Get the object based on the given **kwargs.
@@ -42,6 +76,131 @@ class BaseObjectManagerQuerySet(QuerySet):
         ):
             return None
 
+    def bulk_get_or_none(self, values, field_name="pk") -> list:
+        """
+        Batch version of the `get_or_none`, by the values of an unique field (pk,
+        uuid, ...). Returns the objects in the order of the values, None for the
+        values not present or invalid. Queried in the `IN` batches.
+        """
+
+        field = self.model._meta.pk if field_name == "pk" else None
+        field = field or self.model._meta.get_field(field_name)
+        values = list(values)
+
+        lookup_values = set()
+        for value in values:
+            try:
+                lookup_values.add(field.to_python(value))
+            except ValidationError:
+                pass
+
+        lookup_values = list(lookup_values)
+        batch_size = QUERYSET_BATCH_CONFIG["lookup_batch_size"]
+        objects = {}
+        for index in range(0, len(lookup_values), batch_size):
+            batch = lookup_values[index : index + batch_size]
+            for _object in self.filter(**{f"{field.name}__in": batch}):
+                objects[getattr(_object, field.attname)] = _object
+
+        results = []
+        for value in values:
+            try:
+                results.append(objects.get(field.to_python(value)))
+            except ValidationError:
+                results.append(None)
+
+        return results
+
+    def iter_batches(self, size=None, order_by="pk"):
+        """
+        Yields the objects as lists of the `size`, walking the keyset (the
+        `order_by` field & the pk) instead of the OFFSET. Each batch is a single
+        indexed range query, only a batch is in the memory at a time.
+
+        The `order_by` is a non nullable field of the model, `-` for descending.
+
+        Usage:
+            for users in User.objects.filter(is_active=False).iter_batches(500):
+                ...
+        """
+
+        size = size or QUERYSET_BATCH_CONFIG["batch_size"]
+        descending = order_by.startswith("-")
+        field_name = order_by.lstrip("-")
+        field = self.model._meta.pk if field_name == "pk" else None
+        field = field or self.model._meta.get_field(field_name)
+        pk_name = self.model._meta.pk.name
+        lookup = "lt" if descending else "gt"
+
+        ordering = [order_by]
+        if not field.primary_key:
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+
+        queryset = self.order_by(*ordering)
+        last = None
+        while True:
+            batch_queryset = queryset
+            if last is not None:
+                last_pk, last_value = last.pk, getattr(last, field.attname)
+                keyset = Q(**{f"{pk_name}__{lookup}": last_pk})
+                if not field.primary_key:
+                    keyset = Q(**{f"{field.name}__{lookup}": last_value}) | Q(
+                        keyset, **{field.name: last_value}
+                    )
+                batch_queryset = queryset.filter(keyset)
+
+            batch = list(batch_queryset[:size])
+            if batch:
+                yield batch
+
+            if len(batch) < size:
+                return
+
+            last = batch[-1]
+
+    def bulk_upsert(self, objs, unique_fields, update_fields=None, batch_size=None):
+        """
+        Inserts the objects, updates the rows conflicting on the `unique_fields`.
+        A single statement per batch, `INSERT ... ON CONFLICT DO UPDATE` or the
+        `ON DUPLICATE KEY UPDATE` on MySQL (which resolves on any unique key).
+
+        The `update_fields` default to all the fields, except the unique fields,
+        the pk, `uuid` & `created`, the `modified` is always updated. Like the `bulk_create`, no signals are sent &
+        the pks may not be set on the objects.
+        """
+
+        objs = list(objs)
+        if not objs:
+            return objs
+
+        if update_fields is None:
+            update_fields = [
+                field.name
+                for field in self.model._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in unique_fields
+                and field.name not in UPSERT_EXCLUDED_FIELDS
+            ]
+
+        update_fields = [
+            *update_fields,
+            *[_ for _ in self.get_auto_now_fields() if _ not in update_fields],
+        ]
+
+        features = connections[self.db].features
+        if not features.supports_update_conflicts_with_target:
+            unique_fields = None  # MySQL | conflicts on any unique key
+
+        objs = self.bulk_create(
+            objs,
+            batch_size=batch_size or QUERYSET_BATCH_CONFIG["batch_size"],
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+        )
+        bump_version(get_model_version_key(self.model))
+        return objs
+
 
 class StatusObjectManagerQuerySet(BaseObjectManagerQuerySet):
     """Get the object based on the status"""
@@ -0,0 +1,39 @@
+from rest_framework.status import is_success
+
+from common.db_router import pin_to_primary, reset_replica_routing
+
+UNSAFE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Scopes the read replica routing (see `common.db_router`) to the request, and
+    pins the requester to the primary after a successful write. The views that are
+    not writes, like the `BatchAPIView`, opt out with `pin_to_primary_after_write`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reset_replica_routing()
+
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_replica_routing()
+
+        if (
+            request.method in UNSAFE_METHODS
+            and is_success(response.status_code)
+            and getattr(request, "pin_to_primary_after_write", True)
+        ):
+            pin_to_primary(request, response)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "cls", getattr(view_func, "view_class", None))
+        request.pin_to_primary_after_write = getattr(
+            view_class, "pin_to_primary_after_write", True
+        )
@@ -1,9 +1,17 @@
+import uuid
+
 from django.core import checks
-from django.db import models
-from phonenumber_field.modelfields import PhoneNumberField
+from django.db import models, router, transaction
+from django.db.models.signals import post_delete, post_save
+from phonenumber_field.modelfields import PhoneNumberDescriptor, PhoneNumberField
 
+from common.config import IMAGE_VALIDATION_CONFIG
+from common.form_fields import HeaderOnlyImageFormField
 from common.helpers import get_display_name_for_slug
-from common.validators import MaxSizeValidator
+from common.images import schedule_image_verification
+from common.phone_numbers import parse_phone_number
+from common.storage import ContentAddressedStorage, get_content_addressed_storage
+from common.validators import ImageHeaderValidator, MaxSizeValidator
 
 
 class BaseField:
@@ -12,6 +20,61 @@ class BaseField:
     pass
 
 
+class AppBinaryUUIDField(BaseField, models.UUIDField):
+    """
+    UUID field stored in 16 bytes, `binary(16)` on MySQL (the `UUIDField` is a
+    `char(32)` there), the native type where there is one. Unique, and so indexed,
+    by default. Same python values as the `UUIDField`, the lookups & the DRF
+    serializer fields work as is.
+
+    The existing `char(32)` columns are converted with the `migrate_binary_uuids`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("unique", True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        """Overridden because of the unique default."""
+
+        name, path, args, kwargs = super().deconstruct()
+        if kwargs.pop("unique", False) is not True:
+            kwargs["unique"] = False
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        """Not the `UUIDField`, the backends would convert the bytes as the text."""
+
+        return "AppBinaryUUIDField"
+
+    def db_type(self, connection):
+        if connection.features.has_native_uuid_field:
+            return "uuid"
+
+        return "binary(16)" if connection.vendor == "mysql" else "blob"
+
+    def rel_db_type(self, connection):
+        return self.db_type(connection)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None:
+            return None
+
+        if not isinstance(value, uuid.UUID):
+            value = self.to_python(value)
+
+        if connection.features.has_native_uuid_field:
+            return value
+
+        return value.bytes
+
+    def from_db_value(self, value, expression, connection):
+        if value is None or isinstance(value, uuid.UUID):
+            return value
+
+        return uuid.UUID(bytes=bytes(value))
+
+
 class AppSingleChoiceField(BaseField, models.CharField):
     """
     Field to input a single choice input from the user. A select input.
@@ -29,6 +92,7 @@ class AppSingleChoiceField(BaseField, models.CharField):
     def __init__(self, choices_config: dict, *args, **kwargs):
         self.choices_config = choices_config
         self.options = self.choices_config["options"]
+        self._type_of_options = self.get_type_of_options()
 
         generated_choices, max_length = [], 0
         for option in self.options:
@@ -63,6 +127,11 @@ class AppSingleChoiceField(BaseField, models.CharField):
         )
 
     def type_of_options(self):
+        """Returns the type of options, computed once. See `get_type_of_options`."""
+
+        return self._type_of_options
+
+    def get_type_of_options(self):
         """
         Returns the type of options passed as input. It can either be a
         dict or a list. Just a DRY function to determine and make decisions.
@@ -108,13 +177,78 @@ class AppSingleChoiceField(BaseField, models.CharField):
         return None in [*self.options, self.get_default_option()]
 
 
+class AppPhoneNumberDescriptor(PhoneNumberDescriptor):
+    """Overridden to use the memoized `parse_phone_number` on assignment."""
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.name] = parse_phone_number(
+            value, region=self.field.region
+        )
+
+
 class AppPhoneNumberField(BaseField, PhoneNumberField):
-    """Applications version of the PhoneNumberField. To define app's functions."""
+    """
+    Applications version of the PhoneNumberField. To define app's functions.
 
-    pass
+    The values are parsed through the LRU cached `parse_phone_number` and stored
+    in the E.164 format (`PHONENUMBER_DB_FORMAT`). Indexed by default, so that
+    the exact lookups like `User.objects.by_phone` are index seeks.
+    """
+
+    descriptor_class = AppPhoneNumberDescriptor
 
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("db_index", True)
+        super().__init__(*args, **kwargs)
 
-class AppFileField(BaseField, models.FileField):
+    def get_prep_value(self, value):
+        """Overridden to use the memoized parse for the string values."""
+
+        if isinstance(value, str):
+            value = parse_phone_number(value, region=self.region)
+
+        return super().get_prep_value(value)
+
+
+class ContentAddressedFileFieldMixin:
+    """
+    Releases the references of the `ContentAddressedStorage` files, when the row is
+    deleted and when the file is replaced (or cleared) and saved. The file itself
+    is deleted by the storage, with the last reference.
+
+    Note: the files are released through the rows, do not call the `FieldFile.delete`.
+    """
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+
+        if not cls._meta.abstract:
+            post_save.connect(self.release_replaced_file, sender=cls, weak=False)
+            post_delete.connect(self.release_deleted_file, sender=cls, weak=False)
+
+    def release_file(self, name):
+        """Releases the reference of the given name, if counted by the storage."""
+
+        if name and isinstance(self.storage, ContentAddressedStorage):
+            self.storage.delete(name)
+
+    def release_replaced_file(self, instance, created, update_fields=None, **kwargs):
+        """`post_save` receiver, the snapshot still holds the previous name."""
+
+        if created or (update_fields is not None and self.name not in update_fields):
+            return
+
+        previous_name = (instance._loaded_values or {}).get(self.attname)
+        if previous_name and previous_name != getattr(instance, self.attname).name:
+            self.release_file(previous_name)
+
+    def release_deleted_file(self, instance, **kwargs):
+        """`post_delete` receiver."""
+
+        self.release_file(getattr(instance, self.attname).name)
+
+
+class AppFileField(ContentAddressedFileFieldMixin, BaseField, models.FileField):
     """Custom File Field with max_size attribute, and validations."""
 
     def __init__(self, max_size=None, *args, **kwargs):
@@ -122,6 +256,7 @@ class AppFileField(BaseField, models.FileField):
 
         self.max_size = max_size  # attribute initialization
         kwargs.setdefault("upload_to", "files/")
+        kwargs.setdefault("storage", get_content_addressed_storage)
         super().__init__(*args, **kwargs)
         # custom validation to validate the file size
         self.validators.append(MaxSizeValidator(self.max_size))
@@ -168,16 +303,82 @@ class AppFileField(BaseField, models.FileField):
 
 
 class AppImageField(AppFileField, models.ImageField):
-    """Custom image field which inherits the AppFileField functionalities, as well as the ImageField."""
+    """
+    Custom image field which inherits the AppFileField functionalities, as well as the ImageField.
 
-    def __init__(self, *args, **kwargs):
+    With `header_only_validation` (default), only the image header is read on upload
+    to validate the format and the `max_pixels`, `max_width` & `max_height` limits.
+    The full verification runs as a background job once the upload is committed, the
+    field is cleared if it fails (see `common.images.verify_stored_image`).
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_pixels=IMAGE_VALIDATION_CONFIG["max_pixels"],
+        max_width=IMAGE_VALIDATION_CONFIG["max_width"],
+        max_height=IMAGE_VALIDATION_CONFIG["max_height"],
+        header_only_validation=True,
+        **kwargs,
+    ):
+        self.max_pixels = max_pixels
+        self.max_width = max_width
+        self.max_height = max_height
+        self.header_only_validation = header_only_validation
         kwargs.setdefault("upload_to", "files/")
         super().__init__(*args, **kwargs)
+        if self.header_only_validation:
+            # limits are validated from the header, before any decode
+            self.validators.append(
+                ImageHeaderValidator(
+                    max_pixels=self.max_pixels,
+                    max_width=self.max_width,
+                    max_height=self.max_height,
+                    allowed_formats=IMAGE_VALIDATION_CONFIG["allowed_formats"],
+                )
+            )
+
+    def deconstruct(self):
+        """Overridden because of custom params."""
+
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["max_pixels"] = self.max_pixels
+        kwargs["max_width"] = self.max_width
+        kwargs["max_height"] = self.max_height
+        kwargs["header_only_validation"] = self.header_only_validation
+        return name, path, args, kwargs
+
+    def formfield(self, **kwargs):
+        """Overridden to use the header only validation on forms."""
+
+        if self.header_only_validation:
+            kwargs.setdefault("form_class", HeaderOnlyImageFormField)
+
+        return super().formfield(**kwargs)
+
+    def pre_save(self, model_instance, add):
+        """Overridden to schedule the full verification for the new uploads."""
+
+        file = getattr(model_instance, self.attname)
+        is_new_upload = bool(file) and not file._committed
+
+        file = super().pre_save(model_instance, add)
+
+        if is_new_upload and self.header_only_validation:
+            transaction.on_commit(
+                lambda: schedule_image_verification(
+                    model_instance, self.name, max_pixels=self.max_pixels
+                ),
+                using=router.db_for_write(model_instance.__class__),
+            )
+
+        return file
 
 
-class AppSingleFileField(BaseField, models.FileField):
-    """Field for uploading a single file. Sets the default upload path."""
+class AppSingleFileField(ContentAddressedFileFieldMixin, BaseField, models.FileField):
+    """Field for uploading a single file. Sets the default upload path & storage."""
 
     def __init__(self, *args, **kwargs):
         kwargs.setdefault("upload_to", "files/")
+        kwargs.setdefault("storage", get_content_addressed_storage)
         super().__init__(*args, **kwargs)
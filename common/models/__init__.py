@@ -4,3 +4,6 @@ from .base import (
     COMMON_NULLABLE_FIELD_CONFIG,
     BaseModel,
 )
+from .storage import StoredBlob
+from .jobs import Job
+from .scheduler import ScheduledTask, ScheduledTaskRun
@@ -1,9 +1,12 @@
+import copy
 import uuid
 
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
 from django.db import models
+from django.db.models.fields.files import FieldFile
 
 from common.manager import BaseObjectManagerQuerySet
+from common.model_fields import AppBinaryUUIDField
 
 COMMON_CHAR_FIELD_MAX_LENGTH = 512
 COMMON_NULLABLE_FIELD_CONFIG = {
@@ -17,9 +20,15 @@ COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG = {
 
 
 class BaseModel(models.Model):
-    """Base Model for this Application"""
+    """
+    Base Model for this Application
 
-    uuid = models.UUIDField(default=uuid.uuid4, editable=False)
+    Tracks the changes of the loaded instances. The field values are snapshot when
+    loaded from the db, `save()` then writes only the changed columns and skips the
+    write if nothing has changed. Pass `update_fields` to save explicitly.
+    """
+
+    uuid = AppBinaryUUIDField(default=uuid.uuid4, editable=False)
     created = models.DateTimeField(auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
@@ -29,6 +38,122 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+        indexes = [
+            # keyset for the delta sync | see `common.sync`
+            models.Index(
+                fields=["modified", "id"], name="%(app_label)s_%(class)s_sync"
+            ),
+        ]
+
+    # snapshot of the field values | {attname: value}
+    _loaded_values = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Overridden to snapshot the loaded values."""
+
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance.get_loaded_values()
+        return instance
+
+    def get_loaded_values(self):
+        """Returns the values of the loaded (not deferred) concrete fields."""
+
+        loaded_values = {}
+        for field in self._meta.concrete_fields:
+            if field.attname in self.__dict__:
+                value = self.__dict__[field.attname]
+                # mutable, like the json fields
+                if isinstance(value, (dict, list)):
+                    value = copy.deepcopy(value)
+                # renamed in place by the `FieldFile.save`
+                elif isinstance(value, FieldFile):
+                    value = value.name
+                loaded_values[field.attname] = value
+
+        return loaded_values
+
+    def get_dirty_fields(self) -> list[str] | None:
+        """
+        Returns the names of the fields changed since loaded or saved. None if
+        the changes are not tracked, i.e. the instance is not yet saved.
+        """
+
+        if self._loaded_values is None:
+            return None
+
+        dirty_fields = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+
+            if field.attname not in self._loaded_values or field.get_prep_value(
+                self.__dict__[field.attname]
+            ) != field.get_prep_value(self._loaded_values[field.attname]):
+                dirty_fields.append(field.name)
+
+        return dirty_fields
+
+    def save(self, *args, **kwargs):
+        """
+        Overridden to write only the changed columns. The `auto_now` fields like
+        `modified` are written along with the changes.
+
+        Nothing is written if nothing has changed, and no signals are sent, like
+        for any save that does not happen.
+        """
+
+        if (
+            kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+            and not self._state.adding
+            and (dirty_fields := self.get_dirty_fields()) is not None
+        ):
+            if not dirty_fields:
+                return
+
+            kwargs["update_fields"] = dirty_fields + [
+                field.name
+                for field in self._meta.concrete_fields
+                if getattr(field, "auto_now", False) and field.name not in dirty_fields
+            ]
+
+        super().save(*args, **kwargs)
+        self.update_loaded_values(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        """Overridden to snapshot the reloaded values, those are not changes."""
+
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self.update_loaded_values(fields)
+
+    def update_loaded_values(self, update_fields=None):
+        """
+        Snapshots the values written by the save (or reloaded). Only the
+        `update_fields` if given, the other changes are still pending.
+        """
+
+        if update_fields is None or self._loaded_values is None:
+            self._loaded_values = self.get_loaded_values()
+            return
+
+        attnames = {}
+        for field in self._meta.concrete_fields:
+            attnames[field.name] = attnames[field.attname] = field.attname
+
+        written = {attnames[_] for _ in update_fields if _ in attnames}
+        self._loaded_values.update(
+            {k: v for k, v in self.get_loaded_values().items() if k in written}
+        )
+
+    @classmethod
+    def get_model_field(cls, field_name, fallback=None):
+        """Returns the model field for the given name. `fallback` if not present."""
+
+        try:
+            return cls._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return fallback
 
     @classmethod
     def get_model_fields(cls):
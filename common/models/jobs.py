@@ -0,0 +1,45 @@
+from django.db import models
+from django.utils import timezone
+
+from common.config import JOB_QUEUE_CONFIG, JobStatusChoices
+from common.models.base import (
+    COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG,
+    COMMON_CHAR_FIELD_MAX_LENGTH,
+    BaseModel,
+)
+
+
+class Job(BaseModel):
+    """
+    A background job of the database job queue, see `common.jobs`. Created once
+    the enqueuing transaction is committed, claimed & run by the `run_worker`.
+    """
+
+    name = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH)
+    queue = models.CharField(max_length=64, default=JOB_QUEUE_CONFIG["default_queue"])
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(
+        choices=JobStatusChoices.choices,
+        default=JobStatusChoices.queued,
+        max_length=32,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=JOB_QUEUE_CONFIG["max_attempts"])
+    run_after = models.DateTimeField(default=timezone.now)
+
+    # claim | the job is visible again after the `locked_until`
+    locked_by = models.CharField(
+        max_length=128, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG
+    )
+    locked_until = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    last_error = models.TextField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            *BaseModel.Meta.indexes,
+            models.Index(
+                fields=["queue", "status", "run_after"], name="common_job_claim"
+            ),
+        ]
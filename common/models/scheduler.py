@@ -0,0 +1,49 @@
+from django.db import models
+
+from common.config import JobStatusChoices
+from common.models.base import (
+    COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG,
+    COMMON_CHAR_FIELD_MAX_LENGTH,
+    BaseModel,
+)
+
+
+class ScheduledTask(BaseModel):
+    """
+    State of a periodic task declared in the app configs, shared by all the
+    scheduler nodes. The `next_run_at` is claimed with a compare & set, so each
+    run happens on a single node. See `common.scheduler`.
+    """
+
+    name = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH, unique=True)
+    schedule = models.CharField(max_length=128)
+    next_run_at = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+
+    locked_by = models.CharField(
+        max_length=128, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG
+    )
+    locked_until = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+
+    last_run_at = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    last_status = models.CharField(
+        choices=JobStatusChoices.choices,
+        max_length=32,
+        **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG,
+    )
+
+
+class ScheduledTaskRun(BaseModel):
+    """Run history of the periodic tasks. The `created` is the start time."""
+
+    task = models.ForeignKey(to=ScheduledTask, on_delete=models.CASCADE)
+    node = models.CharField(max_length=128)
+    status = models.CharField(
+        choices=JobStatusChoices.choices,
+        default=JobStatusChoices.running,
+        max_length=32,
+    )
+    finished = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    error = models.TextField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+
+    class Meta(BaseModel.Meta):
+        default_related_name = "related_runs"
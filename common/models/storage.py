@@ -0,0 +1,16 @@
+from django.db import models
+
+from common.models.base import COMMON_CHAR_FIELD_MAX_LENGTH, BaseModel
+
+
+class StoredBlob(BaseModel):
+    """
+    Book keeping for the files stored by the `ContentAddressedStorage`. One row
+    per unique content, the `reference_count` tracks how many rows reference the
+    same content. The file is removed only when the count drops to 0.
+    """
+
+    name = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH, unique=True)
+    digest = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    reference_count = models.PositiveIntegerField(default=0)
@@ -1,5 +1,10 @@
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 
+from common.config import ESTIMATED_COUNT_THRESHOLD
+
 
 class BasePagination(PageNumberPagination):
     """
@@ -9,3 +14,86 @@ class BasePagination(PageNumberPagination):
     page_size = 24
     page_size_query_param = "page-size"
     max_page_size = 100
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for the large tables, avoids the exact `COUNT(*)`:
+        > unfiltered: the row estimate from the database statistics.
+        > filtered: an exact count, capped at `ESTIMATED_COUNT_THRESHOLD` rows.
+
+    Falls back to the exact count if the database does not have the statistics.
+    With an estimated (or capped) count, `count_is_estimate` is set and the pages
+    past it are still served, until a page is empty.
+    """
+
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        """Overridden to estimate the count."""
+
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return super().count
+
+        if not queryset.query.where:
+            estimate = self.get_table_row_estimate(queryset)
+            if estimate is not None and estimate > ESTIMATED_COUNT_THRESHOLD:
+                self.count_is_estimate = True
+                return estimate
+
+        # one more row, to tell the capped counts from the exact ones
+        count = queryset.values("pk")[: ESTIMATED_COUNT_THRESHOLD + 1].count()
+        if count > ESTIMATED_COUNT_THRESHOLD:
+            self.count_is_estimate = True
+            return ESTIMATED_COUNT_THRESHOLD
+
+        return count
+
+    def validate_number(self, number):
+        """Overridden to allow the page numbers past an estimated count."""
+
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_is_estimate and int(number) > 1:
+                return int(number)
+            raise
+
+    def page(self, number):
+        """Overridden to not clamp the pages past an estimated count to it."""
+
+        number = self.validate_number(number)
+        if not self.count_is_estimate or number < self.num_pages:
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        object_list = self.object_list[bottom : bottom + self.per_page]
+        if number > 1 and not object_list:
+            raise EmptyPage(self.error_messages["no_results"])
+
+        return self._get_page(object_list, number, self)
+
+    @staticmethod
+    def get_table_row_estimate(queryset):
+        """Returns the row estimate of the queryset's table. None if not supported."""
+
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+
+        if connection.vendor == "mysql":
+            sql = (
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+            )
+        elif connection.vendor == "postgresql":
+            sql = "SELECT reltuples::bigint FROM pg_class WHERE relname = %s"
+        else:
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [table])
+            row = cursor.fetchone()
+
+        return int(row[0]) if row and row[0] is not None else None
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+from common.config import PASSWORD_HASHING_CONFIG
+
+
+def _setup_hasher_process():
+    import django
+
+    django.setup()
+
+
+class PasswordHasherPool:
+    """
+    Bounded process pool for the password hashing. The hashers (PBKDF2, argon2,
+    ...) take hundreds of milliseconds of CPU per password by design, the pool
+    spreads the batches across the cores and keeps the event loops free.
+
+    The single, synchronous `make_password` calls are not sent to the pool, the
+    signup latency stays the same. The pool is started lazily, on the first use.
+    Every web & worker process may start one, so the size is the cpu count capped
+    by the `PASSWORD_HASHING_CONFIG`, or the `PASSWORD_HASHING_WORKERS` setting.
+    """
+
+    def __init__(self, workers=None, min_batch_size=1):
+        self.workers = workers or self.get_default_workers()
+        self.min_batch_size = min_batch_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_default_workers() -> int:
+        if settings.PASSWORD_HASHING_WORKERS:
+            return settings.PASSWORD_HASHING_WORKERS
+
+        return min(os.cpu_count() or 1, PASSWORD_HASHING_CONFIG["max_workers"])
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=get_context("spawn"),
+                    initializer=_setup_hasher_process,
+                )
+
+            return self._executor
+
+    def make_passwords(self, passwords) -> list[str]:
+        """
+        Batch version of the `make_password`, hashes in parallel. Returns the
+        hashes in the same order. The unusable (None) passwords are not sent.
+        """
+
+        passwords = list(passwords)
+        indexes = [i for i, _ in enumerate(passwords) if _ is not None]
+        if len(indexes) < self.min_batch_size:
+            return [make_password(_) for _ in passwords]
+
+        hashes = [make_password(None) if _ is None else None for _ in passwords]
+        chunk_size = max(1, len(indexes) // (self.workers * 4))
+
+        for index, value in zip(
+            indexes,
+            self.executor.map(
+                make_password, [passwords[i] for i in indexes], chunksize=chunk_size
+            ),
+        ):
+            hashes[index] = value
+
+        return hashes
+
+    async def amake_password(self, password) -> str:
+        """Async version of the `make_password`, for the ASGI views."""
+
+        if password is None:
+            return make_password(None)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, make_password, password
+        )
+
+    async def amake_passwords(self, passwords) -> list[str]:
+        """Async version of the `make_passwords`."""
+
+        return await asyncio.gather(*[self.amake_password(_) for _ in passwords])
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+password_hasher_pool = PasswordHasherPool(
+    min_batch_size=PASSWORD_HASHING_CONFIG["min_batch_size"]
+)
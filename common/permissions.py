@@ -1,8 +1,13 @@
 from rest_framework import permissions
 
+from common.policies import policy_engine
+
 
 class PolicyPermission(permissions.BasePermission):
-    """Custom Policy based permission."""
+    """
+    Custom Policy based permission. Evaluates the view's `policy_slug` with the
+    cached `policy_engine`. Views without a `policy_slug` need only a login.
+    """
 
     def has_permission(self, request, view):
         """Get the policy slug from the view and validate permissions."""
@@ -10,4 +15,21 @@ class PolicyPermission(permissions.BasePermission):
         user = request.user
         if user.is_anonymous:
             return False
+
+        if policy_slug := getattr(view, "policy_slug", None):
+            return policy_engine.has_policy(user, policy_slug)
+
+        return True
+
+    def has_object_permission(self, request, view, obj):
+        """Validates the policy scope on the given object."""
+
+        if policy_slug := getattr(view, "policy_slug", None):
+            return policy_engine.has_object_policy(
+                request.user,
+                policy_slug,
+                obj,
+                owner_field=getattr(view, "policy_owner_field", "user"),
+            )
+
         return True
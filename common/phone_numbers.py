@@ -0,0 +1,96 @@
+import copy
+from functools import lru_cache
+
+import phonenumbers
+from django.core import validators
+from phonenumber_field.phonenumber import PhoneNumber, to_python
+
+from common.config import PHONE_NUMBER_CACHE_SIZE
+
+
+class AppPhoneNumber(PhoneNumber):
+    """
+    Applications version of the `PhoneNumber`. Memoizes the validity and the E.164
+    format, which are computed on every save & serialization otherwise.
+
+    Note:
+        Instances are returned by `parse_phone_number`, treat them as immutable.
+    """
+
+    _is_valid = None
+    _as_e164 = None
+
+    def is_valid(self):
+        if self._is_valid is None:
+            self._is_valid = super().is_valid()
+
+        return self._is_valid
+
+    def format_as(self, format):
+        if format != phonenumbers.PhoneNumberFormat.E164:
+            return super().format_as(format)
+
+        if self._as_e164 is None:
+            self._as_e164 = super().format_as(format)
+
+        return self._as_e164
+
+    def merge_from(self, other):
+        """Overridden to reset the memoized values."""
+
+        self._is_valid = self._as_e164 = None
+        return super().merge_from(other)
+
+
+@lru_cache(maxsize=PHONE_NUMBER_CACHE_SIZE)
+def _parse_phone_number(value: str, region: str | None) -> AppPhoneNumber:
+    """Cached parse of the given string. Never return this instance as such, copy."""
+
+    try:
+        phone_number = AppPhoneNumber.from_string(phone_number=value, region=region)
+    except phonenumbers.NumberParseException:
+        # not a valid phone number, same as `to_python`
+        phone_number = AppPhoneNumber(raw_input=value)
+
+    # computing once, shared by the copies
+    if phone_number.is_valid():
+        phone_number.as_e164  # noqa
+
+    return phone_number
+
+
+def parse_phone_number(value, region=None):
+    """
+    Memoized version of the phonenumber_field's `to_python`. Strings are parsed
+    once per (value, region) and a copy of the parsed number is returned.
+    """
+
+    if isinstance(value, str) and value not in validators.EMPTY_VALUES:
+        return copy.copy(_parse_phone_number(value, region))
+
+    return to_python(value, region=region)
+
+
+def normalize_phone_number(value, region=None) -> str | None:
+    """Returns the E.164 format of the given number. None if not valid."""
+
+    phone_number = parse_phone_number(value, region=region)
+
+    if phone_number and phone_number.is_valid():
+        return phone_number.as_e164
+
+    return None
+
+
+def normalize_phone_numbers(values, region=None) -> list[str | None]:
+    """
+    Batch version of the `normalize_phone_number`, used on bulk imports.
+    Returns the E.164 formats in the same order, None for the invalid ones.
+    """
+
+    normalized = {}
+    for value in values:
+        if value not in normalized:
+            normalized[value] = normalize_phone_number(value, region=region)
+
+    return [normalized[value] for value in values]
@@ -0,0 +1,137 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+
+from common.caching import LocalCache, get_user_version_key, get_version
+from common.config import (
+    POLICY_LOCAL_CACHE_SIZE,
+    ROLE_POLICIES,
+    UNTYPED_USER_ROLE,
+)
+
+POLICY_SCOPE_ALL = "all"
+POLICY_SCOPE_OWN = "own"
+POLICY_WILDCARD = "*"
+
+
+class PolicyEngine:
+    """
+    Evaluates the role based policies (see `ROLE_POLICIES`) for the users.
+
+    The effective policies of an user are compiled once, into {policy_slug: scope},
+    and cached in the process memory as well as in the shared cache. Both are keyed
+    on the user's version (see `common.caching`), which is bumped when the user or
+    the user's roles change. So a request costs a version lookup on the shared
+    cache, no database queries. The cache must be shared by all the processes, see
+    `common.caching.check_shared_cache`.
+
+    Usage:
+        policy_engine.has_policy(user, "user_list")
+        policy_engine.filter_queryset(user, "user_list", queryset, owner_field="pk")
+    """
+
+    def __init__(self, role_policies, local_cache_size):
+        self.role_policies = role_policies
+        self.local_cache_size = local_cache_size
+        self.config_version = hashlib.sha1(
+            json.dumps(role_policies, sort_keys=True).encode(),
+            usedforsecurity=False,
+        ).hexdigest()[:8]
+
+        self._local_cache = LocalCache(max_size=local_cache_size)
+
+    def get_policies_key(self, user_id, version):
+        return f"policy:{self.config_version}:{user_id}:{version}"
+
+    @staticmethod
+    def get_roles(user) -> set:
+        """Returns the roles of the given user. Uses a query for the groups."""
+
+        roles = {"authenticated"}
+
+        roles.add(getattr(user, "type", None) or UNTYPED_USER_ROLE)
+        if user.is_staff:
+            roles.add("staff")
+        if user.is_superuser:
+            roles.add("superuser")
+
+        roles.update(user.groups.values_list("name", flat=True))
+        return roles
+
+    def compile(self, user) -> dict:
+        """Returns the effective {policy_slug: scope} of the user from the roles."""
+
+        policies = {}
+        for role in self.get_roles(user):
+            for policy_slug, scope in self.role_policies.get(role, {}).items():
+                # the widest scope wins
+                if policies.get(policy_slug) != POLICY_SCOPE_ALL:
+                    policies[policy_slug] = scope
+
+        return policies
+
+    def get_policies(self, user) -> dict:
+        """Returns the compiled policies of the user, from the caches if possible."""
+
+        version = get_version(get_user_version_key(user.pk))
+        key = self.get_policies_key(user.pk, version)
+
+        if (policies := self._local_cache.get(key)) is not None:
+            return policies
+
+        policies = cache.get(key)
+        if policies is None:
+            policies = self.compile(user)
+            cache.set(key, policies, None)
+
+        self._local_cache.set(key, policies)
+        return policies
+
+    def get_scope(self, user, policy_slug) -> str | None:
+        """Returns the scope of the policy for the user. None if not allowed."""
+
+        policies = self.get_policies(user)
+        scopes = {policies.get(policy_slug), policies.get(POLICY_WILDCARD)} - {None}
+
+        # the widest scope wins, also over the wildcard
+        if POLICY_SCOPE_ALL in scopes:
+            return POLICY_SCOPE_ALL
+        return scopes.pop() if scopes else None
+
+    def has_policy(self, user, policy_slug) -> bool:
+        """Returns a bool, that if the user has the policy with any scope."""
+
+        return self.get_scope(user, policy_slug) is not None
+
+    def has_object_policy(self, user, policy_slug, obj, owner_field) -> bool:
+        """Returns a bool, that if the user has the policy on the given object."""
+
+        scope = self.get_scope(user, policy_slug)
+
+        if scope == POLICY_SCOPE_OWN:
+            owner_field = "pk" if owner_field == "pk" else f"{owner_field}_id"
+            return getattr(obj, owner_field, None) == user.pk
+
+        return scope is not None
+
+    def filter_queryset(self, user, policy_slug, queryset, owner_field):
+        """
+        Batch version of the `has_object_policy` for the list querysets. Returns
+        the queryset restricted to the objects the user has the policy on.
+        """
+
+        scope = self.get_scope(user, policy_slug)
+
+        if scope == POLICY_SCOPE_ALL:
+            return queryset
+
+        if scope == POLICY_SCOPE_OWN:
+            return queryset.filter(**{owner_field: user.pk})
+
+        return queryset.none()
+
+
+policy_engine = PolicyEngine(
+    role_policies=ROLE_POLICIES, local_cache_size=POLICY_LOCAL_CACHE_SIZE
+)
@@ -0,0 +1,190 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+
+# plan of a serializer field | (select_related, prefetch_related, columns)
+# the prefetches are (lookup, model, nested plan, required columns), and
+# the columns are the model fields needed, None if unknown (method fields)
+EMPTY_PLAN = ([], [], [])
+
+
+def get_field_plan(field, model):
+    """
+    Returns the plan for the given (bound) serializer field of the given model,
+    by walking the field's `source` path and the nested serializers.
+    """
+
+    if isinstance(field, ManyRelatedField):
+        nested = field.child_relation
+    elif isinstance(field, serializers.ListSerializer):
+        nested = field.child
+    else:
+        nested = field
+
+    if not field.source_attrs:  # source="*"
+        if isinstance(nested, serializers.BaseSerializer):
+            return get_serializer_plan(nested, model)
+        return [], [], None
+
+    try:
+        model_field = model._meta.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        return [], [], None  # properties & methods
+
+    columns = [model_field.name] if model_field.concrete else []
+
+    # walk the relations on the source path
+    path, related_model, many_index = [], model, None
+    for attr in field.source_attrs:
+        try:
+            related_field = related_model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+
+        if not related_field.is_relation or related_field.related_model is None:
+            break
+
+        if many_index is None and (
+            related_field.one_to_many or related_field.many_to_many
+        ):
+            many_index = len(path)
+
+        path.append(related_field)
+        related_model = related_field.related_model
+
+    if (
+        path
+        and many_index is None
+        and isinstance(nested, PrimaryKeyRelatedField)
+        and len(path) == len(field.source_attrs)
+        and path[-1].concrete
+    ):
+        path = path[:-1]  # pk only, read from the `<fk>_id` column
+
+    if not path:
+        return [], [], columns
+
+    lookup = "__".join(_.name for _ in path)
+    nested_plan = EMPTY_PLAN
+    if isinstance(nested, serializers.BaseSerializer) and len(path) == len(
+        field.source_attrs
+    ):
+        nested_plan = get_serializer_plan(nested, related_model)
+    elif isinstance(nested, PrimaryKeyRelatedField):
+        nested_plan = ([], [], [related_model._meta.pk.name])
+
+    if many_index is None:
+        select_related = [lookup, *[f"{lookup}__{_}" for _ in nested_plan[0]]]
+        prefetch_related = [
+            (f"{lookup}__{_lookup}", *_rest) for _lookup, *_rest in nested_plan[1]
+        ]
+        return select_related, prefetch_related, columns
+
+    select_related = (
+        ["__".join(_.name for _ in path[:many_index])] if many_index else []
+    )
+    if many_index != len(path) - 1:
+        # relations after the many relation, left to django
+        return select_related, [(lookup, None, None, None)], columns
+
+    # the columns to join the prefetched objects back, for the reverse foreign keys
+    many_field = path[-1]
+    required = [many_field.field.name] if many_field.one_to_many else []
+    return select_related, [(lookup, related_model, nested_plan, required)], columns
+
+
+def get_serializer_plan(serializer, model):
+    """Returns the combined plan of the fields of the given serializer."""
+
+    select_related, prefetch_related, columns = [], [], [model._meta.pk.name]
+
+    for field in serializer.fields.values():
+        _select_related, _prefetch_related, _columns = get_field_plan(field, model)
+        select_related.extend(_select_related)
+        prefetch_related.extend(_prefetch_related)
+        columns = None if columns is None or _columns is None else columns + _columns
+
+    return select_related, prefetch_related, columns
+
+
+@lru_cache(maxsize=None)
+def get_serializer_lookups(serializer_class) -> dict:
+    """
+    Returns the {field_name: (select_related, prefetch_related)} of the given
+    serializer class. Introspected once per class.
+    """
+
+    serializer, model = serializer_class(), serializer_class.Meta.model
+    return {
+        field_name: get_field_plan(field, model)[:2]
+        for field_name, field in serializer.fields.items()
+    }
+
+
+def get_prefetches(prefetch_related, seen=()):
+    """Returns the `Prefetch` objects for the planned prefetches, de-duplicated."""
+
+    prefetches, seen = [], set(seen)
+    for lookup, model, plan, required in prefetch_related:
+        if lookup in seen:
+            continue
+
+        seen.add(lookup)
+        if model is None:
+            prefetches.append(lookup)
+        else:
+            prefetches.append(
+                Prefetch(lookup, queryset=get_planned_queryset(model, plan, required))
+            )
+
+    return prefetches
+
+
+def get_planned_queryset(model, plan, required=()):
+    """Returns the queryset of the given model, loading only what the plan needs."""
+
+    select_related, prefetch_related, columns = plan
+    queryset = model._default_manager.all()
+
+    if select_related:
+        queryset = queryset.select_related(*dict.fromkeys(select_related))
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*get_prefetches(prefetch_related))
+    if columns is not None:
+        queryset = queryset.only(*dict.fromkeys([*columns, *required]))
+
+    return queryset
+
+
+def optimize_queryset(queryset, serializer_class, field_names=None):
+    """
+    Applies the `select_related` & `prefetch_related` needed by the given serializer
+    class (or the given fields of it) on the queryset. So the number of queries is
+    constant, instead of one or more per object (N+1).
+
+    The prefetched querysets load only the columns used, if they can be known.
+    The lookups already on the queryset are left as is.
+    """
+
+    select_related, prefetch_related = [], []
+    for field_name, (_select_related, _prefetch_related) in get_serializer_lookups(
+        serializer_class
+    ).items():
+        if field_names is None or field_name in field_names:
+            select_related.extend(_select_related)
+            prefetch_related.extend(_prefetch_related)
+
+    if select_related:
+        queryset = queryset.select_related(*dict.fromkeys(select_related))
+
+    if prefetch_related:
+        seen = [
+            getattr(_, "prefetch_to", _) for _ in queryset._prefetch_related_lookups
+        ]
+        if prefetches := get_prefetches(prefetch_related, seen=seen):
+            queryset = queryset.prefetch_related(*prefetches)
+
+    return queryset
@@ -0,0 +1,10 @@
+from rest_framework.renderers import JSONRenderer
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """
+    Selected with the `?format=columnar`. Renders like the `JSONRenderer`, the
+    list views send out the rows as lists of values, see `ValuesListMixin`.
+    """
+
+    format = "columnar"
@@ -0,0 +1,269 @@
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from common.config import SCHEDULER_CONFIG, JobStatusChoices
+
+logger = logging.getLogger(__name__)
+
+CRON_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+
+class CronSchedule:
+    """
+    Cron expression, `minute hour day-of-month month day-of-week`, with the `*`,
+    `a-b`, `a,b` & `/step` syntax and the `@hourly`, `@daily`, ... aliases. The day
+    of the week is 0-6 from sunday (7 is sunday as well). Evaluated in the local
+    time (`TIME_ZONE`).
+    """
+
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression):
+        self.expression = expression
+        fields = CRON_ALIASES.get(expression, expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression: {expression}")
+
+        minutes, hours, days, months, weekdays = [
+            self.parse_field(field, *limits)
+            for field, limits in zip(fields, self.RANGES)
+        ]
+        self.minutes, self.hours, self.days, self.months = minutes, hours, days, months
+        self.weekdays = {_ % 7 for _ in weekdays}
+
+        # both restricted | either matches, like cron
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def parse_field(field, low, high) -> set:
+        values = set()
+        for part in field.split(","):
+            part, _, step = part.partition("/")
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = [int(_) for _ in part.split("-")]
+            else:
+                start = end = int(part)
+                if step:
+                    end = high
+
+            if not low <= start <= end <= high:
+                raise ValueError(f"Invalid cron field: {field}")
+
+            values.update(range(start, end + 1, int(step or 1)))
+
+        return values
+
+    def matches_day(self, value) -> bool:
+        day = value.day in self.days
+        weekday = (value.weekday() + 1) % 7 in self.weekdays
+
+        if self.any_day or self.any_weekday:
+            return day and weekday
+
+        return day or weekday
+
+    def get_next(self, after):
+        """Returns the first time matching the schedule, after the given time."""
+
+        value = timezone.localtime(after).replace(second=0, microsecond=0)
+        value += timedelta(minutes=1)
+
+        # about 4 years of jumps, for the expressions that never match
+        for _ in range(50_000):
+            if value.month not in self.months:
+                year, month = divmod(value.month, 12)
+                value = value.replace(
+                    year=value.year + year, month=month + 1, day=1, hour=0, minute=0
+                )
+            elif not self.matches_day(value):
+                value = (value + timedelta(days=1)).replace(hour=0, minute=0)
+            elif value.hour not in self.hours:
+                value = (value + timedelta(hours=1)).replace(minute=0)
+            elif value.minute not in self.minutes:
+                value += timedelta(minutes=1)
+            else:
+                return value
+
+        raise ValueError(f"The cron expression never matches: {self.expression}")
+
+
+def get_periodic_tasks() -> dict:
+    """
+    Returns the periodic tasks declared on the app configs, as {name: task}:
+
+        class CommonConfig(AppConfig):
+            periodic_tasks = [
+                {
+                    "name": "clear_expired_sessions",
+                    "schedule": "0 3 * * *",
+                    "task": "common.maintenance.clear_expired_sessions",
+                    "jitter": 600,  # optional, seconds
+                },
+            ]
+    """
+
+    return {
+        task["name"]: task
+        for app_config in apps.get_app_configs()
+        for task in getattr(app_config, "periodic_tasks", [])
+    }
+
+
+class Scheduler:
+    """
+    Long running scheduler of the periodic tasks. Runs on any number of nodes,
+    each run is claimed by a single node through the database (the compare & set of
+    the `ScheduledTask.next_run_at`), and a task does not overlap with its previous
+    run. The tasks run in a bounded thread pool of this warm process, and every run
+    is recorded in the `ScheduledTaskRun`.
+
+    The runs missed while no scheduler was up are run once, not for each.
+    """
+
+    def __init__(self, concurrency=None):
+        self.concurrency = concurrency or SCHEDULER_CONFIG["concurrency"]
+        self.node = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.tasks = get_periodic_tasks()
+        self.schedules = {
+            name: CronSchedule(task["schedule"]) for name, task in self.tasks.items()
+        }
+        self.running = set()
+        self.stopped = threading.Event()
+
+    def get_next_run_at(self, name, after):
+        jitter = random.uniform(0, self.tasks[name].get("jitter", 0))  # nosec
+        return self.schedules[name].get_next(after) + timedelta(seconds=jitter)
+
+    def sync_tasks(self):
+        """Creates the declared tasks, re-schedules the ones whose schedule changed."""
+
+        from common.models import ScheduledTask
+
+        now = timezone.now()
+        for name, task in self.tasks.items():
+            scheduled_task, created = ScheduledTask.objects.get_or_create(
+                name=name,
+                defaults={
+                    "schedule": task["schedule"],
+                    "next_run_at": self.get_next_run_at(name, now),
+                },
+            )
+            if not created and scheduled_task.schedule != task["schedule"]:
+                ScheduledTask.objects.filter(pk=scheduled_task.pk).update(
+                    schedule=task["schedule"],
+                    next_run_at=self.get_next_run_at(name, now),
+                    modified=now,
+                )
+
+    def claim_due_tasks(self, limit) -> list:
+        """
+        Claims up to the `limit` due tasks that are not running anywhere. Returns
+        the claimed tasks.
+        """
+
+        from common.models import ScheduledTask
+
+        now = timezone.now()
+        not_locked = Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+        claimed = []
+
+        for scheduled_task in ScheduledTask.objects.filter(
+            not_locked, name__in=self.tasks, next_run_at__lte=now
+        ):
+            if len(claimed) >= limit:
+                break
+
+            if scheduled_task.name in self.running:
+                continue
+
+            if (
+                ScheduledTask.objects.filter(
+                    not_locked,
+                    pk=scheduled_task.pk,
+                    next_run_at=scheduled_task.next_run_at,
+                ).update(
+                    next_run_at=self.get_next_run_at(scheduled_task.name, now),
+                    locked_by=self.node,
+                    locked_until=now
+                    + timedelta(seconds=SCHEDULER_CONFIG["lock_timeout"]),
+                    modified=now,
+                )
+                == 1
+            ):
+                claimed.append(scheduled_task)
+
+        return claimed
+
+    def run_task(self, scheduled_task):
+        """Runs the claimed task, records the run & releases the lock."""
+
+        from common.models import ScheduledTask, ScheduledTaskRun
+
+        close_old_connections()
+        run = ScheduledTaskRun.objects.create(task=scheduled_task, node=self.node)
+        status, error = JobStatusChoices.succeeded, None
+
+        try:
+            import_string(self.tasks[scheduled_task.name]["task"])()
+        except Exception:  # noqa
+            status, error = JobStatusChoices.failed, traceback.format_exc()
+            logger.error(f"Scheduler: {scheduled_task.name} failed. {error}")
+        finally:
+            now = timezone.now()
+            ScheduledTaskRun.objects.filter(pk=run.pk).update(
+                status=status, error=error, finished=now, modified=now
+            )
+            ScheduledTask.objects.filter(
+                pk=scheduled_task.pk, locked_by=self.node
+            ).update(
+                locked_by=None,
+                locked_until=None,
+                last_run_at=run.created,
+                last_status=status,
+                modified=now,
+            )
+            self.running.discard(scheduled_task.name)
+            close_old_connections()
+
+    def stop(self, *args):
+        logger.info(f"Scheduler {self.node}: stopping after the running tasks.")
+        self.stopped.set()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.sync_tasks()
+        logger.info(f"Scheduler {self.node}: started with {', '.join(self.tasks)}.")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while not self.stopped.is_set():
+                free_slots = self.concurrency - len(self.running)
+                for scheduled_task in self.claim_due_tasks(limit=free_slots):
+                    self.running.add(scheduled_task.name)
+                    executor.submit(self.run_task, scheduled_task)
+
+                close_old_connections()
+                self.stopped.wait(SCHEDULER_CONFIG["poll_interval"])
@@ -1,12 +1,22 @@
+from functools import lru_cache, partial
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+from djchoices import DjangoChoices
 from rest_framework import serializers
 from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
 from rest_framework.serializers import ModelSerializer, Serializer
 
 from common import model_fields
-from common.config import CUSTOM_ERRORS_MESSAGES
+from common.choices import choice_registry
+from common.config import BATCH_REQUESTS_CONFIG, CUSTOM_ERRORS_MESSAGES
+from common.form_fields import HeaderOnlyImageFormField
 from common.helpers import get_display_name_for_slug, get_first_of, unpack_dj_choices
 from common.model_fields import AppFileField, AppImageField
 from common.models import BaseModel
+from common.phone_numbers import parse_phone_number
 
 
 class CustomErrorMessagesMixin:
@@ -75,6 +85,22 @@ class AppSerializer(Serializer):
         return self.context["request"]
 
 
+class BatchSubRequestSerializer(AppSerializer):
+    """A request of the `batch/`, the path includes the query string."""
+
+    method = serializers.ChoiceField(choices=BATCH_REQUESTS_CONFIG["methods"])
+    path = serializers.RegexField(r"^/", max_length=2048)
+    body = serializers.JSONField(required=False, allow_null=True, default=None)
+
+
+class BatchRequestSerializer(AppSerializer):
+    requests = serializers.ListField(
+        child=BatchSubRequestSerializer(),
+        min_length=1,
+        max_length=BATCH_REQUESTS_CONFIG["max_requests"],
+    )
+
+
 class AppModelSerializer(AppSerializer, ModelSerializer):
     """
     Applications version of the ModelSerializer. There are separate serializers
@@ -87,6 +113,22 @@ class AppModelSerializer(AppSerializer, ModelSerializer):
     class Meta:
         pass
 
+    def build_standard_field(self, field_name, model_field):
+        """Overridden to use the header only validation of the `AppImageField`."""
+
+        field_class, field_kwargs = super().build_standard_field(
+            field_name, model_field
+        )
+
+        if (
+            isinstance(model_field, AppImageField)
+            and model_field.header_only_validation
+            and issubclass(field_class, serializers.ImageField)
+        ):
+            field_kwargs["_DjangoImageField"] = HeaderOnlyImageFormField
+
+        return field_class, field_kwargs
+
     def serialize_dj_choices(self, choices: dict):
         """
         Given a list of choices like:
@@ -97,8 +139,14 @@ class AppModelSerializer(AppSerializer, ModelSerializer):
 
         This will be convenient for the front end to integrate. Also
         this is considered as a standard.
+
+        For the `DjangoChoices` classes, the pre-computed options from the
+        `choice_registry` are returned. Do not mutate them.
         """
 
+        if isinstance(choices, type) and issubclass(choices, DjangoChoices):
+            return choice_registry.get_options(choices.__name__)
+
         return unpack_dj_choices(choices)
 
     def serialize_for_meta(self, queryset, fields=None):
@@ -119,33 +167,37 @@ class AppWriteOnlyModelSerializer(AppModelSerializer):
         Never mix the `read` and `write` serializers, handle them separate.
     """
 
-    def create(self, validated_data):
-        """Overridden to set the `created_by` field."""
+    def get_audit_user(self):
+        """Returns the user for the `created_by` & `modified_by` fields."""
 
-        instance = super().create(validated_data=validated_data)
+        user = self.get_user()
+        return user if user and user.is_authenticated else None
 
-        # setting the anonymous fields
-        if hasattr(instance, "created_by") and not instance.created_by:
-            user = self.get_user()
+    def create(self, validated_data):
+        """
+        Overridden to set the `created_by` field. Set along with the data,
+        so that the instance is created with a single insert.
+        """
 
-            instance.created_by = user if user and user.is_authenticated else None
-            instance.save()
+        # setting the anonymous fields
+        if hasattr(self.Meta.model, "created_by") and not validated_data.get(
+            "created_by"
+        ):
+            validated_data["created_by"] = self.get_audit_user()
 
-        return instance
+        return super().create(validated_data=validated_data)
 
     def update(self, instance, validated_data):
-        """Overridden to set the `modified_by` field."""
-
-        instance = super().update(instance, validated_data)
+        """
+        Overridden to set the `modified_by` field. Set along with the data, so
+        that the changed columns are saved with a single update.
+        """
 
         # setting the anonymous fields
-        if hasattr(instance, "modified_by"):
-            user = self.get_user()
-
-            instance.modified_by = user if user and user.is_authenticated else None
-            instance.save()
+        if hasattr(self.Meta.model, "modified_by"):
+            validated_data["modified_by"] = self.get_audit_user()
 
-        return instance
+        return super().update(instance, validated_data)
 
     def get_validated_data(self, key=None):
         """Central function to return the validated data."""
@@ -194,8 +246,6 @@ class AppWriteOnlyModelSerializer(AppModelSerializer):
         this is considered as a standard.
         """
 
-        from apps.common.helpers import get_display_name_for_slug
-
         return [{"id": _, "identity": get_display_name_for_slug(_)} for _ in choices]
 
     def get_dynamic_render_config(self):
@@ -386,11 +436,65 @@ class AppUpdateModelSerializer(AppWriteOnlyModelSerializer):
         raise NotImplementedError
 
 
+# how the values of the plain fields are read from the `values_list` rows
+ROW_FIELD_COLUMN = "column"
+ROW_FIELD_PK = "pk"
+ROW_FIELD_PHONE_NUMBER = "phone_number"
+ROW_FIELD_FILE = "file"
+
+
+@lru_cache(maxsize=None)
+def get_row_fields(serializer_class) -> dict:
+    """
+    Returns the {field_name: (column, kind)} of the given read serializer class, for
+    the `values_list` fast path. None for the fields that need a model instance,
+    like the method fields, the source paths and the other relations.
+    """
+
+    model, row_fields = serializer_class.Meta.model, {}
+
+    for field in serializer_class()._readable_fields:
+        row_fields[field.field_name] = None
+
+        if isinstance(field, serializers.SerializerMethodField) or (
+            len(field.source_attrs) != 1
+        ):
+            continue
+
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            continue
+
+        if not model_field.concrete:
+            continue
+
+        if model_field.is_relation:
+            if (
+                isinstance(field, serializers.PrimaryKeyRelatedField)
+                and field.use_pk_only_optimization()
+            ):
+                row_fields[field.field_name] = (model_field.attname, ROW_FIELD_PK)
+        elif isinstance(model_field, model_fields.AppPhoneNumberField):
+            row_fields[field.field_name] = (
+                model_field.attname,
+                ROW_FIELD_PHONE_NUMBER,
+            )
+        elif isinstance(model_field, models.FileField):
+            row_fields[field.field_name] = (model_field.attname, ROW_FIELD_FILE)
+        elif model_field.descriptor_class is DeferredAttribute:
+            row_fields[field.field_name] = (model_field.attname, ROW_FIELD_COLUMN)
+
+    return row_fields
+
+
 class AppReadOnlyModelSerializer(AppModelSerializer):
     """
     Read only version of the `AppModelSerializer`. Does not
     support write operations.
 
+    Supports a fast path for the lists, see `get_row_serializer`.
+
     Note:
         Never mix the `read` and `write` serializers, handle them separate.
     """
@@ -398,6 +502,66 @@ class AppReadOnlyModelSerializer(AppModelSerializer):
     class Meta(AppModelSerializer.Meta):
         pass
 
+    def get_row_serializer(self, columnar=False):
+        """
+        Returns the (columns, function) to serialize the `values_list(*columns)`
+        rows of the queryset, without building the model instances. The output
+        is the same as `to_representation`. None if a field needs an instance.
+        With `columnar`, the output is the list of the values, in the field order.
+
+        The phone numbers and files are converted like their model descriptors
+        do, before the field's `to_representation`.
+        """
+
+        if type(self).to_representation is not serializers.Serializer.to_representation:
+            return None
+
+        row_fields = get_row_fields(type(self))
+        readable_fields = list(self._readable_fields)
+
+        if any(row_fields.get(_.field_name) is None for _ in readable_fields):
+            return None
+
+        model, columns, converters = self.Meta.model, [], []
+        for field in readable_fields:
+            column, kind = row_fields[field.field_name]
+            model_field = model._meta.get_field(field.source_attrs[0])
+
+            if kind == ROW_FIELD_PK:
+                prepare = PKOnlyObject
+            elif kind == ROW_FIELD_PHONE_NUMBER:
+                prepare = partial(parse_phone_number, region=model_field.region)
+            elif kind == ROW_FIELD_FILE:
+                prepare = partial(model_field.attr_class, None, model_field)
+            else:
+                prepare = None
+
+            columns.append(column)
+            converters.append((field.field_name, prepare, field.to_representation))
+
+        def serialize_row_values(row):
+            return [
+                None
+                if value is None
+                else to_representation(value if prepare is None else prepare(value))
+                for (_, prepare, to_representation), value in zip(converters, row)
+            ]
+
+        if columnar:
+            return columns, serialize_row_values
+
+        def serialize_row(row):
+            data = {}
+            for (field_name, prepare, to_representation), value in zip(converters, row):
+                if prepare is not None and value is not None:
+                    value = prepare(value)
+
+                data[field_name] = None if value is None else to_representation(value)
+
+            return data
+
+        return columns, serialize_row
+
     def create(self, validated_data):
         raise NotImplementedError
 
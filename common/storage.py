@@ -0,0 +1,215 @@
+import hashlib
+import os
+import tempfile
+from contextlib import suppress
+from functools import partial
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler,
+)
+from django.db import router, transaction
+
+CONTENT_HASH_ALGORITHM = "sha256"
+
+
+class ContentHashUploadHandlerMixin:
+    """
+    Computes the content hash of the uploaded file while the chunks are being
+    received. The hex digest is set as `content_hash` on the uploaded file, so
+    the storage does not have to read the file once again to hash it.
+    """
+
+    def new_file(self, *args, **kwargs):
+        # set before `super`, the memory handler raises `StopFutureHandlers`
+        self.content_hasher = hashlib.new(CONTENT_HASH_ALGORITHM)
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        # an inactive memory handler passes the chunk to the next handler
+        if getattr(self, "activated", True):
+            self.content_hasher.update(raw_data)
+
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+
+        if uploaded_file is not None:
+            uploaded_file.content_hash = self.content_hasher.hexdigest()
+
+        return uploaded_file
+
+
+class ContentHashMemoryFileUploadHandler(
+    ContentHashUploadHandlerMixin, MemoryFileUploadHandler
+):
+    """`MemoryFileUploadHandler` that hashes the content while receiving."""
+
+    pass
+
+
+class ContentHashTemporaryFileUploadHandler(
+    ContentHashUploadHandlerMixin, TemporaryFileUploadHandler
+):
+    """`TemporaryFileUploadHandler` that hashes the content while receiving."""
+
+    pass
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that stores the files by their content hash. The same
+    content uploaded again is not written to the disk, only the reference
+    count of the `common.StoredBlob` is incremented.
+
+    The directory from `upload_to` is kept, the file name is replaced:
+        files/logo.png -> files/3a/3a7bd3e2360a3d...80b.png
+
+    The references are counted as a part of the saving transaction, and released
+    by the file fields when the row is deleted or the file is replaced (see
+    `ContentAddressedFileFieldMixin`). The file is deleted from the disk once the
+    last reference is released and committed.
+    """
+
+    def get_blob_model(self):
+        """Returns the book keeping model. Resolved lazily, storages are module level."""
+
+        return apps.get_model("common", "StoredBlob")
+
+    @staticmethod
+    def get_content_hash(content):
+        """
+        Returns the hex digest of the given content. Uses the digest computed by the
+        upload handlers if present, else hashes the content in a streaming pass.
+        """
+
+        if content_hash := getattr(content, "content_hash", None):
+            return content_hash
+
+        hasher = hashlib.new(CONTENT_HASH_ALGORITHM)
+        for chunk in content.chunks():
+            hasher.update(chunk)
+
+        if hasattr(content, "seek"):
+            content.seek(0)
+
+        return hasher.hexdigest()
+
+    @staticmethod
+    def get_hashed_name(name, digest):
+        """Returns the content addressed name for the given name & digest."""
+
+        directory, file_name = os.path.split(name)
+        extension = os.path.splitext(file_name)[1].lower()
+        return os.path.join(directory, digest[:2], f"{digest}{extension}")
+
+    def get_available_name(self, name, max_length=None):
+        """The name is derived from the content in `_save`, nothing to resolve here."""
+
+        return name
+
+    def _save(self, name, content):
+        """
+        Overridden to count the reference and write the content in one locked step,
+        the content is written only for a new blob (or a missing file). A rolled back
+        save leaves at most an unreferenced file, reused by the next same upload.
+        """
+
+        digest = self.get_content_hash(content)
+        name = self.get_hashed_name(name, digest)
+        blob_model = self.get_blob_model()
+
+        with transaction.atomic(using=router.db_for_write(blob_model)):
+            blob, created = blob_model.objects.select_for_update().get_or_create(
+                name=name, defaults={"digest": digest, "size": content.size}
+            )
+            blob.reference_count += 1
+            blob.save(update_fields=["reference_count", "modified"])
+
+            if created or not self.exists(name):
+                self.write_new_file(name, content)
+
+        return name
+
+    def write_new_file(self, name, content):
+        """
+        Writes the content to a temporary file next to the name, then links it to
+        the name, which fails if the name exists. The concurrent uploads of the same
+        content do not overwrite each other and the partial files are never seen.
+        """
+
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        if self.directory_permissions_mode is not None:
+            old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+        fd, temporary_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                for chunk in content.chunks():
+                    file.write(chunk)
+
+            if self.file_permissions_mode is not None:
+                os.chmod(temporary_path, self.file_permissions_mode)
+
+            with suppress(FileExistsError):
+                # stored by a concurrent upload of the same content
+                os.link(temporary_path, full_path)
+        finally:
+            os.unlink(temporary_path)
+
+    def delete(self, name):
+        """
+        Overridden to release a reference of the name. The file is deleted once the
+        last reference is released, on the commit of the releasing transaction.
+        """
+
+        blob_model = self.get_blob_model()
+        using = router.db_for_write(blob_model)
+
+        with transaction.atomic(using=using):
+            blob = blob_model.objects.select_for_update().filter(name=name).first()
+
+            if blob and blob.reference_count > 0:
+                blob.reference_count -= 1
+                blob.save(update_fields=["reference_count", "modified"])
+
+                if blob.reference_count:
+                    return
+
+        transaction.on_commit(partial(self.purge, name), using=using)
+
+    def purge(self, name):
+        """Deletes the file & its blob, unless referenced again in the meantime."""
+
+        blob_model = self.get_blob_model()
+
+        with transaction.atomic(using=router.db_for_write(blob_model)):
+            blob = blob_model.objects.select_for_update().filter(name=name).first()
+            if blob and blob.reference_count:
+                return
+
+            super().delete(name)
+            if blob:
+                blob.delete()
+
+
+def get_content_addressed_storage():
+    """
+    Returns the storage for the app's file fields. Passed as a callable to the
+    field, so that the storage is not part of the migrations.
+    """
+
+    return content_addressed_storage
+
+
+content_addressed_storage = ContentAddressedStorage()
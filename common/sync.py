@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from common.config import SYNC_CONFIG
+
+SYNC_CURSOR_SALT = "common.sync"
+
+
+def create_sync_cursor(modified, pk) -> str:
+    """Returns the opaque continuation token for the (modified, id) keyset."""
+
+    return signing.dumps({"m": modified.isoformat(), "i": pk}, salt=SYNC_CURSOR_SALT)
+
+
+def read_sync_cursor(cursor):
+    """Returns the (modified, id) of the given token. Raises for invalid ones."""
+
+    try:
+        payload = signing.loads(cursor, salt=SYNC_CURSOR_SALT)
+        return parse_datetime(payload["m"]), payload["i"]
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+
+
+def get_changes(queryset, cursor=None, page_size=None):
+    """
+    Returns the objects of the queryset changed after the given cursor, including
+    the inactive (soft deleted) ones for the tombstones, in the `(modified, id)`
+    keyset order. Returns (objects, next cursor, has more).
+
+    The hard deleted objects are not tracked, deactivate instead of deleting
+    the synced objects. The changes are found by the `modified`, set by the
+    saves & the `BaseObjectManagerQuerySet` writes, the raw SQL must set it too.
+    """
+
+    page_size = min(
+        max(page_size or SYNC_CONFIG["page_size"], 1), SYNC_CONFIG["max_page_size"]
+    )
+    settled = timezone.now() - timedelta(seconds=SYNC_CONFIG["settle_seconds"])
+    queryset = queryset.filter(modified__lte=settled).order_by("modified", "pk")
+
+    # restricted with `.only()`, like the sparse fieldsets | keyset & tombstones
+    field_names, defer = queryset.query.deferred_loading
+    if field_names and not defer:
+        queryset = queryset.only(*field_names, "modified", "is_active")
+
+    if cursor:
+        modified, pk = read_sync_cursor(cursor)
+        queryset = queryset.filter(
+            Q(modified__gt=modified) | Q(modified=modified, pk__gt=pk)
+        )
+
+    objects = list(queryset[: page_size + 1])
+    has_more = len(objects) > page_size
+    objects = objects[:page_size]
+
+    if objects:
+        cursor = create_sync_cursor(objects[-1].modified, objects[-1].pk)
+
+    return objects, cursor, has_more
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+from django.test import SimpleTestCase
+
+from common.asgi import ChangeFeedApplication
+
+
+class FakeSubscription:
+    def __init__(self, models, filters):
+        self.models, self.filters = models, filters
+        self.queue = asyncio.Queue()
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class FakeHub:
+    def __init__(self):
+        self.subscriptions, self.unsubscribed = [], []
+
+    def subscribe(self, models, filters=None, owner_id=None):
+        self.subscriptions.append(FakeSubscription(models, filters))
+        return self.subscriptions[-1]
+
+    def unsubscribe(self, subscription):
+        self.unsubscribed.append(subscription)
+
+
+class ChangeFeedWebsocketTestCase(SimpleTestCase):
+    """The re-subscribe messages are validated, the invalid ones are answered."""
+
+    session = {"user_id": 1, "scope": "all", "version": 0, "expires": 2**40}
+
+    async def run_websocket(self, *texts):
+        hub, sent = FakeHub(), []
+        messages = [
+            {"type": "websocket.connect"},
+            *[{"type": "websocket.receive", "text": text} for text in texts],
+            {"type": "websocket.disconnect"},
+        ]
+
+        async def receive():
+            await asyncio.sleep(0)
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        await ChangeFeedApplication(hub=hub).handle_websocket(
+            receive, send, self.session, ["access.user"], {}
+        )
+        return hub, [json.loads(_["text"]) for _ in sent if "text" in _]
+
+    async def test_invalid_messages_keep_the_subscription(self):
+        hub, frames = await self.run_websocket(
+            "not json",
+            json.dumps(["access.user"]),
+            json.dumps({"models": "access.user"}),
+            json.dumps({"models": [1]}),
+            json.dumps({"filters": ["type"]}),
+            json.dumps({"filters": {"type": {"in": ["recruiter"]}}}),
+        )
+
+        self.assertEqual(len(frames), 6)
+        self.assertTrue(all(_["status"] == "error" for _ in frames))
+        # only the initial subscription, released on the disconnect
+        self.assertEqual(len(hub.subscriptions), 1)
+        self.assertEqual(hub.unsubscribed, hub.subscriptions)
+
+    async def test_valid_message_re_subscribes(self):
+        hub, frames = await self.run_websocket(
+            json.dumps({"models": ["access.user"], "filters": {"type": "recruiter"}})
+        )
+
+        self.assertEqual(frames, [])
+        self.assertEqual(len(hub.subscriptions), 2)
+        self.assertEqual(hub.subscriptions[1].filters, {"type": "recruiter"})
+        self.assertEqual(hub.unsubscribed, hub.subscriptions)
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from access.models import User
+from common.db_router import get_pin_cache_key
+
+
+class BatchAPIViewTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser("admin@example.com", None)
+        self.client.force_authenticate(self.user)
+
+    def post_batch(self, requests):
+        return self.client.post("/batch/", {"requests": requests}, format="json")
+
+    def test_reads_only_do_not_pin_to_primary(self):
+        # the consecutive reads run on the pool threads | no table reads, the
+        # in memory test database is locked by the test's transaction
+        response = self.post_batch(
+            [
+                {"method": "GET", "path": "/choices/"},
+                {"method": "GET", "path": "/choices/"},
+            ]
+        )
+
+        self.assertEqual(
+            [_["status_code"] for _ in response.json()["data"]], [200, 200]
+        )
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE_NAME, response.cookies)
+        self.assertIsNone(cache.get(get_pin_cache_key(self.user.pk)))
+
+    def test_write_pins_to_primary(self):
+        response = self.post_batch(
+            [
+                {
+                    "method": "POST",
+                    "path": "/user/create/",
+                    "body": {
+                        "email": "new@example.com",
+                        "first_name": "New",
+                        "last_name": "User",
+                        "phone_number": "",
+                    },
+                },
+                {"method": "GET", "path": "/user/list/"},
+            ]
+        )
+
+        self.assertEqual(
+            [_["status_code"] for _ in response.json()["data"]], [200, 200]
+        )
+        self.assertTrue(cache.get(get_pin_cache_key(self.user.pk)))
+
+    def test_failing_sub_request_returns_an_error_result(self):
+        response = self.post_batch(
+            [
+                {"method": "GET", "path": "/not-found/"},
+                {"method": "GET", "path": "/choices/"},
+            ]
+        )
+
+        self.assertEqual(
+            [_["status_code"] for _ in response.json()["data"]], [404, 200]
+        )
@@ -0,0 +1,134 @@
+"""
+The replica routing tests. The end to end ones need a replica alias, run them with
+`MYSQL_REPLICA_HOSTS=localhost`, the replica then mirrors the default test database.
+"""
+
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from access.models import User
+from common.db_router import (
+    ReplicaRouter,
+    get_pin_cache_key,
+    replica_health_checker,
+    reset_replica_routing,
+    use_replica_for_request,
+)
+from common.middleware import ReplicaRoutingMiddleware
+
+REPLICA = "replica_0"
+
+
+@override_settings(REPLICA_DATABASES=[REPLICA])
+@mock.patch.object(replica_health_checker, "is_healthy", return_value=True)
+class ReplicaRoutingTestCase(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+        self.user = User.objects.create_user("user@example.com", None)
+        self.addCleanup(reset_replica_routing)
+
+    def get_request(self, method="get", cookies=None):
+        request = getattr(self.factory, method)("/")
+        request.user = self.user
+        request.COOKIES.update(cookies or {})
+        return request
+
+    def test_safe_methods_read_from_a_replica(self, is_healthy):
+        self.assertEqual(use_replica_for_request(self.get_request()), REPLICA)
+        self.assertEqual(self.router.db_for_read(User), REPLICA)
+        self.assertEqual(self.router.db_for_write(User), DEFAULT_DB_ALIAS)
+
+    def test_writes_read_from_the_primary(self, is_healthy):
+        self.assertIsNone(use_replica_for_request(self.get_request("post")))
+        self.assertEqual(self.router.db_for_read(User), DEFAULT_DB_ALIAS)
+
+    def test_unhealthy_replicas_fall_back_to_the_primary(self, is_healthy):
+        is_healthy.return_value = False
+
+        self.assertIsNone(use_replica_for_request(self.get_request()))
+        self.assertEqual(self.router.db_for_read(User), DEFAULT_DB_ALIAS)
+
+    def test_pinned_to_primary_after_a_write(self, is_healthy):
+        middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+        response = middleware(self.get_request("post"))
+
+        self.assertIn(settings.REPLICA_PIN_COOKIE_NAME, response.cookies)
+        self.assertTrue(cache.get(get_pin_cache_key(self.user.pk)))
+        self.assertIsNone(use_replica_for_request(self.get_request()))
+
+        cache.clear()
+        cookies = {settings.REPLICA_PIN_COOKIE_NAME: "1"}
+        self.assertIsNone(use_replica_for_request(self.get_request(cookies=cookies)))
+
+    def test_failed_write_is_not_pinned(self, is_healthy):
+        middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse(status=400))
+
+        response = middleware(self.get_request("post"))
+
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE_NAME, response.cookies)
+        self.assertEqual(use_replica_for_request(self.get_request()), REPLICA)
+
+    def test_routing_is_reset_per_request(self, is_healthy):
+        routed = []
+
+        def get_response(request):
+            use_replica_for_request(request)
+            routed.append(self.router.db_for_read(User))
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(get_response)(self.get_request())
+
+        self.assertEqual(routed, [REPLICA])
+        self.assertEqual(self.router.db_for_read(User), DEFAULT_DB_ALIAS)
+
+    def test_replicas_are_not_migrated(self, is_healthy):
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, "access"))
+        self.assertFalse(self.router.allow_migrate(REPLICA, "access"))
+
+
+@skipUnless(REPLICA in settings.DATABASES, "No replica, see the module docstring.")
+@mock.patch.object(replica_health_checker, "is_healthy", return_value=True)
+class ReplicaRoutingViewTestCase(TransactionTestCase):
+    databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser("admin@example.com", None)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_read_from_the_replica(self, is_healthy):
+        with CaptureQueriesContext(connections[REPLICA]) as replica_queries:
+            response = self.client.get("/user/list/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(replica_queries.captured_queries)
+
+    def test_list_is_read_from_the_primary_after_a_write(self, is_healthy):
+        response = self.client.post(
+            "/user/create/",
+            {
+                "email": "new@example.com",
+                "first_name": "New",
+                "last_name": "User",
+                "phone_number": "",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        with CaptureQueriesContext(connections[REPLICA]) as replica_queries:
+            response = self.client.get("/user/list/")
+
+        self.assertEqual(response.json()["data"]["count"], 2)
+        self.assertFalse(replica_queries.captured_queries)
@@ -0,0 +1,79 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from access.models import User, UserImport
+from common.authentication import _user_local_cache
+from common.policies import policy_engine
+
+
+class ProtectedMediaTestCase(TestCase):
+    """The files are served on the policy of the rows owning them."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.enterClassContext(
+            override_settings(MEDIA_ROOT=cls.media_root, MEDIA_ACCEL_REDIRECT=None)
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        # the versions restart with the cleared cache
+        policy_engine._local_cache.clear()
+        _user_local_cache.clear()
+        self.owner = User.objects.create_user(
+            "owner@example.com", None, type="recruiter"
+        )
+        self.other = User.objects.create_user(
+            "other@example.com", None, type="recruiter"
+        )
+        self.user_import = UserImport.objects.create(
+            file=ContentFile(b"email\n", name="users.csv"), created_by=self.owner
+        )
+        self.url = f"/media/{self.user_import.file.name}"
+
+    def get(self, user, url=None, **headers):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(url or self.url, headers=headers)
+
+    def test_owner_only(self):
+        response = self.get(self.owner)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"email\n")
+
+        self.assertEqual(self.get(self.other).status_code, 403)
+        superuser = User.objects.create_superuser("admin@example.com", None)
+        self.assertEqual(self.get(superuser).status_code, 200)
+
+    def test_shared_file_served_to_any_owner(self):
+        UserImport.objects.create(
+            file=ContentFile(b"email\n", name="users.csv"), created_by=self.other
+        )
+        self.assertEqual(self.get(self.other).status_code, 200)
+
+    def test_file_of_no_row(self):
+        path = self.user_import.file.name
+        UserImport.objects.filter(pk=self.user_import.pk).update(file="")
+
+        self.assertEqual(self.get(self.owner, f"/media/{path}").status_code, 404)
+        self.assertEqual(
+            self.get(self.owner, "/media/imports/missing.csv").status_code, 404
+        )
+
+    def test_unsatisfiable_range(self):
+        response = self.get(self.owner, Range="bytes=100-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */6")
+        self.assertNotEqual(response["Content-Type"], "text/csv")
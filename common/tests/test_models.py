@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+from django.db.models.signals import post_save, pre_save
+from django.test import TestCase
+from django.utils import timezone
+
+from access.models import User
+from common.models import StoredBlob
+
+
+class BaseModelDirtyFieldsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            "user@example.com", "password", first_name="A", last_name="B"
+        )
+
+    def get_row(self, *fields):
+        return User.objects.values_list(*fields).get(pk=self.user.pk)
+
+    def test_save_writes_only_the_changed_fields(self):
+        user = User.objects.get(pk=self.user.pk)
+        User.objects.filter(pk=user.pk).update(last_name="Other")
+
+        user.first_name = "C"
+        user.save()
+
+        self.assertEqual(self.get_row("first_name", "last_name"), ("C", "Other"))
+
+    def test_update_fields_keeps_the_other_changes_pending(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name, user.last_name = "C", "D"
+
+        user.save(update_fields=["first_name"])
+        self.assertEqual(self.get_row("first_name", "last_name"), ("C", "B"))
+
+        user.save()
+        self.assertEqual(self.get_row("first_name", "last_name"), ("C", "D"))
+
+    def test_refresh_from_db_snapshots_the_reloaded_values(self):
+        user = User.objects.get(pk=self.user.pk)
+        User.objects.filter(pk=user.pk).update(first_name="Z")
+
+        user.refresh_from_db()
+        user.first_name = "A"
+        user.save()
+
+        self.assertEqual(self.get_row("first_name"), ("A",))
+
+    def test_deferred_field_loaded_is_not_dirty(self):
+        user = User.objects.only("pk").get(pk=self.user.pk)
+        user.email  # noqa | loads the deferred field
+
+        self.assertEqual(user.get_dirty_fields(), [])
+
+    def test_noop_save_sends_no_signals(self):
+        user = User.objects.get(pk=self.user.pk)
+        received = []
+
+        def receiver(signal, **kwargs):
+            received.append(signal)
+
+        pre_save.connect(receiver, sender=User)
+        post_save.connect(receiver, sender=User)
+        try:
+            user.save()
+        finally:
+            pre_save.disconnect(receiver, sender=User)
+            post_save.disconnect(receiver, sender=User)
+
+        self.assertEqual(received, [])
+
+
+class BaseObjectManagerModifiedTestCase(TestCase):
+    """The queryset writes set the `modified`, the delta sync goes by it."""
+
+    def setUp(self):
+        self.blob = StoredBlob.objects.create(name="a", digest="a")
+        StoredBlob.objects.filter(pk=self.blob.pk).update(
+            modified=timezone.now() - timedelta(days=1)
+        )
+        self.blob.refresh_from_db()
+
+    def assert_modified(self):
+        before = self.blob.modified
+        self.blob.refresh_from_db()
+        self.assertGreater(self.blob.modified, before)
+
+    def test_update(self):
+        StoredBlob.objects.filter(pk=self.blob.pk).update(size=1)
+        self.assert_modified()
+
+    def test_bulk_update(self):
+        self.blob.size = 1
+        StoredBlob.objects.bulk_update([self.blob], ["size"])
+        self.assert_modified()
+
+    def test_bulk_upsert(self):
+        StoredBlob.objects.bulk_upsert(
+            [StoredBlob(name="a", digest="a", size=1)],
+            unique_fields=["name"],
+            update_fields=["size"],
+        )
+        self.assert_modified()
+        self.assertEqual(self.blob.size, 1)
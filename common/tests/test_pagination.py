@@ -0,0 +1,38 @@
+from unittest import mock
+
+from django.core.paginator import EmptyPage
+from django.test import TestCase
+
+from access.models import User
+from common.pagination import EstimatedCountPaginator
+
+
+@mock.patch("common.pagination.ESTIMATED_COUNT_THRESHOLD", 3)
+class EstimatedCountPaginatorTestCase(TestCase):
+    """The capped counts are reported as estimates, the pages past them served."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for index in range(7):
+            User.objects.create_user(f"user{index}@example.com", None)
+
+    def get_paginator(self, queryset):
+        return EstimatedCountPaginator(queryset.order_by("pk"), per_page=2)
+
+    def test_exact_count_under_the_threshold(self):
+        paginator = self.get_paginator(User.objects.filter(pk__lte=3))
+
+        self.assertEqual(paginator.count, 3)
+        self.assertFalse(paginator.count_is_estimate)
+        with self.assertRaises(EmptyPage):
+            paginator.page(3)
+
+    def test_capped_count_serves_the_pages_past_it(self):
+        paginator = self.get_paginator(User.objects.filter(is_active=True))
+
+        self.assertEqual(paginator.count, 3)
+        self.assertTrue(paginator.count_is_estimate)
+        self.assertEqual(len(paginator.page(2).object_list), 2)
+        self.assertEqual(len(paginator.page(4).object_list), 1)
+        with self.assertRaises(EmptyPage):
+            paginator.page(5)
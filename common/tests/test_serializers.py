@@ -0,0 +1,140 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from access.models import User, UserImport
+from access.serializers import UserListModelSerializer
+from common.serializers import AppReadOnlyModelSerializer
+
+
+class UserRowSerializer(AppReadOnlyModelSerializer):
+    class Meta(AppReadOnlyModelSerializer.Meta):
+        model = User
+        fields = [
+            "id",
+            "uuid",
+            "email",
+            "first_name",
+            "phone_number",
+            "type",
+            "is_active",
+            "created",
+            "last_login",
+        ]
+
+
+class UserImportRowSerializer(AppReadOnlyModelSerializer):
+    class Meta(AppReadOnlyModelSerializer.Meta):
+        model = UserImport
+        fields = [
+            "id",
+            "file",
+            "type",
+            "status",
+            "created_by",
+            "total_rows",
+            "errors",
+            "finished",
+        ]
+
+
+class RowSerializerParityTestCase(TestCase):
+    """The `values_list` fast path matches the `to_representation` exactly."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    def setUp(self):
+        self.recruiter = User.objects.create_user(
+            "recruiter@example.com",
+            None,
+            first_name="Recruiter",
+            phone_number="+14155552671",
+            type="recruiter",
+        )
+        # the nulls & blanks
+        self.user = User.objects.create_user("user@example.com", None)
+        UserImport.objects.create(
+            file=ContentFile(b"email\n", name="users.csv"),
+            type="job_seeker",
+            created_by=self.recruiter,
+            total_rows=1,
+            errors=[{"row": 2, "errors": {"email": ["Invalid."]}}],
+        )
+        UserImport.objects.create(file="")
+
+    def assert_parity(self, serializer, queryset):
+        columns, serialize_row = serializer.get_row_serializer()
+        columnar_columns, serialize_row_values = serializer.get_row_serializer(
+            columnar=True
+        )
+        field_names = list(serializer.fields)
+        expected = [
+            dict(serializer.to_representation(_)) for _ in queryset.order_by("pk")
+        ]
+        rows = list(queryset.order_by("pk").values_list(*columns))
+
+        self.assertEqual([serialize_row(_) for _ in rows], expected)
+        self.assertEqual(columnar_columns, columns)
+        self.assertEqual(
+            [serialize_row_values(_) for _ in rows],
+            [[_[k] for k in field_names] for _ in expected],
+        )
+
+    def test_columns_choices_phone_numbers_and_nulls(self):
+        self.assert_parity(UserRowSerializer(), User.objects.all())
+
+    def test_files_relations_and_json(self):
+        self.assert_parity(UserImportRowSerializer(), UserImport.objects.all())
+
+    def test_sparse_fields(self):
+        serializer = UserRowSerializer()
+        for field_name in list(serializer.fields):
+            if field_name not in ["id", "phone_number", "type"]:
+                serializer.fields.pop(field_name)
+
+        self.assert_parity(serializer, User.objects.all())
+
+    def test_method_fields_fall_back(self):
+        class MethodSerializer(UserRowSerializer):
+            class Meta(UserRowSerializer.Meta):
+                fields = ["id", "full_name"]
+
+            full_name = serializers.SerializerMethodField()
+
+            def get_full_name(self, obj):
+                return obj.get_full_name()
+
+        self.assertIsNone(MethodSerializer().get_row_serializer())
+
+    def test_list_view_matches_the_serializer(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("a@example.com", None))
+        queryset = User.objects.order_by("pk")
+
+        for query, fields in [
+            ("", None),
+            ("&fields=id,phone_number,type", ["id", "phone_number", "type"]),
+        ]:
+            response = client.get(f"/user/list/?ordering=id&page_size=100{query}")
+            expected = [
+                {
+                    k: v
+                    for k, v in UserListModelSerializer(_).data.items()
+                    if fields is None or k in fields
+                }
+                for _ in queryset
+            ]
+            self.assertEqual(response.json()["data"]["results"], expected)
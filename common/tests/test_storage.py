@@ -0,0 +1,98 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from access.models import UserImport
+from common.models import StoredBlob
+from common.storage import content_addressed_storage
+
+
+class ContentAddressedStorageTestCase(TestCase):
+    """The reference counts follow the rows, the file goes with the last one."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.enterClassContext(override_settings(MEDIA_ROOT=cls.media_root))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+    def create_import(self, content=b"email\n"):
+        with self.captureOnCommitCallbacks(execute=True):
+            return UserImport.objects.create(
+                file=ContentFile(content, name="users.csv")
+            )
+
+    def get_reference_count(self, name):
+        blob = StoredBlob.objects.get_or_none(name=name)
+        return blob.reference_count if blob else 0
+
+    def test_same_content_is_stored_once(self):
+        first, second = self.create_import(), self.create_import()
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertTrue(first.file.name.startswith("imports/"))
+        self.assertEqual(StoredBlob.objects.count(), 1)
+        self.assertEqual(self.get_reference_count(first.file.name), 2)
+
+    def test_rolled_back_save_is_not_counted(self):
+        name = self.create_import().file.name
+
+        with self.assertRaises(RuntimeError):
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    UserImport.objects.create(
+                        file=ContentFile(b"email\n", name="users.csv")
+                    )
+                    raise RuntimeError
+
+        self.assertEqual(self.get_reference_count(name), 1)
+
+    def test_delete_releases_the_reference(self):
+        first, second = self.create_import(), self.create_import()
+        name = first.file.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(self.get_reference_count(name), 1)
+        self.assertTrue(content_addressed_storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserImport.objects.filter(pk=second.pk).delete()
+        self.assertFalse(StoredBlob.objects.filter(name=name).exists())
+        self.assertFalse(content_addressed_storage.exists(name))
+
+    def test_replaced_file_is_released(self):
+        user_import = UserImport.objects.get(pk=self.create_import().pk)
+        previous_name = user_import.file.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user_import.file = ContentFile(b"email,type\n", name="users.csv")
+            user_import.save()
+
+        self.assertNotEqual(user_import.file.name, previous_name)
+        self.assertEqual(self.get_reference_count(user_import.file.name), 1)
+        self.assertFalse(content_addressed_storage.exists(previous_name))
+
+        # cleared
+        with self.captureOnCommitCallbacks(execute=True):
+            user_import.file = ""
+            user_import.save()
+
+        self.assertEqual(StoredBlob.objects.count(), 0)
+
+    def test_released_then_uploaded_again(self):
+        name = self.create_import().file.name
+        with self.captureOnCommitCallbacks(execute=True):
+            UserImport.objects.all().delete()
+
+        self.assertEqual(self.create_import().file.name, name)
+        self.assertEqual(self.get_reference_count(name), 1)
+        self.assertTrue(content_addressed_storage.exists(name))
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.urls import path
+
+from common.views import (
+    BatchAPIView,
+    ChangeFeedTicketAPIView,
+    ChoicesAPIView,
+    ProtectedMediaAPIView,
+)
+
+urlpatterns = [
+    path("batch/", BatchAPIView.as_view()),
+    path("changes/ticket/", ChangeFeedTicketAPIView.as_view()),
+    path("choices/", ChoicesAPIView.as_view()),
+    path(
+        f"{settings.MEDIA_URL.strip('/')}/<path:path>", ProtectedMediaAPIView.as_view()
+    ),
+]
@@ -0,0 +1,177 @@
+import logging
+import time
+
+from django.apps import apps
+from django.db import connections
+
+from common.config import BINARY_UUID_MIGRATION_CONFIG
+from common.model_fields import AppBinaryUUIDField
+
+logger = logging.getLogger(__name__)
+
+STEP_PREPARE = "prepare"
+STEP_BACKFILL = "backfill"
+STEP_SWAP = "swap"
+STEP_CLEANUP = "cleanup"
+STEPS = [STEP_PREPARE, STEP_BACKFILL, STEP_SWAP, STEP_CLEANUP]
+
+
+def get_binary_uuid_fields(labels=None) -> list:
+    """Returns the (model, field) of the `AppBinaryUUIDField`s, of all the models."""
+
+    models = [apps.get_model(_) for _ in labels] if labels else apps.get_models()
+    return [
+        (model, field)
+        for model in models
+        if not model._meta.proxy and model._meta.managed
+        for field in model._meta.concrete_fields
+        if isinstance(field, AppBinaryUUIDField)
+    ]
+
+
+class BinaryUUIDMigration:
+    """
+    Online conversion of an existing MySQL `char(32)` uuid column to the
+    `binary(16)` of the `AppBinaryUUIDField`, without locking the table:
+        > prepare: adds the `<column>_bin` shadow column, filled by the triggers
+          for the rows written from now on
+        > backfill: fills the shadow column of the existing rows, in the pk
+          ranges of the `chunk_size`, pausing between the chunks. Then makes it
+          `NOT NULL` with its unique index (& the `char(32)` column nullable), an
+          online rebuild of the table (`LOCK=NONE`), the writes go on
+        > swap: drops the triggers, renames the shadow column & its index to the
+          column (the `char(32)` one is kept as `<column>_char`)
+        > cleanup: drops the `<column>_char` column
+
+    The prepare & the backfill run while the previous release is serving, online.
+
+    The swap needs a read-only window, it is not online: the previous release reads
+    & writes the column as `char(32)`, this release as `binary(16)`, they can not
+    serve at the same time. Stop the writes (maintenance or read-only mode, no
+    workers or processes of the previous release left), run the swap, then start
+    the processes of this release. The swap only renames, a metadata change that
+    does not depend on the size of the table. The cleanup runs any time after.
+    """
+
+    def __init__(self, model, field, using="default", chunk_size=None, sleep=None):
+        self.model = model
+        self.field = field
+        self.connection = connections[using]
+        self.chunk_size = chunk_size or BINARY_UUID_MIGRATION_CONFIG["chunk_size"]
+        self.sleep = BINARY_UUID_MIGRATION_CONFIG["sleep_seconds"]
+        self.sleep = self.sleep if sleep is None else sleep
+
+        quote = self.connection.ops.quote_name
+        self.table = quote(model._meta.db_table)
+        self.pk = quote(model._meta.pk.column)
+        self.column = quote(field.column)
+        self.shadow_column = quote(f"{field.column}_bin")
+        self.old_column = quote(f"{field.column}_char")
+        self.triggers = [
+            quote(f"{model._meta.db_table}_{field.column}_bin_{_}"[-64:])
+            for _ in ["insert", "update"]
+        ]
+        self.index_name = f"{model._meta.db_table}_{field.column}_uniq"[-64:]
+        self.shadow_index_name = f"{model._meta.db_table}_{field.column}_bin_uniq"[-64:]
+        self.index = quote(self.index_name)
+        self.shadow_index = quote(self.shadow_index_name)
+
+    def __str__(self):
+        return f"{self.model._meta.label}.{self.field.name}"
+
+    def get_column_types(self) -> dict:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_schema = DATABASE() AND table_name = %s",
+                [self.model._meta.db_table],
+            )
+            return {name.lower(): data_type.lower() for name, data_type in cursor}
+
+    def get_index_names(self) -> set:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT DISTINCT index_name FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = %s",
+                [self.model._meta.db_table],
+            )
+            return {name.lower() for (name,) in cursor}
+
+    def execute(self, sql, params=None) -> int:
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def prepare(self):
+        if f"{self.field.column}_bin" in self.get_column_types():
+            return
+
+        self.execute(
+            f"ALTER TABLE {self.table} ADD COLUMN {self.shadow_column} BINARY(16) NULL, "
+            "ALGORITHM=INPLACE, LOCK=NONE"
+        )
+        for trigger, event in zip(self.triggers, ["INSERT", "UPDATE"]):
+            self.execute(
+                f"CREATE TRIGGER {trigger} BEFORE {event} ON {self.table} FOR EACH "
+                f"ROW SET NEW.{self.shadow_column} = UNHEX(NEW.{self.column})"
+            )
+
+    def backfill(self):
+        if self.shadow_index_name.lower() in self.get_index_names():
+            return
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"SELECT MIN({self.pk}), MAX({self.pk}) FROM {self.table}")
+            start, end = cursor.fetchone()
+
+        for low in range(start or 0, (end or -1) + 1, self.chunk_size):
+            updated = self.execute(
+                f"UPDATE {self.table} SET {self.shadow_column} = UNHEX({self.column}) "
+                f"WHERE {self.pk} >= %s AND {self.pk} < %s "
+                f"AND {self.shadow_column} IS NULL",
+                [low, low + self.chunk_size],
+            )
+            logger.info(f"{self}: backfilled {updated} rows from the pk {low}.")
+            time.sleep(self.sleep)
+
+        # online rebuild | the rows written meanwhile are filled by the triggers
+        self.execute(
+            f"ALTER TABLE {self.table} "
+            f"MODIFY COLUMN {self.column} CHAR(32) NULL, "
+            f"MODIFY COLUMN {self.shadow_column} BINARY(16) NOT NULL, "
+            f"ADD UNIQUE INDEX {self.shadow_index} ({self.shadow_column}), "
+            "ALGORITHM=INPLACE, LOCK=NONE"
+        )
+
+    def swap(self):
+        column_types = self.get_column_types()
+        if column_types.get(self.field.column) == "binary":
+            return
+
+        if self.shadow_index_name.lower() not in self.get_index_names():
+            raise ValueError(f"{self}: not backfilled, run the backfill first.")
+
+        for trigger in self.triggers:
+            self.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+        # renames only | the types, the nullability & the index are already built
+        self.execute(
+            f"ALTER TABLE {self.table} "
+            f"CHANGE COLUMN {self.column} {self.old_column} CHAR(32) NULL, "
+            f"CHANGE COLUMN {self.shadow_column} {self.column} BINARY(16) NOT NULL, "
+            f"RENAME INDEX {self.shadow_index} TO {self.index}, "
+            "ALGORITHM=INPLACE, LOCK=NONE"
+        )
+
+    def cleanup(self):
+        if f"{self.field.column}_char" not in self.get_column_types():
+            return
+
+        self.execute(
+            f"ALTER TABLE {self.table} DROP COLUMN {self.old_column}, "
+            "ALGORITHM=INPLACE, LOCK=NONE"
+        )
+
+    def run(self, step):
+        logger.info(f"{self}: {step}.")
+        getattr(self, step)()
@@ -27,6 +27,71 @@ class MaxSizeValidator(BaseValidator):
         return len(x)
 
 
+@deconstructible
+class ImageHeaderValidator:
+    """
+    Validates the image format & dimensions by reading only the image header.
+    The limits are checked before the image is decoded, so large or hostile
+    files (decompression bombs) cannot tie up the worker.
+    """
+
+    messages = {
+        "invalid_image": _(
+            "Upload a valid image. The file you uploaded was either not an image or a corrupted image."
+        ),
+        "invalid_format": _("Images of type %(format)s are not allowed."),
+        "max_pixels": _("Ensure this image has not more than %(limit)d pixels."),
+        "max_width": _("Ensure this image is not wider than %(limit)d pixels."),
+        "max_height": _("Ensure this image is not taller than %(limit)d pixels."),
+    }
+
+    def __init__(
+        self, max_pixels=None, max_width=None, max_height=None, allowed_formats=None
+    ):
+        self.max_pixels = max_pixels
+        self.max_width = max_width
+        self.max_height = max_height
+        self.allowed_formats = allowed_formats
+
+    def __call__(self, value):
+        from common.images import read_image_header
+
+        try:
+            image_format, width, height = read_image_header(value)
+        except Exception as exc:  # noqa
+            raise exceptions.ValidationError(
+                self.messages["invalid_image"], code="invalid_image"
+            ) from exc
+
+        if self.allowed_formats and image_format not in self.allowed_formats:
+            raise exceptions.ValidationError(
+                self.messages["invalid_format"],
+                code="invalid_format",
+                params={"format": image_format},
+            )
+
+        for code, limit, actual in [
+            ("max_width", self.max_width, width),
+            ("max_height", self.max_height, height),
+            ("max_pixels", self.max_pixels, width * height),
+        ]:
+            if limit and actual > limit:
+                raise exceptions.ValidationError(
+                    self.messages[code], code=code, params={"limit": limit}
+                )
+
+        return image_format
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, self.__class__)
+            and self.max_pixels == other.max_pixels
+            and self.max_width == other.max_width
+            and self.max_height == other.max_height
+            and self.allowed_formats == other.allowed_formats
+        )
+
+
 def validate_rating(value):
     """validate the course rating."""
 
@@ -6,6 +6,9 @@ from .base import (
     SortingMixin,
     FavouriteFilterMixin,
     NonAuthenticatedAPIMixin,
+    SparseFieldsetMixin,
+    RelatedLookupsMixin,
+    ValuesListMixin,
 )
 from .generic import (
     AppModelCreateAPIViewSet,
@@ -15,3 +18,7 @@ from .generic import (
     AppModelUpdateAPIViewSet,
     get_upload_api_view,
 )
+from .batch import BatchAPIView
+from .change_feed import ChangeFeedTicketAPIView
+from .choices import ChoicesAPIView
+from .media import ProtectedMediaAPIView
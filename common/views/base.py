@@ -1,15 +1,21 @@
 import contextlib
 from contextlib import suppress
 
+from django.core.exceptions import FieldDoesNotExist
 from rest_framework import permissions, status
 from rest_framework.exceptions import MethodNotAllowed, NotFound, ValidationError
 from rest_framework.generics import CreateAPIView, get_object_or_404
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.status import is_success
 from rest_framework.views import APIView
 
 from common.config import API_RESPONSE_ACTION_CODES
+from common.db_router import use_replica_for_request
+from common.jobs import enqueue
 from common.permissions import PolicyPermission
+from common.prefetching import optimize_queryset
+from common.renderers import ColumnarJSONRenderer
 
 
 class NonAuthenticatedAPIMixin:
@@ -28,6 +34,15 @@ class AppViewMixin:
     """
 
     get_object_model = None
+    use_read_replica = False  # safe methods are read from a replica
+
+    def initial(self, request, *args, **kwargs):
+        """Overridden to route the reads to a replica, once the user is known."""
+
+        super().initial(request, *args, **kwargs)
+
+        if self.use_read_replica:
+            use_replica_for_request(request)
 
     def get_request(self):
         """Returns the request."""
@@ -180,6 +195,7 @@ class AppAPIView(AppViewMixin, APIView):
     get_object_model = None
     serializer_class = None
     policy_slug = None
+    policy_owner_field = "user"  # for the "own" policy scope
     permission_classes = [PolicyPermission]
 
     def get_valid_serializer(self, instance=None):
@@ -220,14 +236,25 @@ class AppAPIView(AppViewMixin, APIView):
 
 
 class AppCreateAPIView(AppViewMixin, CreateAPIView):
-    """App's version on the `CreateAPIView`, implements custom handlers."""
+    """
+    App's version on the `CreateAPIView`, implements custom handlers.
+
+    The slow side effects (emails, third party calls, ...) should not be done in
+    the `perform_post_create`, set the `post_create_job` to a registered job
+    instead. It is called with the instance's pk by a worker, after the commit.
+    """
+
+    post_create_job = None  # see `common.jobs`
 
     def perform_create(self, serializer):
-        """Overridden to call the post create handler."""
+        """Overridden to call the post create handler & enqueue the job."""
 
         instance = serializer.save()
         self.perform_post_create(instance=instance)
 
+        if self.post_create_job:
+            enqueue(self.post_create_job, args=[instance.pk])
+
     def perform_post_create(self, instance):
         """Called after `perform_create`. Handle custom logic here."""
 
@@ -277,6 +304,197 @@ class SortingMixin:
         return options
 
 
+class SparseFieldsetMixin:
+    """
+    Sparse fieldsets for the read views, with the query params:
+        > ?fields=id,email -> only these fields.
+        > ?omit=phone_number -> all the fields except these.
+
+    The fields are validated against the serializer's `Meta.fields`. The
+    serializer is trimmed and the selection is pushed down to the queryset
+    with `.only()`, so the unused columns are neither loaded nor serialized.
+    """
+
+    fields_query_param = "fields"
+    omit_query_param = "omit"
+
+    def get_serializer_field_names(self):
+        """Returns the field names that can be selected."""
+
+        serializer_class = self.get_serializer_class()
+        meta_fields = getattr(serializer_class.Meta, "fields", None)
+
+        if isinstance(meta_fields, (list, tuple)):
+            return list(meta_fields)
+
+        return list(serializer_class().fields)
+
+    def get_sparse_field_names(self) -> list | None:
+        """Returns the selected field names. None if no selection is requested."""
+
+        if hasattr(self, "_sparse_field_names"):
+            return self._sparse_field_names
+
+        query_params = self.request.query_params
+        requested, omitted = [
+            [_.strip() for _ in query_params.get(param, "").split(",") if _.strip()]
+            for param in [self.fields_query_param, self.omit_query_param]
+        ]
+
+        field_names = None
+        if requested or omitted:
+            allowed = self.get_serializer_field_names()
+            if invalid := [_ for _ in [*requested, *omitted] if _ not in allowed]:
+                raise ValidationError(
+                    {self.fields_query_param: f"Invalid fields: {', '.join(invalid)}."}
+                )
+
+            field_names = [
+                _
+                for _ in allowed
+                if (not requested or _ in requested) and _ not in omitted
+            ]
+
+        self._sparse_field_names = field_names
+        return field_names
+
+    def get_sparse_columns(self, field_names) -> list | None:
+        """
+        Returns the model fields to be loaded for the selected serializer fields.
+        None if any field's source cannot be mapped to the model, like the method
+        fields, then the queryset is not restricted.
+        """
+
+        model = self.get_serializer_class().Meta.model
+        serializer_fields = self.get_serializer_class()().fields
+        columns = [model._meta.pk.name]
+
+        # read by the object permission, for the "own" policy scope
+        owner_field = getattr(self, "policy_owner_field", "pk")
+        if getattr(self, "policy_slug", None) and owner_field != "pk":
+            with suppress(FieldDoesNotExist):
+                columns.append(model._meta.get_field(owner_field).name)
+
+        for field_name in field_names:
+            source_attrs = serializer_fields[field_name].source_attrs
+            if not source_attrs:
+                return None  # source="*"
+
+            try:
+                model_field = model._meta.get_field(source_attrs[0])
+            except FieldDoesNotExist:
+                return None  # properties & methods
+
+            if not model_field.concrete:
+                return None
+
+            columns.append(model_field.name)
+
+        return columns
+
+    def get_serializer(self, *args, **kwargs):
+        """Overridden to trim the serializer to the selected fields."""
+
+        serializer = super().get_serializer(*args, **kwargs)
+
+        if (field_names := self.get_sparse_field_names()) is not None:
+            fields = getattr(serializer, "child", serializer).fields
+            for field_name in list(fields):
+                if field_name not in field_names:
+                    fields.pop(field_name)
+
+        return serializer
+
+    def get_queryset(self):
+        """Overridden to load only the columns of the selected fields."""
+
+        queryset = super().get_queryset()
+
+        if (field_names := self.get_sparse_field_names()) is not None and (
+            columns := self.get_sparse_columns(field_names)
+        ):
+            queryset = queryset.only(*columns)
+
+        return queryset
+
+
+class RelatedLookupsMixin:
+    """
+    Applies the `select_related` & `prefetch_related` inferred from the serializer
+    (see `common.prefetching`) on the queryset, only for the selected fields when
+    used with the `SparseFieldsetMixin`. Avoids the N+1 queries on the relations.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        field_names = None
+        if hasattr(self, "get_sparse_field_names"):
+            field_names = self.get_sparse_field_names()
+
+        return optimize_queryset(queryset, self.get_serializer_class(), field_names)
+
+
+class ValuesListMixin:
+    """
+    Fast path for the lists. If the serializer supports it (see the
+    `AppReadOnlyModelSerializer.get_row_serializer`), the page is fetched with
+    `values_list` and serialized from the rows, no model instances are built.
+    Falls back to the `ListModelMixin.list` otherwise.
+
+    With the `?format=columnar` (see `ColumnarJSONRenderer`), the results are sent
+    as {"columns": [...], "rows": [[...], ...]}, the keys are not repeated per row.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer]
+
+    def is_columnar(self) -> bool:
+        renderer = getattr(self.request, "accepted_renderer", None)
+        return isinstance(renderer, ColumnarJSONRenderer)
+
+    @staticmethod
+    def get_columnar_results(field_names, rows) -> dict:
+        return {"columns": field_names, "rows": rows}
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        field_names = [_.field_name for _ in serializer._readable_fields]
+        columnar = self.is_columnar()
+
+        row_serializer = None
+        if hasattr(serializer, "get_row_serializer"):
+            row_serializer = serializer.get_row_serializer(columnar=columnar)
+
+        if row_serializer is None:
+            response = super().list(request, *args, **kwargs)
+            if columnar:
+                paginated = isinstance(response.data, dict)
+                results = response.data["results"] if paginated else response.data
+                results = self.get_columnar_results(
+                    field_names, [[_[k] for k in field_names] for _ in results]
+                )
+                if paginated:
+                    response.data["results"] = results
+                else:
+                    response.data = results
+
+            return response
+
+        columns, serialize_row = row_serializer
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.prefetch_related(None).values_list(*columns)
+
+        page = self.paginate_queryset(queryset)
+        rows = [serialize_row(_) for _ in (queryset if page is None else page)]
+        if columnar:
+            rows = self.get_columnar_results(field_names, rows)
+
+        if page is not None:
+            return self.get_paginated_response(rows)
+
+        return Response(rows)
+
+
 class LoggedInUserMixin:
     """Common mixin to filter the queryset based on logged-in user."""
 
@@ -0,0 +1,25 @@
+from common.batching import run_batch
+from common.serializers import BatchRequestSerializer
+from common.views.base import AppAPIView
+
+
+class BatchAPIView(AppAPIView):
+    """
+    Runs many API calls in a single request, like the calls on the app's boot:
+        {"requests": [{"method": "GET", "path": "/user/list/?page=2"}, ...]}
+
+    Sends out the [{status_code, body}] in the order of the requests, the body is
+    the response of the view. The calls are dispatched in the process, with the
+    batch's user. See `common.batching`.
+    """
+
+    serializer_class = BatchRequestSerializer
+    batchable = False  # no nested batches
+    # pinned by the `run_batch` after a write, the batches of reads are not
+    pin_to_primary_after_write = False
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_valid_serializer()
+        return self.send_response(
+            data=run_batch(request, serializer.validated_data["requests"])
+        )
@@ -0,0 +1,17 @@
+from common.asgi import CHANGE_FEED_POLICY, issue_change_feed_ticket
+from common.views.base import AppAPIView
+
+
+class ChangeFeedTicketAPIView(AppAPIView):
+    """
+    Returns a short lived ticket to open the live change feed with, instead of the
+    access token in the url. See `common.asgi`.
+    """
+
+    policy_slug = CHANGE_FEED_POLICY
+
+    def post(self, request, *args, **kwargs):
+        access_payload = request.auth if isinstance(request.auth, dict) else None
+        return self.send_response(
+            data=issue_change_feed_ticket(request.user, access_payload)
+        )
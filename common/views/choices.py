@@ -0,0 +1,37 @@
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from common.choices import choice_registry
+from common.config import CHOICES_CACHE_MAX_AGE
+from common.views.base import AppAPIView, NonAuthenticatedAPIMixin
+
+
+class ChoicesAPIView(NonAuthenticatedAPIMixin, AppAPIView):
+    """
+    Sends all the registered choices (see `ChoiceRegistry`) in one response, so
+    the front-end can fetch all the dropdown options once per deploy.
+
+    Requested with `?version=<version>` matching the current version, the
+    response is cached for `CHOICES_CACHE_MAX_AGE`. Otherwise the client has to
+    revalidate with the `ETag` (the version).
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Returns the choices along with the version."""
+
+        version = choice_registry.version
+        etag = f'"{version}"'
+
+        if not (response := get_conditional_response(request, etag=etag)):
+            response = self.send_response(
+                data={"version": version, "choices": choice_registry.get_all_options()}
+            )
+
+        if request.query_params.get("version") == version:
+            patch_cache_control(
+                response, public=True, max_age=CHOICES_CACHE_MAX_AGE, immutable=True
+            )
+        else:
+            patch_cache_control(response, public=True, no_cache=True)
+
+        response["ETag"] = etag
+        return response
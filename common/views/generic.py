@@ -3,6 +3,7 @@ import logging
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, parsers
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
@@ -12,11 +13,21 @@ from rest_framework.mixins import (
 )
 from rest_framework.viewsets import GenericViewSet
 
+from common.config import MULTI_GET_CONFIG
+from common.facets import get_cached_facet_counts
+from common.filters import PolicyFilterBackend
 from common.helpers import custom_capitalize
 from common.pagination import BasePagination
 from common.permissions import PolicyPermission
 from common.serializers import AppModelSerializer
-from common.views.base import AppCreateAPIView, AppViewMixin
+from common.sync import get_changes
+from common.views.base import (
+    AppCreateAPIView,
+    AppViewMixin,
+    RelatedLookupsMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -49,11 +60,15 @@ class AppGenericViewSet(GenericViewSet):
     """
 
     policy_slug = None
+    policy_owner_field = "user"  # for the "own" policy scope
     permission_classes = [PolicyPermission]
 
 
 class AppModelListAPIViewSet(
     AppViewMixin,
+    RelatedLookupsMixin,
+    SparseFieldsetMixin,
+    ValuesListMixin,
     ListModelMixin,
     AppGenericViewSet,
 ):
@@ -62,15 +77,20 @@ class AppModelListAPIViewSet(
     This also sends the necessary filter meta and table config data.
 
     Also handles listing operations like sort, search, filter and
-    table preferences of the user.
+    table preferences of the user. The fields can be selected with the
+    `?fields=` & `?omit=` params, see `SparseFieldsetMixin`. The related
+    objects are loaded with a constant number of queries, see `RelatedLookupsMixin`.
+    The simple read serializers are served from the rows, see `ValuesListMixin`.
 
     References:
         1. https://github.com/miki725/django-url-filter
         2. https://www.django-rest-framework.org/api-guide/filtering/
     """
 
+    use_read_replica = True
     pagination_class = BasePagination  # page-size: 25
     filter_backends = [
+        PolicyFilterBackend,
         DjangoFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
@@ -101,13 +121,86 @@ class AppModelListAPIViewSet(
             table_meta = self.all_table_columns
         return self.send_response(data={"columns": table_meta})
 
+    def get_facet_fields(self):
+        """Returns the fields to be counted on the `facets/`. Override if needed."""
+
+        return list(self.filterset_fields)
+
+    @action(
+        methods=["GET"],
+        url_path="facets",
+        detail=False,
+    )
+    def get_facets_handler(self, *args, **kwargs):
+        """
+        Sends out the counts per value of the filter fields, for the filter
+        sidebar. Takes the same filter & search params as the list. Computed
+        with a single query and cached, see `common.facets`.
+        """
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.send_response(
+            data={"facets": get_cached_facet_counts(queryset, self.get_facet_fields())}
+        )
+
+    @action(
+        methods=["GET"],
+        url_path="sync",
+        detail=False,
+    )
+    def get_changes_handler(self, request, *args, **kwargs):
+        """
+        Delta sync for the clients that mirror the list locally. Sends out the
+        objects changed after the `?cursor=` (all on the first call), the ids of
+        the deactivated ones as `deleted` and the cursor for the next call. Call
+        again while `has_more`. See `common.sync`.
+        """
+
+        try:
+            page_size = int(request.query_params[self.paginator.page_size_query_param])
+        except (KeyError, ValueError):
+            page_size = None
+
+        objects, cursor, has_more = get_changes(
+            self.filter_queryset(self.get_queryset()),
+            cursor=request.query_params.get("cursor"),
+            page_size=page_size,
+        )
+        serializer = self.get_serializer([_ for _ in objects if _.is_active], many=True)
+        return self.send_response(
+            data={
+                "results": serializer.data,
+                "deleted": [_.pk for _ in objects if not _.is_active],
+                "cursor": cursor,
+                "has_more": has_more,
+            }
+        )
+
 
 class AppModelRetrieveAPIViewSet(
     AppViewMixin,
+    RelatedLookupsMixin,
+    SparseFieldsetMixin,
     RetrieveModelMixin,
     AppGenericViewSet,
 ):
-    """App version of RetrieveModelViewSet."""
+    """
+    App version of RetrieveModelViewSet. Supports `?fields=` & `?omit=`, and the
+    multi get of the `batch/`.
+    """
+
+    use_read_replica = True
+    batch_max_size = MULTI_GET_CONFIG["max_size"]
+    # query param -> lookup field, for the `batch/`
+    batch_lookup_params = {"ids": "pk", "uuids": "uuid"}
+
+    def get_object(self):
+        """Overridden to fetch the object once per request."""
+
+        if not hasattr(self, "_object"):
+            self._object = super().get_object()
+
+        return self._object
 
     def retrieve(self, request, *args, **kwargs):
         """Overriden to include logs."""
@@ -118,6 +211,68 @@ class AppModelRetrieveAPIViewSet(
         )
         return super().retrieve(request, *args, **kwargs)
 
+    def get_batch_lookup(self) -> tuple[str, list]:
+        """Returns the (lookup field, values) from the `batch_lookup_params`."""
+
+        for param, field_name in self.batch_lookup_params.items():
+            if values := self.request.query_params.get(param):
+                values = list(dict.fromkeys(_.strip() for _ in values.split(",")))
+                values = [_ for _ in values if _]
+                if len(values) > self.batch_max_size:
+                    raise ValidationError(
+                        {param: f"At most {self.batch_max_size} are allowed."}
+                    )
+
+                return field_name, values
+
+        raise ValidationError(
+            {param: "This field is required." for param in self.batch_lookup_params}
+        )
+
+    def has_object_permissions(self, obj) -> bool:
+        """Non raising version of the `check_object_permissions`."""
+
+        return all(
+            permission.has_object_permission(self.request, self, obj)
+            for permission in self.get_permissions()
+        )
+
+    @action(
+        methods=["GET"],
+        url_path="batch",
+        detail=False,
+    )
+    def get_batch_handler(self, *args, **kwargs):
+        """
+        Multi get, `?ids=1,2,3` or `?uuids=...`, up to the `batch_max_size`. Sends
+        out the objects keyed by the given ids, fetched with a single `IN` query &
+        serialized like the retrieve. The ids not found & the ones without the
+        object permission are sent out separately.
+        """
+
+        field_name, values = self.get_batch_lookup()
+        objects = self.filter_queryset(self.get_queryset()).bulk_get_or_none(
+            values, field_name
+        )
+
+        found, missing, forbidden = {}, [], []
+        for value, obj in zip(values, objects):
+            if obj is None:
+                missing.append(value)
+            elif not self.has_object_permissions(obj):
+                forbidden.append(value)
+            else:
+                found[value] = obj
+
+        serializer = self.get_serializer(list(found.values()), many=True)
+        return self.send_response(
+            data={
+                "results": dict(zip(found, serializer.data)),
+                "missing": missing,
+                "forbidden": forbidden,
+            }
+        )
+
 
 class AppModelCUDAPIViewSet(
     AppViewMixin,
@@ -0,0 +1,207 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import models
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from common.config import PROTECTED_MEDIA_OWNERS
+from common.views.base import AppAPIView
+
+RANGE_HEADER_REGEX = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _FileRange:
+    """
+    Read only view of a byte range of the given file. Does not expose `fileno`,
+    so the servers stream this instead of `sendfile`-ing the whole file.
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        self.file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+class ProtectedMediaAPIView(AppAPIView):
+    """
+    Serves the files under `MEDIA_ROOT` after checking the access with the
+    `PolicyPermission`, on the `media` policy & on the rows owning the file (see
+    `PROTECTED_MEDIA_OWNERS`). The actual transfer is handed over to the front proxy:
+        > nginx: `X-Accel-Redirect` to `MEDIA_ACCEL_REDIRECT_PREFIX`.
+        > apache/lighttpd: `X-Sendfile` with the absolute path.
+
+    When no proxy is configured (`MEDIA_ACCEL_REDIRECT` is None), this falls back
+    to a `FileResponse` with `ETag`, `Last-Modified` and single `Range` support.
+    Full file responses are `sendfile`-d by the server via `wsgi.file_wrapper`.
+    """
+
+    policy_slug = "media"
+
+    def get_file_path(self, path):
+        """Returns the absolute path of the requested file. Raises `NotFound`."""
+
+        try:
+            file_path = safe_join(settings.MEDIA_ROOT, path)
+        except SuspiciousFileOperation:
+            raise NotFound
+
+        if not os.path.isfile(file_path):
+            raise NotFound
+
+        return file_path
+
+    @staticmethod
+    def get_owner_objects(path):
+        """Yields the (rows, policy config) referencing the `path` in a file field."""
+
+        for label, config in PROTECTED_MEDIA_OWNERS.items():
+            model = apps.get_model(label)
+            query = Q()
+            for field in model._meta.concrete_fields:
+                if isinstance(field, models.FileField):
+                    query |= Q(**{field.name: path})
+
+            for obj in model._default_manager.filter(query):
+                yield obj, config
+
+    def check_file_permissions(self, request, path):
+        """
+        Applies the `check_object_permissions` on the rows owning the file, with
+        their policy. Passes if any is allowed. Raises `NotFound` for no rows.
+        """
+
+        denied = None
+        for obj, config in self.get_owner_objects(path):
+            self.policy_slug = config["policy_slug"]
+            self.policy_owner_field = config["owner_field"]
+            try:
+                self.check_object_permissions(request, obj)
+                return
+            except PermissionDenied as exc:
+                denied = exc
+
+        raise denied or NotFound
+
+    def get(self, request, path, *args, **kwargs):
+        """Returns the file identified by the `path` relative to `MEDIA_ROOT`."""
+
+        file_path = self.get_file_path(path)
+        self.check_file_permissions(request, path)
+        stat = os.stat(file_path)
+        etag = f'"{int(stat.st_mtime_ns):x}-{stat.st_size:x}"'
+        last_modified = int(stat.st_mtime)
+
+        if response := get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        ):
+            return response
+
+        accel_redirect = settings.MEDIA_ACCEL_REDIRECT
+        if accel_redirect == "nginx":
+            response = HttpResponse()
+            response["X-Accel-Redirect"] = quote(
+                settings.MEDIA_ACCEL_REDIRECT_PREFIX + path
+            )
+        elif accel_redirect == "sendfile":
+            response = HttpResponse()
+            response["X-Sendfile"] = file_path
+        else:
+            response = self.get_file_response(
+                request,
+                file_path=file_path,
+                size=stat.st_size,
+                etag=etag,
+                last_modified=last_modified,
+            )
+            if response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE:
+                return response  # not the file, none of its headers
+
+        content_type, _ = mimetypes.guess_type(file_path)
+        response["Content-Type"] = content_type or "application/octet-stream"
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    def get_file_response(self, request, file_path, size, etag, last_modified):
+        """The python fallback, handles the single range requests."""
+
+        byte_range = self.get_byte_range(request, size, etag, last_modified)
+
+        if byte_range is None:
+            return FileResponse(open(file_path, "rb"))
+
+        if byte_range is False:
+            response = HttpResponse(
+                status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+            )
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            _FileRange(open(file_path, "rb"), start=start, length=length),
+            status=status.HTTP_206_PARTIAL_CONTENT,
+        )
+        response["Content-Length"] = length
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        return response
+
+    @staticmethod
+    def get_byte_range(request, size, etag, last_modified):
+        """
+        Parses the `Range` header. Returns (start, end) both inclusive, None for
+        the full file and False when the range is not satisfiable.
+        Multiple ranges are not supported, the full file is sent for those.
+        """
+
+        range_header = request.headers.get("Range")
+        if not range_header:
+            return None
+
+        # the file has changed since the client cached the other parts
+        if if_range := request.headers.get("If-Range"):
+            if if_range != etag and parse_http_date_safe(if_range) != last_modified:
+                return None
+
+        match = RANGE_HEADER_REGEX.match(range_header.strip())
+        if not match or match.groups() == ("", ""):
+            return None
+
+        start, end = match.groups()
+        if not start:
+            # suffix range, the last n bytes
+            start, end = max(size - int(end), 0), size - 1
+        else:
+            start, end = int(start), min(int(end) if end else size - 1, size - 1)
+
+        if start >= size or start > end:
+            return False
+
+        return start, end
@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# after the django setup | serves the live change feed, see `common.asgi`
+from common.asgi import get_asgi_application as get_app_asgi_application  # noqa
+
+application = get_app_asgi_application(django_application)
@@ -47,10 +47,19 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "common.middleware.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+REST_FRAMEWORK = {
+    # signed tokens first | no session & user queries for the api reads
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "common.authentication.SignedTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+    ],
+}
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates/")
@@ -88,6 +97,40 @@ DATABASES = {
     }
 }
 
+# Read replicas | same config as the default, except the host. The tests read the
+# replicas from the default test database. With the SQLite default, any host
+# (like "localhost") adds a second connection to the same database file.
+REPLICA_DATABASES = []
+for _index, _host in enumerate(env.list("MYSQL_REPLICA_HOSTS", default=[])):
+    DATABASES[f"replica_{_index}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(f"replica_{_index}")
+
+DATABASE_ROUTERS = ["common.db_router.ReplicaRouter"]
+
+# Reads go to the primary for this long after a write | read-your-writes
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=5)
+REPLICA_PIN_COOKIE_NAME = "db_pin"
+REPLICA_MAX_LAG_SECONDS = env.int("REPLICA_MAX_LAG_SECONDS", default=2)
+REPLICA_HEALTH_CHECK_INTERVAL = 10
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/ref/settings/#caches
+
+# Must be shared by all the processes, the cached users, policies & facets are
+# invalidated through the versions in it | e.g. "rediscache://host:6379/1"
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+# Number of the server processes | the process local cache is refused for more than one
+WEB_CONCURRENCY = env.int("WEB_CONCURRENCY", default=1)
+
+# Processes of the password hashing pool, per web/worker process | see `common.passwords`,
+# defaults to the cpu count, capped by the `PASSWORD_HASHING_CONFIG["max_workers"]`
+PASSWORD_HASHING_WORKERS = env.int("PASSWORD_HASHING_WORKERS", default=None)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -130,7 +173,30 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Phone numbers are stored normalized, the indexed lookups depend on this
+PHONENUMBER_DB_FORMAT = "E164"
+
 MEDIA_URL = "/media/"
 
 # Path where media is stored
 MEDIA_ROOT = os.path.join(BASE_DIR, "media/")
+
+# Hands the protected media transfer to the front proxy | "nginx", "sendfile" or None
+MEDIA_ACCEL_REDIRECT = env("MEDIA_ACCEL_REDIRECT", default=None)
+# nginx `internal` location aliased to `MEDIA_ROOT`
+MEDIA_ACCEL_REDIRECT_PREFIX = env(
+    "MEDIA_ACCEL_REDIRECT_PREFIX", default="/protected-media/"
+)
+
+# Uploads are hashed while being received, used by the content addressed storage
+FILE_UPLOAD_HANDLERS = [
+    "common.storage.ContentHashMemoryFileUploadHandler",
+    "common.storage.ContentHashTemporaryFileUploadHandler",
+]
+
+# Fan-out of the change feed events | "local" for a single process, "socket" for
+# many processes on the same host (unix datagram sockets in the directory)
+CHANGE_FEED_BACKEND = env("CHANGE_FEED_BACKEND", default="local")
+CHANGE_FEED_SOCKET_DIR = env(
+    "CHANGE_FEED_SOCKET_DIR", default=os.path.join(BASE_DIR, "run/change-feed/")
+)